@@ -0,0 +1,143 @@
+#!python3
+"""
+Baud rate detection of a historic teletype from the received signal
+
+The pin IRQ measures the width of all low pulses (start bit and following 0 data bits).
+These are whole multiples of the bit time at the right baud rate.
+For each standard rate the misfit (distance of width/bit time to the next integer) is calculated.
+Rates with a bit time longer than 1.25 * shortest pulse are impossible.
+The rate with the lowest misfit wins - confidence compares it with the second best.
+
+Usage:
+import autobaud
+d = autobaud.BaudDetect(pin)
+... receive some chars ...
+baud, confidence = d.result()
+"""
+
+try:  # try MicroPython
+    import uos as os
+    MICROPYTHON = True
+except:  # CPython
+    MICROPYTHON = False
+    __author__ = "Jochen Krapf"
+    __email__ = "jk@nerd2nerd.org"
+    __copyright__ = "Copyright 2020, JK"
+    __license__ = "GPL3"
+    __version__ = "0.0.1"
+
+if MICROPYTHON:
+    from machine import Pin
+    from utime import ticks_us, ticks_diff
+    from array import array
+
+else:  # CPython
+    from debug_pc.machine import Pin
+    from debug_pc.utime import ticks_us, ticks_diff
+    from array import array
+
+    def const(x):
+        return x
+
+###############################################################################
+
+BAUD_RATES = (45.45, 50, 75, 100)
+
+MIN_PULSES = const(6)   # about 2...3 chars
+MAX_PULSES = const(16)   # decide latest after about 6 chars
+MIN_CONFIDENCE = 0.5
+SPIKE_US = const(3000)   # shorter pulses are ignored
+
+###############################################################################
+
+def fit(widths, count:int=-1, rates:tuple=BAUD_RATES) -> tuple:
+    'find the baud rate best fitting to the low pulse widths in us - returns (baud, confidence 0...1)'
+    if count < 0:
+        count = len(widths)
+    if not count:
+        return None, 0.
+
+    shortest = min(widths[i] for i in range(count))
+    best = None
+    second = None
+    for baud in rates:
+        bit = 1000000. / baud
+        if shortest < bit * 0.8:   # pulse shorter than a bit
+            continue
+        misfit = 0.
+        for i in range(count):
+            x = widths[i] / bit
+            misfit += (x - int(x + 0.5)) ** 2
+        misfit /= count
+        if best is None or misfit < best[0]:
+            second = best
+            best = (misfit, baud)
+        elif second is None or misfit < second[0]:
+            second = (misfit, baud)
+
+    if best is None:
+        return None, 0.
+    if second is None or second[0] <= 0.:
+        return best[1], 1.
+    return best[1], 1. - best[0] / second[0]
+
+###############################################################################
+
+
+class BaudDetect:
+    'Measure low pulses with pin IRQ and find the baud rate'
+
+    def __init__(_, pin:Pin, rxInvert:bool=False):
+        _._pinRx = pin
+        _._rxInvert = 1 if rxInvert else 0
+        _._widths = array('l', [0] * MAX_PULSES)
+        _._count = 0
+        _._fallT = None
+        _._pinRx.irq(handler=_._irq, trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING)
+
+    # -----
+
+    def deinit(_):
+        _._pinRx.irq(handler=None)
+
+    # -----
+
+    def __repr__(_):
+        return '<BaudDetect, pulses={}>'.format(_._count)
+
+    # =====
+
+    def _irq(_, pin) -> None:
+        t = ticks_us()
+        if not pin.value() ^ _._rxInvert:   # falling edge
+            _._fallT = t
+        elif _._fallT is not None and _._count < MAX_PULSES:
+            w = ticks_diff(t, _._fallT)
+            if w >= SPIKE_US:
+                _._widths[_._count] = w
+                _._count += 1
+            _._fallT = None
+
+    # -----
+
+    def count(_) -> int:
+        'number of measured low pulses'
+        return _._count
+
+    # -----
+
+    def result(_) -> tuple:
+        'current best (baud, confidence) - baud is None without pulses'
+        return fit(_._widths, _._count)
+
+    # -----
+
+    def done(_) -> bool:
+        'enough pulses measured for a reliable result'
+        if _._count < MIN_PULSES:
+            return False
+        if _._count >= MAX_PULSES:
+            return True
+        return _.result()[1] >= MIN_CONFIDENCE
+
+###############################################################################
@@ -0,0 +1,151 @@
+#!python3
+"""
+Benchmark for module bmc - runs on CPython and MicroPython.
+Usage:
+    >>>import bench_bmc
+or on a PC:
+    python3 bench_bmc.py
+"""
+
+try:  # try MicroPython
+    import uos as os
+    MICROPYTHON = True
+except:  # CPython
+    MICROPYTHON = False
+    __author__ = "Jochen Krapf"
+    __email__ = "jk@nerd2nerd.org"
+    __copyright__ = "Copyright 2020, JK"
+    __license__ = "GPL3"
+    __version__ = "0.0.1"
+
+import gc
+import sys
+
+if MICROPYTHON:
+    from utime import ticks_us, ticks_diff
+
+    def mem_alloc():
+        return gc.mem_alloc()
+
+else:  # CPython
+    import time
+    import tracemalloc
+
+    def ticks_us():
+        return int(time.perf_counter() * 1000000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+    def mem_alloc():
+        return tracemalloc.get_traced_memory()[0]
+
+def mem_trace(enable:bool) -> None:
+    'trace allocations of CPython only while measuring the heap - tracing slows down the timings'
+    if not MICROPYTHON:
+        if enable:
+            tracemalloc.start()
+        else:
+            tracemalloc.stop()
+
+# measure import of the module under test
+mem_trace(True)
+gc.collect()
+IMPORT_MEM = mem_alloc()
+IMPORT_US = ticks_us()
+import bmc
+IMPORT_US = ticks_diff(ticks_us(), IMPORT_US)
+gc.collect()
+IMPORT_MEM = mem_alloc() - IMPORT_MEM
+mem_trace(False)
+
+###############################################################################
+
+TEXT = 'the quick brown fox jumps over the lazy dog 1234567890 (x/y) = 42.\r\n'
+
+###############################################################################
+
+def report(name:str, count:int, us:int, unit:str='codes'):
+    if us <= 0:
+        us = 1
+    print('{:24} {:8} {} in {:8} us = {:10} {}/s'.format(name, count, unit, us, count * 1000000 // us, unit))
+
+# -----
+
+def bench_decode(name:str, text:str, flip_bits:bool=False, repeat:int=10):
+    bm = bmc.BMC(0, flip_bits, 0)
+    codes = bytes(bm.encodeA2BM(text))
+    us = 0
+    for r in range(3):   # best of 3 rounds
+        gc.collect()
+        t = ticks_us()
+        for i in range(repeat):
+            bm.reset()
+            bm.decodeBM2A(codes)
+        t = ticks_diff(ticks_us(), t)
+        if not us or t < us:
+            us = t
+    report(name, len(codes) * repeat, us)
+
+# -----
+
+def bench_encode(repeat:int=10):
+    bm = bmc.BMC(0, False, 0)
+    text = TEXT * 40
+    us = 0
+    for r in range(3):   # best of 3 rounds
+        gc.collect()
+        t = ticks_us()
+        for i in range(repeat):
+            bm.reset()
+            bm.encodeA2BM(text)
+        t = ticks_diff(ticks_us(), t)
+        if not us or t < us:
+            us = t
+    report('encodeA2BM', len(text) * repeat, us, 'chars')
+
+# -----
+
+def bench_tty_text(repeat:int=10):
+    text = 'Grüße aus Würzburg: Café, naïve Ångström - 100€ & more!\r\n' * 40
+    us = 0
+    for r in range(3):   # best of 3 rounds
+        gc.collect()
+        t = ticks_us()
+        for i in range(repeat):
+            bmc.BMC.ascii_to_tty_text(text)
+        t = ticks_diff(ticks_us(), t)
+        if not us or t < us:
+            us = t
+    report('ascii_to_tty_text', len(text) * repeat, us, 'chars')
+
+# -----
+
+def bench_first_use():
+    mem_trace(True)
+    gc.collect()
+    mem = mem_alloc()
+    t = ticks_us()
+    bm = bmc.BMC(0)
+    bm.decodeBM2A(bm.encodeA2BM('ry'))
+    t = ticks_diff(ticks_us(), t)
+    gc.collect()
+    mem = mem_alloc() - mem
+    mem_trace(False)
+    print('{:24} {:8} us, heap {} bytes'.format('first use ITA2', t, mem))
+
+# -----
+
+def run():
+    print('Platform:', sys.platform, sys.implementation.name)
+    print('{:24} {:8} us, heap {} bytes'.format('import bmc', IMPORT_US, IMPORT_MEM))
+    bench_first_use()
+    bench_tty_text()
+    bench_encode()
+    bench_decode('decodeBM2A text', TEXT * 40)
+    bench_decode('decodeBM2A text flip', TEXT * 40, True)
+    bench_decode('decodeBM2A a1b2c3', 'a1b2c3 ' * 400)
+
+###############################################################################
+
+run()
@@ -0,0 +1,191 @@
+#!python3
+"""
+Benchmark for the text path of module telex - runs on CPython and MicroPython.
+Compares the bulk path of class Telex (whole strings and code blocks)
+with the former path per char and per code (class TelexPerChar).
+The TTY runs on the pins of debug_pc - the ISR is not called, the buffers are drained here.
+On CPython the Python function calls per char are counted too.
+Usage:
+    >>>import bench_telex
+or on a PC:
+    python3 bench_telex.py
+"""
+
+try:  # try MicroPython
+    import uos as os
+    MICROPYTHON = True
+except:  # CPython
+    MICROPYTHON = False
+    __author__ = "Jochen Krapf"
+    __email__ = "jk@nerd2nerd.org"
+    __copyright__ = "Copyright 2020, JK"
+    __license__ = "GPL3"
+    __version__ = "0.0.1"
+
+import gc
+import sys
+
+import telex   # before ticks_us() - tty has the virtual clock of debug_pc
+
+if MICROPYTHON:
+    from utime import ticks_us, ticks_diff
+
+else:  # CPython
+    import time
+
+    def ticks_us():
+        return int(time.perf_counter() * 1000000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+###############################################################################
+
+TEXT = 'the quick brown fox jumps over the lazy dog 1234567890 (x/y) = 42.\r\n'
+REPEAT = 100
+
+###############################################################################
+
+class TelexPerChar(telex.Telex):
+    'Telex with the former text path - one encode per char, one TTY write per code, one decode per code'
+    def __init__(_, cnfName:str=None):
+        telex.Telex.__init__(_, cnfName)
+        _._rxCharBuffer = []
+
+    def _syncCharBuffer(_) -> None:
+        if not _._tty.any():
+            return
+
+        while _._tty.any():
+            bs = _.readCode()
+            a = _._bm.decodeBM2A(bs)
+            if a:
+                _._rxCharBuffer.append(a)
+
+    def write(_, ascii:str) -> None:
+        _._syncCharBuffer()
+
+        for a in ascii:
+            if a == '\x1B':   # escape char
+                _._rxCharBuffer.append('<ESC>')
+                _._escape = not _._escape
+                continue
+
+            if _._escape:
+                _._escape = False
+                _.cmd(a)
+            else:   # normal text
+                bs = _._bm.encodeA2BM(a)
+                if bs:
+                    _.writeCode(bs)
+
+    def writeCode(_, codes: bytes) -> None:
+        for code in codes:
+            if code == 0x1F:   # LTRS
+                _._modeBM = 0
+            elif code == 0x1B:   # FIGS
+                _._modeBM = 1
+            elif code == 0x09 and _._modeBM == 1 and _._TN:   # WRU?, WerDa?
+                _._tty.readAdd(_._TN)
+                continue
+            _._tty.write([code])
+            if _._ledSt:
+                _._ledSt.add(8)
+
+    def readCode(_, count:int=1) -> bytes:
+        codes = _._tty.read(count)
+        for code in codes:
+            if code == 0x1F:   # LTRS
+                _._modeBM = 0
+            elif code == 0x1B:   # FIGS
+                _._modeBM = 1
+            if _._ledSt:
+                _._ledSt.add(-8)
+
+        return codes
+
+    @property
+    def char(_) -> str:
+        ret = ''
+        _._syncCharBuffer()
+        while _._rxCharBuffer:
+            ret += _._rxCharBuffer.pop(0)
+        return ret
+
+###############################################################################
+
+class Calls:
+    'count the Python function calls - CPython only'
+    def __init__(self):
+        self.n = 0
+
+    def __enter__(self):
+        if not MICROPYTHON:
+            sys.setprofile(self._profile)
+        return self
+
+    def __exit__(self, type, value, tb):
+        if not MICROPYTHON:
+            sys.setprofile(None)
+
+    def _profile(self, frame, event, arg):
+        if event == 'call':
+            self.n += 1
+
+# -----
+
+def tx(tlx) -> None:
+    'text to the TTY - TX buffer is drained like by the ISR'
+    for i in range(REPEAT):
+        tlx.write(TEXT)
+        tlx._tty._txDataBuffer.clear()
+
+# -----
+
+def rx(tlx, codes:bytes) -> str:
+    'codes from the TTY - decoded and read by the application'
+    ret = ''
+    for i in range(REPEAT):
+        tlx._tty.readAdd(codes)
+        ret += tlx.char
+    return ret
+
+# -----
+
+def bench(name:str, f, *args) -> tuple:
+    'us and Python calls per 1000 chars - best of 3 rounds'
+    us = 0
+    for r in range(3):
+        gc.collect()
+        t = ticks_us()
+        ret = f(*args)
+        t = ticks_diff(ticks_us(), t)
+        if not us or t < us:
+            us = t
+    with Calls() as c:
+        f(*args)
+    chars = len(TEXT) * REPEAT
+    print('{:24} {:8} us {:8} calls per 1000 chars'.format(name, us * 1000 // chars, c.n * 1000 // chars))
+    return us, c.n, ret
+
+# -----
+
+def run():
+    print('Platform:', sys.platform, sys.implementation.name)
+    codes = bytes(telex.BMC().encodeA2BM(TEXT))
+    out = []
+    for cls, name in ((TelexPerChar, 'per char'), (telex.Telex, 'bulk')):
+        tlx = cls()
+        tlx._tty.deinit()   # buffers are drained here, not by the timer
+        us_tx, calls_tx, ret = bench(name + ' tx', tx, tlx)
+        us_rx, calls_rx, ret = bench(name + ' rx', rx, tlx, codes)
+        out.append((us_tx, calls_tx, us_rx, calls_rx, ret))
+        tlx.deinit()
+    assert(out[0][4] == out[1][4])   # same text
+    for i, scene in ((0, 'tx'), (2, 'rx')):
+        print('{:24} {:7}% time {:7}x fewer calls'.format('gain ' + scene,
+            100 - out[1][i] * 100 // out[0][i], out[0][i + 1] // max(out[1][i + 1], 1)))
+
+###############################################################################
+
+run()
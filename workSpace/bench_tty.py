@@ -0,0 +1,407 @@
+#!python3
+"""
+Benchmark for the timer handler of module tty - runs on CPython and MicroPython.
+Compares the table driven handler with the former if/elif chain (class TTYIfChain)
+and with the native compiled handler of class TTYFast (plain Python on CPython)
+and shows the cost of the TTYMulti handler per added line
+and the number of timer calls per hour on an idle line with and without idle mode
+and the cost of the ISR counters (class TTYNoStats) and of measuring the handler duration (setTiming).
+Usage:
+    >>>import bench_tty
+or on a PC:
+    python3 bench_tty.py
+"""
+
+try:  # try MicroPython
+    import uos as os
+    MICROPYTHON = True
+except:  # CPython
+    MICROPYTHON = False
+    __author__ = "Jochen Krapf"
+    __email__ = "jk@nerd2nerd.org"
+    __copyright__ = "Copyright 2020, JK"
+    __license__ = "GPL3"
+    __version__ = "0.0.1"
+
+import gc
+import sys
+
+from tty import *
+from ttymulti import TTYMulti, LINES_MAX
+from ttyfast import TTYFast   # before ticks_us() - tty has the virtual clock of debug_pc
+
+if MICROPYTHON:
+    from utime import ticks_us, ticks_diff
+
+else:  # CPython
+    import time
+
+    def ticks_us():
+        return int(time.perf_counter() * 1000000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+###############################################################################
+
+BAUD = 100
+PERIOD = 1   # ms -> 1000 ticks per second
+CODES = bytes([i * 7 & 0x1F for i in range(100)])
+
+###############################################################################
+
+class LinePin:
+    'pin of the simulated line - RX reads a waveform with one level per tick'
+    def __init__(self, wave:bytes=b'', idle:int=1):
+        self.wave = wave
+        self.pos = 0
+        self.idle = idle   # level after the waveform
+
+    def value(self, v:int=None) -> int:
+        if v is None:
+            p = self.pos
+            self.pos = p + 1
+            return self.wave[p] if p < len(self.wave) else self.idle
+
+    def irq(self, handler=None, trigger:int=0) -> None:
+        pass
+
+# -----
+
+def wave(codes:bytes, slice:int) -> bytes:
+    'waveform of the codes with 1 start, 5 data and 1.5 stop bits'
+    bits = bytearray()
+    for c in codes:
+        bits += bytes(slice)
+        for i in range(5):
+            bits += bytes([(c >> i) & 1]) * slice
+        bits += b'\x01' * (slice * 3 // 2)
+    return bytes(bits)
+
+###############################################################################
+
+class TTYIfChain(TTY):
+    'TTY with the former timer handler - if/elif chain over the states and list lookups for the bit timing'
+    def _buildTables(_) -> None:
+        TTY._buildTables(_)
+        _._rxMask = 1
+
+    def _timerHandler(_, x=None) -> None:
+        _._tick += 1
+
+        if _._state & STATE_MASK_WAIT:
+            pass
+
+        # DIAL
+
+        elif _._state & STATE_MASK_DIAL:
+            valRX = _._getPinValueRX()
+            if _._state == STATE_DIAL_WAIT:
+                if valRX:
+                    _._tickCounter = 0
+                    if not _._dialActive:
+                        _._setState(STATE_LISTEN)
+                else:
+                    _._tickCounter += 1
+                    if _._tickCounter >= 3:
+                        _._dialCounter = 0
+                        _._setState(STATE_DIAL_PULSE)
+            elif _._state == STATE_DIAL_PULSE:
+                if valRX:
+                    _._tickCounter += 1
+                    if _._tickCounter >= 3:
+                        _._dialCounter += 1
+                        _._setState(STATE_DIAL_PAUSE)
+                else:
+                    _._tickCounter = 0
+                    if _._tick == _._len1secT:
+                        _._rxDataBuffer.put(0xED)  # signal dial error
+                        _._dialActive = False
+                        _._setState(STATE_LISTEN)
+            elif _._state == STATE_DIAL_PAUSE:
+                if valRX:
+                    _._tickCounter = 0
+                    if _._tick >= _._dialEndT:
+                        if _._dialCounter >= 10:  # dialing a '0' gets 10 pulses
+                            _._dialCounter = 0
+                        # signal dialed digit
+                        _._rxDataBuffer.put(0xD0 + _._dialCounter)
+                        _._setState(STATE_DIAL_WAIT)
+                else:
+                    _._tickCounter += 1
+                    if _._tickCounter >= 3:
+                        _._setState(STATE_DIAL_PULSE)
+
+        # LISTEN
+
+        elif _._state & STATE_MASK_LISTEN:
+            valRX = _._getPinValueRX()
+            if _._state == STATE_LISTEN:
+                if valRX:
+                    if _._tick == _._len1charT:
+                        _._setState(STATE_LISTEN_CAN_TX)
+                        if _._dialActive and _._dialMode == _.DIAL_MODE_PULSE:
+                            _._setState(STATE_DIAL_WAIT)
+                else:
+                    _._setState(STATE_RX)
+            elif _._state == STATE_LISTEN_CAN_TX:
+                if valRX:
+                    if _._dialActive and _._dialMode == _.DIAL_MODE_PULSE:
+                        _._setState(STATE_DIAL_WAIT)
+                else:
+                    _._setState(STATE_RX)
+            elif _._state == STATE_TX_LISTEN:
+                # check for valid stop bit at TX end or incoming RX
+                if valRX:
+                    if _._tick == _._txEndT:
+                        _._setState(STATE_LISTEN_CAN_TX)
+                else:
+                    if _._tick == _._checkStopT + 1:
+                        #TODO send error code
+                        _._setState(STATE_LISTEN)
+                    else:
+                        _._setState(STATE_RX)
+            pass
+
+        # TX
+
+        elif _._state == STATE_TX:
+            #TODO handle break
+            if _._txData >= 32:
+                pass
+            if _._tick in _._txDataTs:
+                _._setPinValueTX(_._txData & 1)
+                _._txData >>= 1
+            elif _._tick == _._txStopT:
+                _._setPinValueTX(1)
+            elif _._tick == _._checkStopT:
+                _._setState(STATE_TX_LISTEN, _._tick)
+
+        # RX
+
+        elif _._state == STATE_RX:
+            valRX = _._getPinValueRX()
+            if _._tick == 1:
+                pass
+                #  print('R', end='')   #debug
+            elif _._tick == _._checkStartT:
+                # check for valid start bit
+                if valRX:
+                    # only spike -> ignore
+                    _._setState(STATE_LISTEN)
+                else:
+                    # correct start bit -> prepare rx data
+                    _._rxData = 0
+                    _._rxMask = 1
+            elif _._tick in _._rxDataTs:
+                # data bit received
+                if valRX:
+                    _._rxData |= _._rxMask
+                _._rxMask <<= 1
+            elif _._tick >= _._checkStopT:
+                # check for valid stop bit
+                if valRX:
+                    # correct stop bit -> send rx data
+                    if _._dialActive:
+                        if _._rxData in BMC_DIAL_DIGITS:
+                            n = BMC_DIAL_DIGITS.index(_._rxData)
+                            _._rxDataBuffer.put(0xD0 + n)
+                    else:
+                        _._rxDataBuffer.put(_._rxData)
+                    _._setState(STATE_LISTEN)
+                else:
+                    # line is down, may be off-mode
+                    _._rxData |= _._rxMask
+                    if _._tick == _._len1charT*2:
+                        _._setState(STATE_OFF)
+
+        # OFF
+
+        elif _._state == STATE_OFF:
+            valRX = _._getPinValueRX()
+            if _._tick == 1:
+                _._rxDataBuffer.put(0xA0)  # signal line low
+            if valRX:
+                _._tickCounter += 1
+                if _._tickCounter >= _._len1charT:
+                    _._rxDataBuffer.put(0xA1)  # signal line high
+                    _._setState(STATE_LISTEN)
+                    # send
+            else:
+                _._tickCounter = 0
+
+        if _._state & STATE_MASK_CAN_TX:
+            if _._txDataBuffer.any():
+                _._txData = _._txDataBuffer.get()
+                _._setPinValueTX(0)
+                _._setState(STATE_TX)
+
+        pass
+
+###############################################################################
+
+class TTYNoStats(TTY):
+    'TTY without the ISR counters in the handlers passed for every tick and char'
+    def _timerHandler(_, x=None) -> None:
+        _._tick += 1
+
+        _._isr[_._state]()
+
+        if _._state & STATE_MASK_CAN_TX:
+            if _._txDataBuffer.any():
+                _._txData = _._txDataBuffer.get()
+                t = _._txPhase + _._txEndF
+                _._txEndT = t >> 16
+                _._txPhase = t & 0xFFFF
+                _._setPinValueTX(0)
+                _._setState(STATE_TX)
+
+    def _isrRx(_) -> None:
+        valRX = _._pinRx.value() ^ _._rxInvert
+        a = _._rxAction[_._tick]
+        if a & 0x1F:
+            if valRX:
+                _._rxData |= a
+        elif a == ACT_RX_START:
+            if valRX:
+                _._setState(STATE_LISTEN)
+            else:
+                _._rxData = 0
+        elif a == ACT_RX_STOP:
+            if valRX:
+                if _._dialActive:
+                    if _._rxData in BMC_DIAL_DIGITS:
+                        n = BMC_DIAL_DIGITS.index(_._rxData)
+                        _._rxDataBuffer.put(0xD0 + n)
+                else:
+                    _._rxDataBuffer.put(_._rxData)
+                _._setState(STATE_LISTEN)
+            else:
+                _._rxData |= 0x20
+                if _._tick == _._len1charT*2:
+                    _._setState(STATE_OFF)
+
+###############################################################################
+
+def bench(cls, name:str, scene:str, timing:bool=False) -> int:
+    'us per 1000 ticks of the timer handler - best of 3 rounds'
+    us = 0
+    for r in range(3):
+        t = bench_round(cls, scene, timing)
+        if not us or t < us:
+            us = t
+    print('{:24} {:6} us per 1000 ticks = {:.2f}% CPU at {} baud, period {} ms'.format(
+        name + ' ' + scene, us, us / PERIOD / 10000, BAUD, PERIOD))
+    return us
+
+# -----
+
+def bench_round(cls, scene:str, timing:bool=False) -> int:
+    tty = cls(BAUD, PERIOD)
+    tty.setTiming(timing)
+    tty.deinit()   # handler is called here, not by the timer
+    handler = tty.handler()
+    slice = 1000 // PERIOD // BAUD
+    if scene == 'rx':
+        tty._pinRx = LinePin(b'\x01' * 200 + wave(CODES, slice))
+    else:
+        tty._pinRx = LinePin()   # idle line
+    for i in range(200):   # line up -> listen
+        tty._timerHandler()
+    tty.read(-1)   # drop line status codes
+    if scene == 'tx':
+        tty.write(CODES)
+    ticks = len(CODES) * slice * 8
+    gc.collect()
+    t = ticks_us()
+    for i in range(ticks):
+        handler()
+    t = ticks_diff(ticks_us(), t)
+    if scene == 'rx':
+        assert(tty.read(-1) == CODES)
+    if scene == 'tx':
+        assert(not tty.anyTx())
+    return t * 1000 // ticks
+
+# -----
+
+def bench_lines(count:int) -> int:
+    'us per 1000 ticks of the TTYMulti handler with count lines receiving - best of 3 rounds'
+    us = 0
+    slice = 1000 // PERIOD // BAUD
+    ticks = len(CODES) * slice * 8
+    for r in range(3):
+        engine = TTYMulti(PERIOD)
+        lines = [engine.addLine(BAUD, tx=i * 2, rx=i * 2 + 1) for i in range(count)]
+        engine._timer.deinit()   # handler is called here, not by the timer
+        for tty in lines:
+            tty._pinRx = LinePin(b'\x01' * 200 + wave(CODES, slice))
+        for i in range(200):   # line up -> listen
+            engine._timerHandler()
+        gc.collect()
+        t = ticks_us()
+        for i in range(ticks):
+            engine._timerHandler()
+        t = ticks_diff(ticks_us(), t)
+        for tty in lines:
+            assert(tty.read(-1)[-len(CODES):] == CODES)
+        engine.deinit()
+        t = t * 1000 // ticks
+        if not us or t < us:
+            us = t
+    print('{:24} {:6} us per 1000 ticks = {:.2f}% CPU at {} baud, period {} ms'.format(
+        'lines {} rx'.format(count), us, us / PERIOD / 10000, BAUD, PERIOD))
+    return us
+
+# -----
+
+def report_idle():
+    'timer calls per hour on an idle line - the timer stops in idle mode till the next edge'
+    hour = 3600000 // PERIOD
+    for scene, level in (('listen', 1), ('off', 0)):
+        calls = []
+        for idle in (0, IDLE_CHARS):
+            tty = TTY(BAUD, PERIOD)
+            tty.deinit()   # handler is called here, not by the timer
+            tty.setIdle(idle)
+            tty._pinRx = LinePin(b'\x01' * 200, level)
+            n = 0
+            while n < hour and not tty.isSleeping():
+                tty._timerHandler()
+                n += 1
+            calls.append(n)
+        print('{:24} {:9} -> {:6} calls per hour'.format('idle ' + scene, calls[0], calls[1]))
+
+# -----
+
+def report_distortion():
+    'worst case bit distortion (tx/rx) in percent per baud rate and timer period'
+    print('{:8} {}'.format('baud', ' '.join(['{:>11}'.format('{} ms'.format(p)) for p in range(1, 6)])), ' best')
+    for baud in (45.45, 50, 75, 100):
+        d = ['{:5.1f}/{:5.1f}'.format(*distortion(baud, p)) for p in range(1, 6)]
+        print('{:8} {}   {} ms'.format(baud, ' '.join(d), bestPeriod(baud)))
+
+# -----
+
+def run():
+    print('Platform:', sys.platform, sys.implementation.name)
+    report_distortion()
+    for scene in ('idle', 'rx', 'tx'):
+        us_old = bench(TTYIfChain, 'if/elif', scene)
+        us_new = bench(TTY, 'tables', scene)
+        print('{:24} {:6}%'.format('gain ' + scene, 100 - us_new * 100 // us_old))
+        us_fast = bench(TTYFast, 'native', scene)
+        print('{:24} {:6}%'.format('gain native ' + scene, 100 - us_fast * 100 // us_new))
+    for scene in ('idle', 'rx', 'tx'):
+        us_old = bench(TTYNoStats, 'no stats', scene)
+        us_new = bench(TTY, 'stats', scene)
+        print('{:24} {:6}%'.format('cost stats ' + scene, us_new * 100 // us_old - 100))
+        us_timed = bench(TTY, 'timed', scene, True)
+        print('{:24} {:6}%'.format('cost timing ' + scene, us_timed * 100 // us_new - 100))
+    for count in range(1, LINES_MAX + 1):
+        bench_lines(count)
+    report_idle()
+
+###############################################################################
+
+run()
@@ -53,90 +53,125 @@ except:  # CPython
     __license__ = "GPL3"
     __version__ = "0.0.1"
 
+import sys
+
+if MICROPYTHON:
+    from ucollections import OrderedDict
+
+else:  # CPython
+    from collections import OrderedDict
+
+    def const(x):
+        return x
+
+###############################################################################
+
+LAYER_ANY = const(3)  # symbol is on the same code in all layers (space, CR, LF, ...)
+
+# index in shared table tuple - see BMC._tables()
+T_A2BM = const(0)   # dict char -> (layer << 5 | code)
+T_BMSW = const(1)   # mode switch codes as sent/received
+T_BM2A = const(2)   # per layer str received code -> char
+T_A2BM_BYTES = const(3)   # bytes ASCII byte -> (layer << 5 | code) or 0xFF
+T_BM2A_UTF8 = const(4)   # per layer bytes received code -> 2 bytes UTF-8
+
+ENCODE_DST_MIN = const(2)   # smallest dst of BMEncoder.feed_into - mode switch code and symbol
+DECODE_DST_MIN = const(7)   # smallest dst of BMDecoder.feed_into - longest output of a code is '{?xy}' with 2 byte chars
+SHORT_RUN = const(8)   # mean run length between mode switch codes below which decodeBM2A goes code by code
+
 ###############################################################################
 
 
 class BMC:
     'Converter for Baudot-Murray-Code'
-    # Baudot-Murray-Code to ASCII tables
-    _LUT_BM2A_ITA2 = (
-        "~E\nA SIU\rDRJNFCKTZLWHYPQOBG]MXV[", 
-        "~3\n- '87\r@4%,~:(5+)2~6019?~]./=["
-    )
-    _LUT_BM2A_US = (
-        "~E\nA SIU\rDRJNFCKTZLWHYPQOBG]MXV[", 
-        "~3\n- %87\r$4',!:(5\")2@6019?&]./;["
-    )
-    _LUT_BM2A_MKT2 = (
-        "~E\nA SIU\rDRJNFCKTZLWHYPQOBG]MXV[", 
-        "~3\n- '87\r@4Ю,Э:(5+)2Щ6019?Ш]./=[",
-        "~Е\nА СИУ\rДРЙНФЦКТЗЛВХЫПЯОБГ]МЬЖ["
-    )
-    # Baudot-Murray-Code mode switch codes
-    _LUT_BMsw_ITA2 = (0x1F, 0x1B)
-    _LUT_BMsw_US = (0x1F, 0x1B)
-    _LUT_BMsw_MKT2 = (0x1F, 0x1B, 0x00)
-
-    # Baudot-Murray-Code valid ASCII table
-    _valid_convert_chars = " ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-+=:/()?.,'\n\r"
-    _LUT_convert_chars = {
-        'Ä': 'AE',
-        'Ö': 'OE',
-        'Ü': 'UE',
-        'ß': 'SS',
-        '\a': '%',  # Bell
-        '\f': '(FF)',  # Form Feed
-        '\t': '(TAB)',  # Tab
-        '\v': '(VT)',  # Vertical Tab
-        '\x1B': '(ESC)',  # Escape
-        '\b': '(BS)',  # Backspace
-        '&': '(AND)',
-        '€': '(EUR)',
-        '$': '(USD)',
-        '<': '(LT)',
-        '>': '(GT)',
-        '|': '(PIPE)',
-        '*': '(STAR)',
-        '#': '(HASH)',
-        '@': '(AT)',
-        '"': "'",
-        ';': ',.',
-        '!': '(./)',
-        '%': '(./.)',
-        '[': '(',
-        ']': ')',
-        '{': '-(',
-        '}': ')-',
-        '\\': '/',
-        '_': '--',
-    }
+    # compiled conversion table - built on first use
+    _LUT_tty_text = None
+    # cache for converted unknown chars - oldest entry is dropped
+    _LUT_tty_text_unknown = OrderedDict()   # plain dict has no order on MicroPython
+    TTY_TEXT_CACHE_SIZE = 32
 
     CODING_ITA2 = 0
     CODING_US = 1
     CODING_MKT2 = 2
 
+    # ASCII <-> Baudot-Murray-Code tables - built once per coding and flip_bits
+    _LUT_cache = {}
+
     # =====
     
     @staticmethod
     def ascii_to_tty_text(text: str) -> str:
-        ret = ''
+        'convert any text to printable teletype text - one table lookup per char'
+        lut = BMC._LUT_tty_text
+        if lut is None:
+            lut = BMC._build_tty_text()
 
-        text = text.upper()
+        return ''.join([lut.get(a) or BMC._convert_unknown(a) for a in text])
 
-        for a in text:
-            try:
-                if a not in BMC._valid_convert_chars:
-                    if a in BMC._LUT_convert_chars:
-                        a = BMC._LUT_convert_chars.get(a, '?')
-                    else:
-                        #nkfd_norm = unicodedata.normalize('NFKD', a)
-                        #a =  u"".join([c for c in nkfd_norm if not unicodedata.combining(c)])
-                        if a not in BMC._valid_convert_chars:
-                            a = '?'
-                ret += a
-            except:
+    # -----
+
+    @staticmethod
+    def ascii_to_tty_iter(chunks):
+        'generator converting an iterable of str or UTF-8 bytes chunks to teletype text chunk by chunk'
+        rest = b''
+
+        for chunk in chunks:
+            if not isinstance(chunk, str):
+                chunk = rest + bytes(chunk)
+                rest = b''
+                # keep an incomplete UTF-8 sequence at the end for the next chunk
+                i = len(chunk) - 1
+                while i >= 0 and len(chunk) - i < 4 and chunk[i] & 0xC0 == 0x80:
+                    i -= 1
+                if i >= 0 and chunk[i] >= 0xC0:
+                    l = 2 if chunk[i] < 0xE0 else 3 if chunk[i] < 0xF0 else 4
+                    if len(chunk) - i < l:
+                        rest = chunk[i:]
+                        chunk = chunk[:i]
+                chunk = chunk.decode('utf-8')
+            yield BMC.ascii_to_tty_text(chunk)
+
+    # -----
+
+    @staticmethod
+    def _build_tty_text() -> dict:
+        'load the char conversion table from the precomputed module bmc_tables'
+        try:
+            import bmc_tables as lut
+            lut = dict(zip(lut.TTY_TEXT_KEYS, lut.TTY_TEXT_VALUES.split('\x00')))
+            del sys.modules['bmc_tables']   # module is freed - only the table is kept
+        except ImportError:   # not generated -> build from source tables
+            import gen_bmc_tables
+            lut = gen_bmc_tables.tty_text()
+
+        BMC._LUT_tty_text = lut
+        return lut
+
+    # -----
+
+    @staticmethod
+    def _convert_unknown(a:str) -> str:
+        'convert a char not in the compiled table - results are cached'
+        cache = BMC._LUT_tty_text_unknown
+        ret = cache.get(a)
+        if ret:
+            return ret
+
+        lut = BMC._LUT_tty_text
+        ret = lut.get(a.upper())
+        if not ret:
+            ret = '?'
+            try:  # CPython - strip accents and other marks
+                import unicodedata
+                b = ''.join([c for c in unicodedata.normalize('NFKD', a) if not unicodedata.combining(c)])
+                if b and b != a:
+                    ret = BMC.ascii_to_tty_text(b)
+            except ImportError:
                 pass
 
+        if len(cache) >= BMC.TTY_TEXT_CACHE_SIZE:   # drop oldest entry
+            del cache[next(iter(cache))]
+        cache[a] = ret
         return ret
 
     # -----
@@ -161,21 +196,46 @@ class BMC:
 
         return ret
 
+    # -----
+
+    @staticmethod
+    def _tables(coding:int, flip_bits:bool) -> tuple:
+        'get the tables for a coding shared by all instances - built on first use'
+        if coding not in (BMC.CODING_US, BMC.CODING_MKT2):
+            coding = BMC.CODING_ITA2
+        key = coding << 1 | (1 if flip_bits else 0)
+        if key not in BMC._LUT_cache:
+            BMC._LUT_cache[key] = BMC._load_tables(key)
+        return BMC._LUT_cache[key]
+
+    # -----
+
+    @staticmethod
+    def _load_tables(key:int) -> tuple:
+        'load the tables for key = coding << 1 | flip_bits from the precomputed module bmc_tables_<key>'
+        name = 'bmc_tables_' + str(key)
+        try:
+            lut = __import__(name)
+        except ImportError:   # not generated -> build from source tables
+            import gen_bmc_tables
+            return gen_bmc_tables.tables(key)
+        del sys.modules[name]   # module is freed - only the tables are kept
+        return (
+            dict(zip(lut.A2BM_KEYS, lut.A2BM_VALUES)),
+            tuple(lut.BMSW),
+            lut.BM2A,
+            lut.A2BM_BYTES,
+            lut.BM2A_UTF8,
+            )
+
     # =====
 
     def __init__(_, coding:int=0, flip_bits:bool=False, show_BuZi:int=2):
         _._mode = None  # 0=LTRS 1=FIGS
         _._flip_bits = flip_bits
         _._show_BuZi = show_BuZi # 0=None 1=OnlyExplicit 2=All
-        if coding == _.CODING_US:
-            _._LUT_BM2A = _._LUT_BM2A_US
-            _._LUT_BMsw = _._LUT_BMsw_US
-        elif coding == _.CODING_MKT2:
-            _._LUT_BM2A = _._LUT_BM2A_MKT2
-            _._LUT_BMsw = _._LUT_BMsw_MKT2
-        else:
-            _._LUT_BM2A = _._LUT_BM2A_ITA2
-            _._LUT_BMsw = _._LUT_BMsw_ITA2
+        _._saved = 0
+        _._t = BMC._tables(coding, flip_bits)
 
     # -----
 
@@ -184,6 +244,12 @@ class BMC:
 
     # -----
 
+    def getMode(_) -> int:
+        'return the current mode - None=unknown 0=LTRS 1=FIGS 2=RUS'
+        return _._mode
+
+    # -----
+
     def encodeA2BM(_, ascii:str) -> bytes:
         'convert an ASCII string to a list of Baudot-Murray-coded bytearray'
         ret = bytearray()
@@ -193,77 +259,388 @@ class BMC:
 
         ascii = ascii.upper()
 
-        if _._mode is None:
-            _._mode = 0  # letters
-            ret.append(_._LUT_BMsw[_._mode])
+        lut = _._t[T_A2BM]
+        lut_sw = _._t[T_BMSW]
+        mode = _._mode
+
+        if mode is None:
+            mode = 0  # letters
+            ret.append(lut_sw[mode])
 
         for a in ascii:
-            try:  # symbol in current layer?
-                nm = _._mode
-                b = _._LUT_BM2A[nm].index(a)
-                ret.append(b)
-                if b in _._LUT_BMsw:  # explicit Bu or Zi
-                    _._mode = _._LUT_BMsw.index(b)
-            except ValueError:
-                try:  # symbol in other layer?
-                    nm += 1
-                    if nm >= len(_._LUT_BM2A):
-                        nm = 0
-                    b = _._LUT_BM2A[nm].index(a)
-                    ret.append(_._LUT_BMsw[nm])
-                    ret.append(b)
-                    _._mode = nm
-                except ValueError:
-                    try:  # symbol in other layer?
-                        nm += 1
-                        if nm >= len(_._LUT_BM2A):
-                            nm = 0
-                        b = _._LUT_BM2A[nm].index(a)
-                        ret.append(_._LUT_BMsw[nm])
-                        ret.append(b)
-                        _._mode = nm
-                    except:  # symbol not found -> ignore
-                        pass
-            except:  # unknown -> ignore
-                pass
+            e = lut.get(a, -1)
+            if e < 0:  # symbol not found -> ignore
+                continue
+            b = e & 0x1F
+            layer = e >> 5
+            if layer == LAYER_ANY:  # symbol in all layers
+                if b in lut_sw:  # explicit Bu or Zi
+                    mode = lut_sw.index(b)
+            elif layer != mode:  # symbol in other layer
+                ret.append(lut_sw[layer])
+                mode = layer
+            ret.append(b)
+
+        _._mode = mode
+
+        return ret
+
+    # -----
+
+    def encodeA2BMopt(_, ascii:str, unshift_on_space:bool=False) -> bytes:
+        'convert an ASCII string to Baudot-Murray-code with the least number of mode switch codes'
+        if not isinstance(ascii, str):
+            ascii = str(ascii)
+
+        ascii = ascii.upper()
 
-        if ret and _._flip_bits:
-            ret = _.do_flip_bits(ret)
+        # greedy encoder as reference for saved line time
+        mode = _._mode
+        greedy = len(_.encodeA2BM(ascii))
+        _._mode = mode
+
+        lut = _._t[T_A2BM]
+        lut_sw = _._t[T_BMSW]
+        code_space = lut[' '] & 0x1F
+        entries = [lut[a] for a in ascii if a in lut]
+
+        # cheapest path through the modes - state n is 'mode unknown'
+        n = len(lut_sw)
+        INF = 0x7FFFFFFF
+        cost = [INF] * (n + 1)
+        cost[n if mode is None else mode] = 0
+        back = bytearray(len(entries) * (n + 1))   # previous state for each char and state
+        for i, e in enumerate(entries):
+            b = e & 0x1F
+            layer = e >> 5
+            cost_new = [INF] * (n + 1)
+            for s in range(n + 1):
+                c = cost[s]
+                if c == INF:
+                    continue
+                if layer == LAYER_ANY:   # symbol in all layers
+                    c += 1
+                    if b in lut_sw:   # explicit Bu or Zi
+                        s_new = lut_sw.index(b)
+                    elif unshift_on_space and b == code_space:   # receiver falls back to letters
+                        s_new = 0
+                    else:
+                        s_new = s
+                else:
+                    c += 1 if s == layer else 2
+                    s_new = layer
+                if c < cost_new[s_new]:
+                    cost_new[s_new] = c
+                    back[i * (n + 1) + s_new] = s
+            cost = cost_new
+
+        # walk back the cheapest path
+        s = cost.index(min(cost))
+        mode = None if s == n else s
+        states = bytearray(len(entries) + 1)
+        states[len(entries)] = s
+        for i in range(len(entries) - 1, -1, -1):
+            s = back[i * (n + 1) + s]
+            states[i] = s
+
+        ret = bytearray()
+        for i, e in enumerate(entries):
+            layer = e >> 5
+            if layer != LAYER_ANY and states[i] != layer:   # symbol in other layer
+                ret.append(lut_sw[layer])
+            ret.append(e & 0x1F)
+
+        _._mode = mode
+        _._saved = greedy - len(ret)
 
         return ret
 
     # -----
 
+    def saved_ms(_, baud:float=50) -> int:
+        'line time in ms saved by the last encodeA2BMopt() compared to encodeA2BM() - 7.5 bits per code'
+        return int(_._saved * 7500 / baud)
+
+    # -----
+
+    def encodeA2BMpacked(_, ascii:str, packed=None):
+        'convert an ASCII string to Baudot-Murray-code appended to a bmpack.BMPacked buffer - 5 bits per code'
+        if packed is None:
+            import bmpack
+            packed = bmpack.BMPacked()
+        packed.extend(_.encodeA2BM(ascii))
+        return packed
+
+    # -----
+
+    def decodeBM2Apacked(_, packed, start:int=0, count:int=-1) -> str:
+        'convert Baudot-Murray-codes from a bmpack.BMPacked buffer to an ASCII string'
+        return _.decodeBM2A(packed.codes(start, count))
+
+    # -----
+
     def decodeBM2A(_, code:bytes) -> str:
         'convert a list/bytearray of Baudot-Murray-coded bytes to an ASCII string'
-        ret = ''
+        if not isinstance(code, (bytes, bytearray)):
+            code = bytes(code)
+        if _._flip_bits and code and max(code) >= 0x20:
+            code = bytes([b & 0x1F for b in code])   # do_flip_bits() ignores upper bits
+
+        ret = []
+        sw = _._t[T_BMSW]
+        switches = 0
+        for b in sw:
+            switches += code.count(b)
+        if len(code) < SHORT_RUN * (switches + 1):   # short runs - splitting costs more than it saves
+            _._mode = _._decode_codes(code, _._mode, ret)
+        else:
+            _._mode = _._decode_runs(code, 0, _._mode, ret)
 
-        if _._flip_bits:
-            code = _.do_flip_bits(code)
+        return ''.join(ret)
 
-        for b in code:
-            try:
-                if b in _._LUT_BMsw:
-                    mode = _._LUT_BMsw.index(b)
-                    if _._mode != mode:
-                        _._mode = mode
-                        if _._show_BuZi == 0: # no BuZi
-                            continue
-                    if _._show_BuZi <= 1: # explicit BuZi
-                        continue
-
-                if b >= 0x20:
-                    ret += '{#' + hex(b)[2:] + '}'
-                elif _._mode is None:
-                    ret += '{?'
-                    ret += _._LUT_BM2A[0][b]
-                    ret += _._LUT_BM2A[1][b]
-                    ret += '}'
-                else:
-                    ret += _._LUT_BM2A[_._mode][b]
-            except:
-                ret += '{!}'  # debug
+    # -----
 
-        return ret
+    def _decode_runs(_, code:bytes, level:int, mode:int, ret:list) -> int:
+        'split at the mode switch code of the given level and translate the runs - returns the new mode'
+        lut = _._t[T_BM2A]
+        b = _._t[T_BMSW][level]
+        last = level + 1 >= len(_._t[T_BMSW])
+
+        for i, run in enumerate(code.split(bytes((b,)))):
+            if i:  # run starts after a mode switch code
+                mode = level
+                if _._show_BuZi >= 2:   # all BuZi
+                    ret.append(lut[mode][b])
+            if not run:
+                pass
+            elif not last:   # split at the next mode switch code
+                mode = _._decode_runs(run, level + 1, mode, ret)
+            elif mode is None or not (_._flip_bits or max(run) < 0x20):
+                for c in run:
+                    ret.append(_._decode_single(c, mode))
+            elif len(run) == 1:   # translate run in one step
+                ret.append(lut[mode][run[0]])
+            else:
+                lut_mode = lut[mode]
+                ret.append(''.join([lut_mode[c] for c in run]))
+
+        return mode
+
+    # -----
+
+    def _decode_codes(_, code:bytes, mode:int, ret:list) -> int:
+        'translate code by code - returns the new mode'
+        lut = _._t[T_BM2A]
+        sw = _._t[T_BMSW]
+        show = _._show_BuZi >= 2
+
+        for c in code:
+            if c in sw:
+                mode = sw.index(c)
+                if show:
+                    ret.append(lut[mode][c])
+            elif mode is None or c >= 0x20:
+                ret.append(_._decode_single(c, mode))
+            else:
+                ret.append(lut[mode][c])
+
+        return mode
+
+    # -----
+
+    def _decode_single(_, b:int, mode:int) -> str:
+        'decode a single code - also invalid codes and codes before the first mode switch'
+        lut = _._t[T_BM2A]
+        if b >= 0x20:
+            return '{#' + hex(b)[2:] + '}'
+        if mode is not None:
+            return lut[mode][b]
+        return '{?' + lut[0][b] + lut[1][b] + '}'
+
+###############################################################################
+
+
+class BMCache:
+    'LRU cache of encoded text fragments (answerback, test patterns, headers, NNNN) for a BMC instance'
+
+    def __init__(_, bm:BMC, budget:int=512):
+        _._bm = bm
+        _._lru = OrderedDict()   # (text, start mode) -> (codes, end mode)
+        _.budget = budget   # max bytes of text and codes in the cache
+        _.size = 0
+        _.hits = 0
+        _.misses = 0
+
+    # -----
+
+    def clear(_):
+        _._lru = OrderedDict()
+        _.size = 0
+
+    # -----
+
+    def encode(_, ascii:str) -> bytes:
+        'like BMC.encodeA2BM() but a repeated fragment is taken from the cache - updates the mode of the BMC'
+        key = (ascii, _._bm._mode)
+        entry = _._lru.pop(key, None)
+        if entry:
+            _.hits += 1
+        else:
+            _.misses += 1
+            entry = (bytes(_._bm.encodeA2BM(ascii)), _._bm._mode)
+            l = len(ascii) + len(entry[0])
+            if l > _.budget:   # never fits
+                return entry[0]
+            _.size += l
+            while _.size > _.budget:   # drop least recently used
+                k = next(iter(_._lru))
+                _.size -= len(k[0]) + len(_._lru.pop(k)[0])
+
+        _._lru[key] = entry   # most recently used at the end
+        _._bm._mode = entry[1]
+        return entry[0]
+
+###############################################################################
+
+
+class BMEncoder:
+    'Streaming converter ASCII to Baudot-Murray-Code into caller owned buffers'
+
+    def __init__(_, coding:int=0, flip_bits:bool=False):
+        _._mode = None  # 0=LTRS 1=FIGS
+        _._t = BMC._tables(coding, flip_bits)
+        _.consumed = 0
+
+    # -----
+
+    def reset(_):
+        _._mode = None  # 0=LTRS 1=FIGS
+
+    # -----
+
+    def feed_into(_, src, dst, count:int=-1) -> int:
+        'encode str or bytes-like src into bytearray/memoryview dst of at least ENCODE_DST_MIN bytes - returns number of codes, used src in consumed'
+        if count < 0:
+            count = len(src)
+        size = len(dst)
+        if size < ENCODE_DST_MIN:   # no progress possible
+            raise ValueError('dst shorter than {} bytes'.format(ENCODE_DST_MIN))
+        is_str = isinstance(src, str)
+        lut = _._t[T_A2BM]
+        lut_bytes = _._t[T_A2BM_BYTES]
+        lut_sw = _._t[T_BMSW]
+        mode = _._mode
+        n = 0
+        i = 0
+
+        if mode is None and count and size:
+            mode = 0  # letters
+            dst[0] = lut_sw[mode]
+            n = 1
+
+        while i < count:
+            if is_str:
+                e = lut.get(src[i], 0xFF)
+            else:
+                e = src[i]
+                e = lut_bytes[e] if e < 0x80 else 0xFF
+            if e != 0xFF:
+                b = e & 0x1F
+                layer = e >> 5
+                if layer == LAYER_ANY or layer == mode:
+                    if n >= size:
+                        break
+                    if b in lut_sw:  # explicit Bu or Zi
+                        mode = lut_sw.index(b)
+                else:  # symbol in other layer
+                    if n + 1 >= size:
+                        break
+                    dst[n] = lut_sw[layer]
+                    n += 1
+                    mode = layer
+                dst[n] = b
+                n += 1
+            i += 1
+
+        _._mode = mode
+        _.consumed = i
+        return n
+
+###############################################################################
+
+
+class BMDecoder:
+    'Streaming converter Baudot-Murray-Code to UTF-8 text into caller owned buffers'
+    _HEX = b'0123456789abcdef'
+
+    def __init__(_, coding:int=0, flip_bits:bool=False, show_BuZi:int=2):
+        _._mode = None  # 0=LTRS 1=FIGS
+        _._flip_bits = flip_bits
+        _._show_BuZi = show_BuZi # 0=None 1=OnlyExplicit 2=All
+        _._t = BMC._tables(coding, flip_bits)
+        _.consumed = 0
+
+    # -----
+
+    def reset(_):
+        _._mode = None  # 0=LTRS 1=FIGS
+
+    # -----
+
+    def feed_into(_, src, dst, count:int=-1) -> int:
+        'decode bytes-like src into bytearray/memoryview dst of at least DECODE_DST_MIN bytes - returns number of UTF-8 bytes, used src in consumed'
+        if count < 0:
+            count = len(src)
+        size = len(dst) - DECODE_DST_MIN   # room for the longest output of a single code
+        if size < 0:   # no progress possible
+            raise ValueError('dst shorter than {} bytes'.format(DECODE_DST_MIN))
+        lut = _._t[T_BM2A_UTF8]
+        lut_sw = _._t[T_BMSW]
+        show_BuZi = _._show_BuZi >= 2
+        mask = 0x1F if _._flip_bits else 0xFF
+        mode = _._mode
+        n = 0
+        i = 0
+
+        while i < count and n <= size:
+            b = src[i] & mask
+            i += 1
+            if b in lut_sw:
+                mode = lut_sw.index(b)
+                if not show_BuZi:
+                    continue
+            if b >= 0x20:
+                dst[n] = 0x7B   # {
+                dst[n + 1] = 0x23   # #
+                dst[n + 2] = _._HEX[b >> 4]
+                dst[n + 3] = _._HEX[b & 15]
+                dst[n + 4] = 0x7D   # }
+                n += 5
+            elif mode is None:
+                dst[n] = 0x7B   # {
+                dst[n + 1] = 0x3F   # ?
+                n = _._put_utf8(lut[0], b, dst, n + 2)
+                n = _._put_utf8(lut[1], b, dst, n)
+                dst[n] = 0x7D   # }
+                n += 1
+            else:
+                n = _._put_utf8(lut[mode], b, dst, n)
+
+        _._mode = mode
+        _.consumed = i
+        return n
+
+    # -----
+
+    @staticmethod
+    def _put_utf8(lut:bytes, b:int, dst, n:int) -> int:
+        b <<= 1
+        dst[n] = lut[b]
+        n += 1
+        b = lut[b + 1]
+        if b:
+            dst[n] = b
+            n += 1
+        return n
 
 ###############################################################################
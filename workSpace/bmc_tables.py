@@ -0,0 +1,8 @@
+#!python3
+"""
+Precomputed text conversion table for module bmc - generated by gen_bmc_tables.py - do not edit
+"""
+
+# text conversion - values separated by NUL
+TTY_TEXT_KEYS = ' AaBbCcDdEeFfGgHhIiJjKkLlMmNnOoPpQqRrSsTtUuVvWwXxYyZz0123456789-+=:/()?.,\'\n\rÀÁÂÃÅĀĂĄÇĆĈĊČĎĐÈÉÊËĒĔĖĘĚĜĞĠĢĤĦÌÍÎÏĨĪĬĮİĴĶĹĻĽĿŁÑŃŅŇÒÓÔÕŌŎŐŔŖŘŚŜŞŠŢŤŦÙÚÛŨŪŬŮŰŲŴÝŶŸŹŻŽÐàáâãåāăąçćĉċčďđèéêëēĕėęěĝğġģĥħìíîïĩīĭįıĵķĺļľŀłñńņňòóôõōŏőŕŗřśŝşšţťŧùúûũūŭůűųŵýŷÿźżžðÄÖÜß\x07\x0c\t\x0b\x1b\x08&€$<>|*#@";!%[]{}\\_ÆæŒœØøÞþäöü–—‘’‚“”„«»'
+TTY_TEXT_VALUES = " \x00A\x00A\x00B\x00B\x00C\x00C\x00D\x00D\x00E\x00E\x00F\x00F\x00G\x00G\x00H\x00H\x00I\x00I\x00J\x00J\x00K\x00K\x00L\x00L\x00M\x00M\x00N\x00N\x00O\x00O\x00P\x00P\x00Q\x00Q\x00R\x00R\x00S\x00S\x00T\x00T\x00U\x00U\x00V\x00V\x00W\x00W\x00X\x00X\x00Y\x00Y\x00Z\x00Z\x000\x001\x002\x003\x004\x005\x006\x007\x008\x009\x00-\x00+\x00=\x00:\x00/\x00(\x00)\x00?\x00.\x00,\x00'\x00\n\x00\r\x00A\x00A\x00A\x00A\x00A\x00A\x00A\x00A\x00C\x00C\x00C\x00C\x00C\x00D\x00D\x00E\x00E\x00E\x00E\x00E\x00E\x00E\x00E\x00E\x00G\x00G\x00G\x00G\x00H\x00H\x00I\x00I\x00I\x00I\x00I\x00I\x00I\x00I\x00I\x00J\x00K\x00L\x00L\x00L\x00L\x00L\x00N\x00N\x00N\x00N\x00O\x00O\x00O\x00O\x00O\x00O\x00O\x00R\x00R\x00R\x00S\x00S\x00S\x00S\x00T\x00T\x00T\x00U\x00U\x00U\x00U\x00U\x00U\x00U\x00U\x00U\x00W\x00Y\x00Y\x00Y\x00Z\x00Z\x00Z\x00D\x00A\x00A\x00A\x00A\x00A\x00A\x00A\x00A\x00C\x00C\x00C\x00C\x00C\x00D\x00D\x00E\x00E\x00E\x00E\x00E\x00E\x00E\x00E\x00E\x00G\x00G\x00G\x00G\x00H\x00H\x00I\x00I\x00I\x00I\x00I\x00I\x00I\x00I\x00I\x00J\x00K\x00L\x00L\x00L\x00L\x00L\x00N\x00N\x00N\x00N\x00O\x00O\x00O\x00O\x00O\x00O\x00O\x00R\x00R\x00R\x00S\x00S\x00S\x00S\x00T\x00T\x00T\x00U\x00U\x00U\x00U\x00U\x00U\x00U\x00U\x00U\x00W\x00Y\x00Y\x00Y\x00Z\x00Z\x00Z\x00D\x00AE\x00OE\x00UE\x00SS\x00%\x00(FF)\x00(TAB)\x00(VT)\x00(ESC)\x00(BS)\x00(AND)\x00(EUR)\x00(USD)\x00(LT)\x00(GT)\x00(PIPE)\x00(STAR)\x00(HASH)\x00(AT)\x00'\x00,.\x00(./)\x00(./.)\x00(\x00)\x00-(\x00)-\x00/\x00--\x00AE\x00AE\x00OE\x00OE\x00OE\x00OE\x00TH\x00TH\x00AE\x00OE\x00UE\x00-\x00-\x00'\x00'\x00'\x00'\x00'\x00'\x00'\x00'"
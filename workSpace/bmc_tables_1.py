@@ -0,0 +1,11 @@
+#!python3
+"""
+Precomputed tables of coding 0 flip_bits 1 for module bmc - generated by gen_bmc_tables.py - do not edit
+"""
+
+A2BM_KEYS = "~E\nA SIU\rDRJNFCKTZLWHYPQOBG]MXV[3-'87@4%,:(5+)26019?./=easiudrjnfcktzlwhypqobgmxv"
+A2BM_VALUES = b"`\x10h\x18d\x14\x0c\x1cb\x12\n\x1a\x06\x16\x0e\x1e\x01\x11\t\x19\x05\x15\r\x1d\x03\x13\x0b{\x07\x17\x0f\x7f084,<2*:&.>!1)95-=#3'7/\x10\x18\x14\x0c\x1c\x12\n\x1a\x06\x16\x0e\x1e\x01\x11\t\x19\x05\x15\r\x1d\x03\x13\x0b\x07\x17\x0f"
+BMSW = b'\x1f\x1b'
+BM2A = ('~T\rO HNM\nLRGIPCVEZDBSYFXAWJ]UQK[', "~5\r9 ~,.\n)4~80:=3+@?'6~/-2%]71([")
+A2BM_BYTES = b"\xff\xff\xff\xff\xff\xff\xff\xff\xff\xffh\xff\xffb\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xffd\xff\xff\xff\xff:\xff4>)\xff1&8'7-=90*!5<,#.\xff\xff/\xff32\x18\x13\x0e\x12\x10\x16\x0b\x05\x0c\x1a\x1e\t\x07\x06\x03\r\x1d\n\x14\x01\x1c\x0f\x19\x17\x15\x11\x7f\xff{\xff\xff\xff\x18\x13\x0e\x12\x10\x16\x0b\x05\x0c\x1a\x1e\t\x07\x06\x03\r\x1d\n\x14\x01\x1c\x0f\x19\x17\x15\x11\xff\xff\xff`\xff"
+BM2A_UTF8 = (b'~\x00T\x00\r\x00O\x00 \x00H\x00N\x00M\x00\n\x00L\x00R\x00G\x00I\x00P\x00C\x00V\x00E\x00Z\x00D\x00B\x00S\x00Y\x00F\x00X\x00A\x00W\x00J\x00]\x00U\x00Q\x00K\x00[\x00', b"~\x005\x00\r\x009\x00 \x00~\x00,\x00.\x00\n\x00)\x004\x00~\x008\x000\x00:\x00=\x003\x00+\x00@\x00?\x00'\x006\x00~\x00/\x00-\x002\x00%\x00]\x007\x001\x00(\x00[\x00")
@@ -0,0 +1,11 @@
+#!python3
+"""
+Precomputed tables of coding 1 flip_bits 0 for module bmc - generated by gen_bmc_tables.py - do not edit
+"""
+
+A2BM_KEYS = '~E\nA SIU\rDRJNFCKTZLWHYPQOBG]MXV[3-%87$4\',!:(5")2@6019?&./;easiudrjnfcktzlwhypqobgmxv'
+A2BM_VALUES = b"`\x01b\x03d\x05\x06\x07h\t\n\x0b\x0c\r\x0e\x0f\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a{\x1c\x1d\x1e\x7f!#%&')*+,-./0123456789:<=>\x01\x03\x05\x06\x07\t\n\x0b\x0c\r\x0e\x0f\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x1c\x1d\x1e"
+BMSW = b'\x1f\x1b'
+BM2A = ('~E\nA SIU\rDRJNFCKTZLWHYPQOBG]MXV[', '~3\n- %87\r$4\',!:(5")2@6019?&]./;[')
+A2BM_BYTES = b"\xff\xff\xff\xff\xff\xff\xff\xff\xff\xffb\xff\xffh\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xffd-1\xff)%:+/2\xff\xff,#<=673!*05'&8.>\xff\xff\xff94\x03\x19\x0e\t\x01\r\x1a\x14\x06\x0b\x0f\x12\x1c\x0c\x18\x16\x17\n\x05\x10\x07\x1e\x13\x1d\x15\x11\x7f\xff{\xff\xff\xff\x03\x19\x0e\t\x01\r\x1a\x14\x06\x0b\x0f\x12\x1c\x0c\x18\x16\x17\n\x05\x10\x07\x1e\x13\x1d\x15\x11\xff\xff\xff`\xff"
+BM2A_UTF8 = (b'~\x00E\x00\n\x00A\x00 \x00S\x00I\x00U\x00\r\x00D\x00R\x00J\x00N\x00F\x00C\x00K\x00T\x00Z\x00L\x00W\x00H\x00Y\x00P\x00Q\x00O\x00B\x00G\x00]\x00M\x00X\x00V\x00[\x00', b'~\x003\x00\n\x00-\x00 \x00%\x008\x007\x00\r\x00$\x004\x00\'\x00,\x00!\x00:\x00(\x005\x00"\x00)\x002\x00@\x006\x000\x001\x009\x00?\x00&\x00]\x00.\x00/\x00;\x00[\x00')
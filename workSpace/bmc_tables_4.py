@@ -0,0 +1,11 @@
+#!python3
+"""
+Precomputed tables of coding 2 flip_bits 0 for module bmc - generated by gen_bmc_tables.py - do not edit
+"""
+
+A2BM_KEYS = "~E\nA SIU\rDRJNFCKTZLWHYPQOBG]MXV[3-'87@4Ю,Э:(5+)2Щ6019?Ш./=ЕАСИУДРЙНФЦКТЗЛВХЫПЯОБГМЬЖeasiudrjnfcktzlwhypqobgmxvюэщшеасиудрйнфцктзлвхыпяобгмьж"
+A2BM_VALUES = b"`\x01b\x03d\x05\x06\x07h\t\n\x0b\x0c\r\x0e\x0f\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a{\x1c\x1d\x1e\x7f!#%&')*+,-./0123456789:<=>ACEFGIJKLMNOPQRSTUVWXYZ\\]^\x01\x03\x05\x06\x07\t\n\x0b\x0c\r\x0e\x0f\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x1c\x1d\x1e+-4:ACEFGIJKLMNOPQRSTUVWXYZ\\]^"
+BMSW = b'\x1f\x1b\x00'
+BM2A = ('~E\nA SIU\rDRJNFCKTZLWHYPQOBG]MXV[', "~3\n- '87\r@4Ю,Э:(5+)2Щ6019?Ш]./=[", '~Е\nА СИУ\rДРЙНФЦКТЗЛВХЫПЯОБГ]МЬЖ[')
+A2BM_BYTES = b"\xff\xff\xff\xff\xff\xff\xff\xff\xff\xffb\xff\xffh\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xffd\xff\xff\xff\xff\xff\xff%/2\xff1,#<=673!*05'&8.\xff\xff>\xff9)\x03\x19\x0e\t\x01\r\x1a\x14\x06\x0b\x0f\x12\x1c\x0c\x18\x16\x17\n\x05\x10\x07\x1e\x13\x1d\x15\x11\x7f\xff{\xff\xff\xff\x03\x19\x0e\t\x01\r\x1a\x14\x06\x0b\x0f\x12\x1c\x0c\x18\x16\x17\n\x05\x10\x07\x1e\x13\x1d\x15\x11\xff\xff\xff`\xff"
+BM2A_UTF8 = (b'~\x00E\x00\n\x00A\x00 \x00S\x00I\x00U\x00\r\x00D\x00R\x00J\x00N\x00F\x00C\x00K\x00T\x00Z\x00L\x00W\x00H\x00Y\x00P\x00Q\x00O\x00B\x00G\x00]\x00M\x00X\x00V\x00[\x00', b"~\x003\x00\n\x00-\x00 \x00'\x008\x007\x00\r\x00@\x004\x00\xd0\xae,\x00\xd0\xad:\x00(\x005\x00+\x00)\x002\x00\xd0\xa96\x000\x001\x009\x00?\x00\xd0\xa8]\x00.\x00/\x00=\x00[\x00", b'~\x00\xd0\x95\n\x00\xd0\x90 \x00\xd0\xa1\xd0\x98\xd0\xa3\r\x00\xd0\x94\xd0\xa0\xd0\x99\xd0\x9d\xd0\xa4\xd0\xa6\xd0\x9a\xd0\xa2\xd0\x97\xd0\x9b\xd0\x92\xd0\xa5\xd0\xab\xd0\x9f\xd0\xaf\xd0\x9e\xd0\x91\xd0\x93]\x00\xd0\x9c\xd0\xac\xd0\x96[\x00')
@@ -52,182 +52,57 @@ except:  # CPython
     __license__ = "GPL3"
     __version__ = "0.0.1"
 
+from bmc import BMC
+
 ###############################################################################
 
 
-class BaudotMurrayCode:
-    'Converter for Baudot-Murray-code'
-    # Baudot-Murray-Code to ASCII table
-    _LUT_BM2A_STD = [
-        "~E\nA SIU\rDRJNFCKTZLWHYPQOBG]MXV[", 
-        "~3\n- '87\r@4%,~:(5+)2~6019?~]./=["
-    ]
-    _LUT_BM2A_US = [
-        "~E\nA SIU\rDRJNFCKTZLWHYPQOBG]MXV[", 
-        "~3\n- %87\r$4',!:(5\")2@6019?&]./;["
-    ]
-    # Baudot-Murray-Code mode switch codes
-    _LUT_BMsw = [0x1F, 0x1B]
-
-    # Baudot-Murray-Code valid ASCII table
-    # _valid_char = " ABCDEFGHIJKLMNOPQRSTUVWXYZ~3\n- '87\r@4%,~:(5+)2~6019?~]./=[#"
-    _valid_convert_chars = " ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-+=:/()?.,'\n\r"
-    _LUT_convert_chars = {
-        'Ä': 'AE',
-        'Ö': 'OE',
-        'Ü': 'UE',
-        'ß': 'SS',
-        '\a': '%',  # Bell
-        '\f': '(FF)',  # Form Feed
-        '\d': '(DEL)',  # Delete
-        '\t': '(TAB)',  # Tab
-        '\v': '(VT)',  # Vertical Tab
-        '\x1B': '(ESC)',  # Escape
-        '\b': '(BS)',  # Backspace
-        '\x08': '(BS)',  # Backspace
-        '&': '(AND)',
-        '€': '(EUR)',
-        '$': '(USD)',
-        '<': '(LT)',
-        '>': '(GT)',
-        '|': '(PIPE)',
-        '*': '(STAR)',
-        '#': '(HASH)',
-        '@': '(AT)',
-        '"': "'",
-        ';': ',.',
-        '!': '(./)',
-        '%': '(./.)',
-        '[': '(',
-        ']': ')',
-        '{': '-(',
-        '}': ')-',
-        '\\': '/',
-        '_': '--',
-    }
+class BaudotMurrayCode(BMC):
+    'Converter for Baudot-Murray-code - compatibility facade on bmc.BMC with list based codes'
 
     # =====
-    
-    @staticmethod
-    def ascii_to_tty_text(text: str) -> str:
-        ret = ''
-
-        text = text.upper()
-
-        for a in text:
-            try:
-                if a not in BaudotMurrayCode._valid_convert_chars:
-                    if a in BaudotMurrayCode._LUT_convert_chars:
-                        a = BaudotMurrayCode._LUT_convert_chars.get(a, '?')
-                    else:
-                        #nkfd_norm = unicodedata.normalize('NFKD', a)
-                        #a =  u"".join([c for c in nkfd_norm if not unicodedata.combining(c)])
-                        if a not in BaudotMurrayCode._valid_convert_chars:
-                            a = '?'
-                ret += a
-            except:
-                pass
-
-        return ret
-
-    # -----
 
     @staticmethod
     def do_flip_bits(val: int) -> int:
-        ret = 0
-
-        if val & 1:
-            ret |= 16
-        if val & 2:
-            ret |= 8
-        if val & 4:
-            ret |= 4
-        if val & 8:
-            ret |= 2
-        if val & 16:
-            ret |= 1
-
-        return ret
+        return BMC.do_flip_bits((val,))[0]
 
     # =====
 
     def __init__(self, coding=False, flip_bits=False):
-        self._ModeBM = None  # 0=LTRS 1=FIGS
-        self._flip_bits = flip_bits
-        self._show_all_BuZi = True
-        if coding == 'US':
-            self._LUT_BM2A = self._LUT_BM2A_US
-        else:
-            self._LUT_BM2A = self._LUT_BM2A_STD
+        BMC.__init__(self, BMC.CODING_US if coding == 'US' else BMC.CODING_ITA2, flip_bits, 2)
 
     # -----
 
-    def reset(self):
-        self._ModeBM = None  # 0=LTRS 1=FIGS
+    @property
+    def _ModeBM(self) -> int:
+        return self._mode
+
+    @_ModeBM.setter
+    def _ModeBM(self, mode:int):
+        self._mode = mode
+
+    # -----
+
+    @property
+    def _show_all_BuZi(self) -> bool:
+        return self._show_BuZi >= 2
+
+    @_show_all_BuZi.setter
+    def _show_all_BuZi(self, show:bool):
+        self._show_BuZi = 2 if show else 0
 
     # -----
 
     def encodeA2BM(self, ascii: str) -> list:
         'convert an ASCII string to a list of baudot-murray-coded bytes'
-        ret = []
-
-        ascii = ascii.upper()
-
-        if self._ModeBM is None:
-            self._ModeBM = 0  # letters
-            ret.append(self._LUT_BMsw[self._ModeBM])
-
-        for a in ascii:
-            try:  # symbol in current layer?
-                b = self._LUT_BM2A[self._ModeBM].index(a)
-                if b in self._LUT_BMsw:  # explicit Bu or Zi
-                    self._ModeBM = self._LUT_BMsw.index(b)
-                ret.append(b)
-            except:
-                try:  # symbol in other layer?
-                    b = self._LUT_BM2A[1 - self._ModeBM].index(a)
-                    self._ModeBM = 1 - self._ModeBM
-                    ret.append(self._LUT_BMsw[self._ModeBM])
-                    ret.append(b)
-                except:  # symbol not found -> ignore
-                    pass
-
-        if ret and self._flip_bits:
-            for i, b in enumerate(ret):
-                ret[i] = self.do_flip_bits(b)
-
-        return ret
+        return list(BMC.encodeA2BM(self, ascii))
 
     # -----
 
     def decodeBM2A(self, code: list) -> str:
         'convert a list/bytearray of baudot-murray-coded bytes to an ASCII string'
-        ret = ''
-
-        for b in code:
-            if self._flip_bits:
-                b = self.do_flip_bits(b)
-
-            try:
-                if b in self._LUT_BMsw:
-                    mode = self._LUT_BMsw.index(b)
-                    if self._ModeBM != mode:
-                        self._ModeBM = mode
-                        if not self._show_all_BuZi:
-                            continue
-
-                if self._ModeBM is None:
-                    self._ModeBM = 0  # letters
-
-                if b >= 32:
-                    a = '{' + hex(b)[2:] + '}'
-                else:
-                    a = self._LUT_BM2A[self._ModeBM][b]
-                ret += a
-            except:
-                ret += '{!}'  # debug
-                pass
-
-        return ret
+        if self._mode is None:
+            self._mode = 0  # letters
+        return BMC.decodeBM2A(self, code)
 
 ###############################################################################
@@ -0,0 +1,255 @@
+#!python3
+"""
+Packed storage of Baudot-Murray-Code - 5 bits per code, 8 codes in 5 bytes
+
+Code i uses bits 5*i ... 5*i+4 of the little endian bit stream:
+| byte 0   | byte 1   | byte 2   | byte 3   | byte 4   |
+| 11100000 | 32222211 | 44443333 | 66555554 | 77777666 |
+
+Codes are masked to 5 bits - status codes of the TTY (0xA0, 0xD0...) can not be stored.
+
+Usage:
+import bmpack
+p = bmpack.pack(b'\x1f\x03\x19')
+c = bmpack.unpack(p, 3)
+b = bmpack.BMPacked()
+b.extend(c)
+for code in b:
+    print(code)
+"""
+
+try:  # try MicroPython
+    import uos as os
+    MICROPYTHON = True
+except:  # CPython
+    MICROPYTHON = False
+    __author__ = "Jochen Krapf"
+    __email__ = "jk@nerd2nerd.org"
+    __copyright__ = "Copyright 2020, JK"
+    __license__ = "GPL3"
+    __version__ = "0.0.1"
+
+###############################################################################
+
+def size(count:int) -> int:
+    'number of bytes to hold count codes'
+    return (count * 5 + 7) >> 3
+
+# -----
+
+def put(dst, i:int, code:int) -> None:
+    'set code at code index i in packed bytearray dst'
+    i *= 5
+    k = i >> 3
+    s = i & 7
+    code &= 0x1F
+    dst[k] = dst[k] & ~(0x1F << s) & 0xFF | (code << s) & 0xFF
+    if s > 3:   # code spans 2 bytes
+        s = 8 - s
+        dst[k + 1] = dst[k + 1] & ~(0x1F >> s) & 0xFF | code >> s
+
+# -----
+
+def get(src, i:int) -> int:
+    'get code at code index i from packed bytes src'
+    i *= 5
+    k = i >> 3
+    s = i & 7
+    v = src[k] >> s
+    if s > 3:   # code spans 2 bytes
+        v |= src[k + 1] << (8 - s)
+    return v & 0x1F
+
+# -----
+
+def pack_into(codes, dst, start:int=0) -> int:
+    'pack codes into bytearray dst beginning at code index start - returns code index after the last code'
+    n = len(codes)
+    i = 0
+
+    while start & 7 and i < n:   # single codes up to the next group
+        put(dst, start, codes[i])
+        start += 1
+        i += 1
+
+    k = (start >> 3) * 5
+    while i + 8 <= n:   # groups of 8 codes in 5 bytes
+        c1 = codes[i + 1] & 0x1F
+        c3 = codes[i + 3] & 0x1F
+        c4 = codes[i + 4] & 0x1F
+        c6 = codes[i + 6] & 0x1F
+        dst[k] = codes[i] & 0x1F | (c1 << 5) & 0xFF
+        dst[k + 1] = c1 >> 3 | (codes[i + 2] & 0x1F) << 2 | (c3 << 7) & 0xFF
+        dst[k + 2] = c3 >> 1 | (c4 << 4) & 0xFF
+        dst[k + 3] = c4 >> 4 | (codes[i + 5] & 0x1F) << 1 | (c6 << 6) & 0xFF
+        dst[k + 4] = c6 >> 2 | (codes[i + 7] & 0x1F) << 3
+        k += 5
+        i += 8
+        start += 8
+
+    while i < n:   # rest
+        put(dst, start, codes[i])
+        start += 1
+        i += 1
+
+    return start
+
+# -----
+
+def unpack_into(src, dst, start:int=0, count:int=-1) -> int:
+    'unpack count codes beginning at code index start of src into bytearray dst - returns number of codes'
+    if count < 0 or count > len(dst):
+        count = len(dst)
+    i = 0
+
+    while start & 7 and i < count:   # single codes up to the next group
+        dst[i] = get(src, start)
+        start += 1
+        i += 1
+
+    k = (start >> 3) * 5
+    while i + 8 <= count:   # groups of 8 codes in 5 bytes
+        b0 = src[k]
+        b1 = src[k + 1]
+        b2 = src[k + 2]
+        b3 = src[k + 3]
+        b4 = src[k + 4]
+        dst[i] = b0 & 0x1F
+        dst[i + 1] = (b0 >> 5 | b1 << 3) & 0x1F
+        dst[i + 2] = (b1 >> 2) & 0x1F
+        dst[i + 3] = (b1 >> 7 | b2 << 1) & 0x1F
+        dst[i + 4] = (b2 >> 4 | b3 << 4) & 0x1F
+        dst[i + 5] = (b3 >> 1) & 0x1F
+        dst[i + 6] = (b3 >> 6 | b4 << 2) & 0x1F
+        dst[i + 7] = b4 >> 3
+        k += 5
+        i += 8
+        start += 8
+
+    while i < count:   # rest
+        dst[i] = get(src, start)
+        start += 1
+        i += 1
+
+    return count
+
+# -----
+
+def pack(codes) -> bytearray:
+    'pack codes into a new bytearray'
+    dst = bytearray(size(len(codes)))
+    pack_into(codes, dst)
+    return dst
+
+# -----
+
+def unpack(src, count:int, start:int=0) -> bytearray:
+    'unpack count codes beginning at code index start into a new bytearray'
+    dst = bytearray(count)
+    unpack_into(src, dst, start, count)
+    return dst
+
+# -----
+
+def iter_codes(src, count:int, start:int=0):
+    'generator yielding count codes beginning at code index start straight from packed src'
+    end = start + count
+
+    while start & 7 and start < end:
+        yield get(src, start)
+        start += 1
+
+    k = (start >> 3) * 5
+    while start + 8 <= end:
+        b0 = src[k]
+        b1 = src[k + 1]
+        b2 = src[k + 2]
+        b3 = src[k + 3]
+        b4 = src[k + 4]
+        yield b0 & 0x1F
+        yield (b0 >> 5 | b1 << 3) & 0x1F
+        yield (b1 >> 2) & 0x1F
+        yield (b1 >> 7 | b2 << 1) & 0x1F
+        yield (b2 >> 4 | b3 << 4) & 0x1F
+        yield (b3 >> 1) & 0x1F
+        yield (b3 >> 6 | b4 << 2) & 0x1F
+        yield b4 >> 3
+        k += 5
+        start += 8
+
+    while start < end:
+        yield get(src, start)
+        start += 1
+
+###############################################################################
+
+
+class BMPacked:
+    'Growable buffer of Baudot-Murray-codes with 5 bits per code - holds 60% more codes than a bytearray'
+
+    def __init__(_, data:bytes=None, count:int=0):
+        _._buf = bytearray(data) if data else bytearray()
+        _._len = count
+
+    # -----
+
+    def __len__(_) -> int:
+        return _._len
+
+    # -----
+
+    def __iter__(_):
+        return iter_codes(_._buf, _._len)
+
+    # -----
+
+    def __getitem__(_, i:int) -> int:
+        if i < 0:
+            i += _._len
+        if not 0 <= i < _._len:
+            raise IndexError('code index out of range')
+        return get(_._buf, i)
+
+    # -----
+
+    def __repr__(_):
+        return '<BMPacked, codes={}, bytes={}>'.format(_._len, size(_._len))
+
+    # =====
+
+    def clear(_) -> None:
+        _._buf = bytearray()
+        _._len = 0
+
+    # -----
+
+    def append(_, code:int) -> None:
+        n = size(_._len + 1) - len(_._buf)
+        if n > 0:
+            _._buf.extend(bytes(n))
+        put(_._buf, _._len, code)
+        _._len += 1
+
+    # -----
+
+    def extend(_, codes) -> None:
+        n = size(_._len + len(codes)) - len(_._buf)
+        if n > 0:
+            _._buf.extend(bytes(n))
+        _._len = pack_into(codes, _._buf, _._len)
+
+    # -----
+
+    def codes(_, start:int=0, count:int=-1) -> bytearray:
+        'unpacked codes as bytearray'
+        if count < 0 or start + count > _._len:
+            count = _._len - start
+        return unpack(_._buf, count, start)
+
+    # -----
+
+    def packed(_) -> bytearray:
+        'packed bytes e.g. to store in a file - restore with BMPacked(data, count)'
+        return _._buf[:size(_._len)]
+
+###############################################################################
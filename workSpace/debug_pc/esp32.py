@@ -0,0 +1,41 @@
+#!python3
+
+__author__      = "Jochen Krapf"
+__email__       = "jk@nerd2nerd.org"
+__copyright__   = "Copyright 2020, JK"
+__license__     = "GPL3"
+__version__     = "0.0.1"
+
+###############################################################################
+
+class RMT:
+    def __init__(self, channel:int, *, pin=None, clock_div:int=8, idle_level:bool=False, tx_carrier=None) -> None:
+        self.channel = channel
+        self.pin = pin
+        self._clock_div = clock_div
+        self.idle_level = idle_level
+        self.pulses = []   # emitted pulse lists (durations, levels) - for tests
+
+    def source_freq(self) -> int:
+        return 80000000
+
+    def clock_div(self) -> int:
+        return self._clock_div
+
+    def wait_done(self, *, timeout:int=0) -> bool:
+        return True
+
+    def loop(self, enable_loop:bool) -> None:
+        pass
+
+    def write_pulses(self, duration, data=True) -> None:
+        if isinstance(data, (list, tuple)):
+            levels = list(data)
+        else:   # levels alternate from the start level
+            levels = [(1 if data else 0) ^ (i & 1) for i in range(len(duration))]
+        self.pulses.append((list(duration), levels))
+
+    def deinit(self) -> None:
+        pass
+
+###############################################################################
@@ -14,11 +14,17 @@ class Pin:
     OPEN_DRAIN = 2
     PULL_UP = 10
     PULL_DOWN = 11
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
 
     def __init__(self, pin:int=2, mode:int=-1, pull:int=-1, *, value:int=0) -> None:
         #self.rxDebug = '1'
         #self.rxDebug = '1111101111001111111000011110000111100010111111000011111111000011111111111111110111111110000111111111111111111111'
         self.rxDebug = '111110000111100001111000000001111110000111111110000000000001111111111111111111111111'
+        self.rxPos = 0   # next char of rxDebug
+        self.level = None   # set by fire() - overrides rxDebug
+        self.irqHandler = None
+        self.irqTrigger = 0
         #self.rxDebug = '1111101111111111111111111111111'
         #self.rxDebug = '11111000000000000000000000000000000000001111111111111111111111111'
         #self.rxDebug = '11111000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000001111111111111111111111111'
@@ -28,17 +34,31 @@ class Pin:
 
     def value(self, v:int=None) -> int:
         if v == None:
+            if self.level is not None:
+                return self.level
             rxPinValue = 1
-            if self.rxDebug:
-                c = self.rxDebug[0]
-                self.rxDebug = self.rxDebug[1:]
-                if c != '1':
+            if self.rxPos < len(self.rxDebug):
+                if self.rxDebug[self.rxPos] != '1':
                     rxPinValue = 0
+                self.rxPos += 1
             return rxPinValue
         else:
             pass
             #print(v, end='')
 
+    def irq(self, handler=None, trigger:int=IRQ_FALLING | IRQ_RISING) -> None:
+        self.irqHandler = handler
+        self.irqTrigger = trigger
+
+    def fire(self, level:int) -> None:
+        'set the input level and call the irq handler on a matching edge - synthetic edge for tests'
+        old = 1 if self.level is None else self.level
+        self.level = level
+        if level == old or not self.irqHandler:
+            return
+        if self.irqTrigger & (self.IRQ_RISING if level else self.IRQ_FALLING):
+            self.irqHandler(self)
+
 ###############################################################################
 
 class PWM:
@@ -61,13 +81,69 @@ class Timer:
     ONE_SHOT = 1
 
     def __init__(self, id:int) -> None:
-        pass
+        self.running = False   # state for tests
+        self.inits = 0
+        self.period = 0
+        self.callback = None
 
     def init(self, period:int=5, mode:int=PERIODIC, callback=None) -> None:
-        pass
+        self.running = True
+        self.inits += 1
+        self.period = period
+        self.callback = callback
 
     def deinit(self) -> None:
-        pass    
+        self.running = False
+
+###############################################################################
+
+class UART:
+    INV_TX = 0x01
+    INV_RX = 0x02
+
+    def __init__(self, id:int, baudrate:int=9600, bits:int=8, parity=None, stop:int=1, *, tx:int=1, rx:int=3, invert:int=0) -> None:
+        self.rxData = bytearray()
+        self.txData = bytearray()   # written data - for tests
+        self.init(baudrate, bits, parity, stop, tx=tx, rx=rx, invert=invert)
+
+    def init(self, baudrate:int=9600, bits:int=8, parity=None, stop:int=1, *, tx:int=1, rx:int=3, invert:int=0) -> None:
+        if bits not in (5, 6, 7, 8) or stop not in (1, 2) or baudrate < 1:
+            raise ValueError('invalid UART config')
+        self.baudrate = baudrate
+        self.bits = bits
+        self.stop = stop
+        self.invert = invert
+
+    def deinit(self) -> None:
+        pass
+
+    def any(self) -> int:
+        return len(self.rxData)
+
+    def read(self, nbytes:int=-1) -> bytes:
+        if nbytes < 0:
+            nbytes = len(self.rxData)
+        data = bytes(self.rxData[:nbytes])
+        del self.rxData[:nbytes]
+        return data or None
+
+    def readinto(self, buf, nbytes:int=-1) -> int:
+        data = self.read(min(len(buf), nbytes) if nbytes >= 0 else len(buf))
+        if not data:
+            return None
+        buf[:len(data)] = data
+        return len(data)
+
+    def write(self, buf) -> int:
+        self.txData += buf
+        return len(buf)
+
+    def txdone(self) -> bool:
+        return True
+
+    def rxFeed(self, data:bytes) -> None:
+        'received data - for tests'
+        self.rxData += data
 
 ###############################################################################
 
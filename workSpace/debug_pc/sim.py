@@ -0,0 +1,285 @@
+#!python3
+
+__author__      = "Jochen Krapf"
+__email__       = "jk@nerd2nerd.org"
+__copyright__   = "Copyright 2020, JK"
+__license__     = "GPL3"
+__version__     = "0.0.1"
+
+# Simulation of a TTY on a current loop in virtual time - no wall clock, no teletype needed.
+# The TTY timer and the RX pin IRQ are called in time order, the virtual clock of debug_pc.utime follows.
+# Line: loopback (TX of the TTY opens the loop too), polarity, bias distortion, jitter, noise spikes and line down.
+# Peer: sends codes as waveform on the line and decodes the TX pin of the TTY back to codes.
+#
+# Usage:
+# from debug_pc import sim
+# t = TTY(50, 2)
+# s = sim.Sim(t, loopback=True)
+# s.peer.send(b'\x1f\x03')
+# s.run(2000)
+# t.read(-1)
+
+import random
+from bisect import bisect_right
+
+from debug_pc import utime
+from debug_pc.machine import Pin
+
+###############################################################################
+
+class Line:
+    'current loop seen by the TTY - level 1 = current flows (mark)'
+
+    def __init__(self, loopback:bool=False, invert:bool=False, bias:float=0., jitter:float=0., seed:int=1) -> None:
+        self.loopback = loopback   # TX of the TTY is in the same loop as RX
+        self.invert = invert   # polarity of both pins
+        self.bias = bias   # percent of a bit - marks longer (+) or shorter (-)
+        self.jitter = jitter   # percent of a bit - random shift of each edge
+        self.random = random.Random(seed)
+        self._peer = []   # (us, level) edges sent by the peer
+        self._low = []   # (start us, end us) - spikes and line down
+        self._events = [(0, 1)]   # compiled line level
+        self._times = [0]
+        self._dirty = False
+        self._pos = 0
+
+    def addEdges(self, edges:list, bit:float) -> None:
+        'edges of the peer - distorted by bias and jitter'
+        for t, level in edges:
+            d = self.bias if level == 0 else 0.   # start of space is late -> mark longer
+            d += self.random.uniform(-self.jitter, self.jitter)
+            self._peer.append((int(t + bit * d / 100 + 0.5), level))
+        self._dirty = True
+
+    def spike(self, us:int, width:int) -> None:
+        'line low for a short time'
+        self._low.append((us, us + width))
+        self._dirty = True
+
+    def noise(self, start:int, end:int, rate:float, width:int) -> None:
+        'random spikes with rate per second'
+        for i in range(int((end - start) * rate / 1000000)):
+            self.spike(self.random.randrange(start, end), width)
+
+    def down(self, us:int, length:int) -> None:
+        'line open - off-mode of the peer'
+        self._low.append((us, us + length))
+        self._dirty = True
+
+    def _compile(self) -> None:
+        peer = sorted(self._peer)
+        points = sorted(set([t for t, l in peer] + [t for s, e in self._low for t in (s, e)]))
+        low = sorted(self._low)
+        events = [(0, 1)]
+        p = 0
+        peerLevel = 1
+        active = []   # end times of low intervals covering the point
+        li = 0
+        for t in points:
+            while p < len(peer) and peer[p][0] <= t:
+                peerLevel = peer[p][1]
+                p += 1
+            while li < len(low) and low[li][0] <= t:
+                active.append(low[li][1])
+                li += 1
+            active = [e for e in active if e > t]
+            level = 0 if active else peerLevel
+            if level != events[-1][1]:
+                events.append((t, level))
+        self._events = events
+        self._times = [t for t, l in events]
+        self._dirty = False
+        self._pos = 0
+
+    def level(self, us:int) -> int:
+        'peer side level at time us'
+        if self._dirty:
+            self._compile()
+        pos = self._pos
+        if pos + 1 < len(self._times) and self._times[pos + 1] <= us or self._times[pos] > us:
+            pos = bisect_right(self._times, us) - 1
+            self._pos = pos
+        return self._events[pos][1]
+
+    def nextEdge(self, us:int) -> int:
+        'time of the next peer side edge after us or None'
+        if self._dirty:
+            self._compile()
+        i = bisect_right(self._times, us, self._pos)
+        return self._times[i] if i < len(self._times) else None
+
+###############################################################################
+
+class Peer:
+    'teletype at the other end of the line'
+
+    def __init__(self, sim, baud:float) -> None:
+        self.sim = sim
+        self.baud = baud
+        self.sendEnd = 0   # us of the end of the last char sent
+        self.errors = 0   # received chars without stop bit
+
+    def send(self, codes:bytes, at:int=None, baud:float=None) -> int:
+        'codes with 1 start, 5 data and 1.5 stop bits - after the last sent char or at us - returns end time'
+        bit = 1000000. / (baud or self.baud)
+        t = max(self.sendEnd, self.sim.us) if at is None else at
+        edges = []
+        level = 1
+        for c in codes:
+            bits = [0] + [(c >> i) & 1 for i in range(5)] + [1]
+            for i, b in enumerate(bits):
+                if b != level:
+                    edges.append((int(t + bit * i + 0.5), b))
+                    level = b
+            t += bit * 7.5
+        self.sim.line.addEdges(edges, bit)
+        self.sendEnd = int(t + 0.5)
+        return self.sendEnd
+
+    def received(self) -> bytes:
+        'decode the TX pin of the TTY - sample in the middle of the bits'
+        bit = 1000000. / self.baud
+        tx = self.sim.txPin
+        codes = bytearray()
+        self.errors = 0
+        i = 0
+        while i < len(tx.edges):
+            t, level = tx.edges[i]
+            i += 1
+            if level:
+                continue
+            c = 0
+            for b in range(5):
+                c |= tx.levelAt(t + bit * (b + 1.5)) << b
+            if tx.levelAt(t + bit * 6.5):
+                codes.append(c)
+            else:
+                self.errors += 1
+            end = t + bit * 6.5
+            while i < len(tx.edges) and tx.edges[i][0] <= end:
+                i += 1
+        return bytes(codes)
+
+###############################################################################
+
+class SimRxPin(Pin):
+    'RX pin of the TTY - level of the line'
+
+    def __init__(self, sim) -> None:
+        Pin.__init__(self)
+        self.sim = sim
+
+    def value(self, v:int=None) -> int:
+        if v is None:
+            return self.sim.rxLevel() ^ self.sim.line.invert
+
+# -----
+
+class SimTxPin(Pin):
+    'TX pin of the TTY - records the level changes'
+
+    def __init__(self, sim) -> None:
+        Pin.__init__(self)
+        self.sim = sim
+        self.level = 1 ^ sim.line.invert
+        self.edges = []   # (us, line level)
+        self._times = []
+
+    def value(self, v:int=None) -> int:
+        if v is None:
+            return self.level
+        if v != self.level:
+            self.level = v
+            self.edges.append((self.sim.us, v ^ self.sim.line.invert))
+            self._times.append(self.sim.us)
+
+    def levelAt(self, us:float) -> int:
+        i = bisect_right(self._times, us) - 1
+        return self.edges[i][1] if i >= 0 else 1
+
+###############################################################################
+
+class Sim:
+    'runs a TTY with its timer and RX pin IRQ in virtual time'
+
+    def __init__(self, tty, baud:float=None, loopback:bool=False, invert:bool=False, bias:float=0., jitter:float=0., seed:int=1) -> None:
+        self.tty = tty
+        self.us = 0
+        self.line = Line(loopback, invert, bias, jitter, seed)
+        self.peer = Peer(self, baud or tty.getBaud())
+        self.rxPin = SimRxPin(self)
+        self.txPin = SimTxPin(self)
+        self.ticks = 0   # timer calls
+        self.irqs = 0   # pin IRQ calls
+        tty._pinRx = self.rxPin
+        tty._pinTx = self.txPin
+        if getattr(tty, '_edgeRx', None):
+            tty._edgeRx._pinRx = self.rxPin
+            tty._edgeRx.enable()
+        self._timer = tty._timer
+        self._inits = self._timer.inits
+        self._nextTick = self._timer.period * 1000
+        self._irqLevel = self.rxPin.value()
+        utime.set_us(0)
+
+    def rxLevel(self) -> int:
+        'line level at the RX pin - with loopback the TX of the TTY opens the loop too'
+        level = self.line.level(self.us)
+        if self.line.loopback and not self.txPin.level ^ self.line.invert:
+            level = 0
+        return level
+
+    def _setTime(self, us:int) -> None:
+        self.us = us
+        utime.set_us(us)
+
+    def _checkIrq(self) -> None:
+        'call the pin IRQ on a level change at the current time'
+        pin = self.rxPin
+        level = pin.value()
+        if level != self._irqLevel:
+            self._irqLevel = level
+            if pin.irqHandler and pin.irqTrigger & (Pin.IRQ_RISING if level else Pin.IRQ_FALLING):
+                self.irqs += 1
+                pin.irqHandler(pin)
+
+    def _checkTimer(self) -> None:
+        if self._timer.inits != self._inits:   # timer restarted - new phase
+            self._inits = self._timer.inits
+            self._nextTick = self.us + self._timer.period * 1000
+
+    def run(self, ms:float) -> None:
+        'advance the virtual time'
+        end = self.us + int(ms * 1000)
+        timer = self._timer
+        while True:
+            tickT = self._nextTick if timer.running else None
+            edgeT = self.line.nextEdge(self.us) if self.rxPin.irqHandler else None
+            if edgeT is not None and edgeT < end and (tickT is None or edgeT <= tickT):   # edge first at same time
+                self._setTime(edgeT)
+                self._checkIrq()
+                self._checkTimer()
+            elif tickT is not None and tickT < end:
+                self._setTime(tickT)
+                self._nextTick = tickT + timer.period * 1000
+                timer.callback()
+                self.ticks += 1
+                self._checkTimer()
+                if self.line.loopback:   # TX changed the line
+                    self._checkIrq()
+                else:
+                    self._irqLevel = self.rxPin.value()
+            else:
+                break
+        self._setTime(end)
+
+    def runUntil(self, cond, ms:float=60000, step:float=100) -> bool:
+        'advance the virtual time in steps till cond() is true - False on timeout'
+        while ms > 0:
+            if cond():
+                return True
+            self.run(step)
+            ms -= step
+        return cond()
+
+###############################################################################
@@ -0,0 +1,58 @@
+#!python3
+
+__author__      = "Jochen Krapf"
+__email__       = "jk@nerd2nerd.org"
+__copyright__   = "Copyright 2020, JK"
+__license__     = "GPL3"
+__version__     = "0.0.1"
+
+# Stand-in for MicroPython module utime with a virtual clock.
+# The clock only moves by set_us()/advance_us()/sleep*() - tests are independent of the PC speed.
+# Tick values wrap around like on MicroPython.
+
+###############################################################################
+
+TICKS_PERIOD = 1 << 30
+TICKS_MAX = TICKS_PERIOD - 1
+
+_now_us = 0
+
+###############################################################################
+
+def set_us(us:int) -> None:
+    global _now_us
+    _now_us = us
+
+def advance_us(us:int) -> None:
+    global _now_us
+    _now_us += us
+
+# -----
+
+def ticks_us() -> int:
+    return _now_us & TICKS_MAX
+
+def ticks_ms() -> int:
+    return (_now_us // 1000) & TICKS_MAX
+
+def ticks_add(ticks:int, delta:int) -> int:
+    return (ticks + delta) & TICKS_MAX
+
+def ticks_diff(ticks1:int, ticks2:int) -> int:
+    diff = (ticks1 - ticks2) & TICKS_MAX
+    if diff >= TICKS_PERIOD // 2:
+        diff -= TICKS_PERIOD
+    return diff
+
+# -----
+
+def sleep(s:float) -> None:
+    advance_us(int(s * 1000000))
+
+def sleep_ms(ms:int) -> None:
+    advance_us(ms * 1000)
+
+def sleep_us(us:int) -> None:
+    advance_us(us)
+
+###############################################################################
@@ -0,0 +1,233 @@
+#!python3
+"""
+RX of a historic teletype decoded from pin change timestamps
+
+The pin IRQ on both edges stores ticks_us() and the pin level into a preallocated buffer.
+poll() decodes chars from the edge times: start bit, 5 data bits and stop bit are sampled
+in the middle of each bit with microsecond resolution. No timer is needed - an idle line costs nothing.
+
+Usage:
+import edgerx
+rx = edgerx.EdgeRX(50, 0)
+if rx.any():
+    codes = rx.read(10)
+
+With a TTY the RX buffer is shared and TX stays on the timer.
+The timer handler calls poll() every tick. With setIdle() the timer stops on an idle line
+and the next edge starts it again:
+tty = TTY(50, 2, tx, rx, edgeRx=True)
+tty.setIdle()
+"""
+
+try:  # try MicroPython
+    import uos as os
+    MICROPYTHON = True
+except:  # CPython
+    MICROPYTHON = False
+    __author__ = "Jochen Krapf"
+    __email__ = "jk@nerd2nerd.org"
+    __copyright__ = "Copyright 2020, JK"
+    __license__ = "GPL3"
+    __version__ = "0.0.1"
+
+if MICROPYTHON:
+    from machine import Pin
+    from machine import disable_irq, enable_irq
+    from utime import ticks_us, ticks_diff
+    from array import array
+
+else:  # CPython
+    from debug_pc.machine import Pin
+    from debug_pc.utime import ticks_us, ticks_diff
+    from array import array
+
+    def const(x):
+        return x
+
+    def disable_irq():
+        return 0
+
+    def enable_irq(state):
+        pass
+
+from ringbuf import RingBuffer
+from tty import BMC_DIAL_DIGITS
+
+###############################################################################
+
+EDGE_BUFFER_SIZE = const(128)   # edges - a char has up to 6 edges
+RX_BUFFER_SIZE = const(256)
+
+###############################################################################
+
+
+class EdgeRX:
+    'Receiver for low baud rates decoding chars from the timestamps of pin edges'
+
+    def __init__(_, baud:float=50, rx:int=0, rxInvert:bool=False, rxBuffer:RingBuffer=None, pin:Pin=None):
+        _._rxInvert = 1 if rxInvert else 0
+        _._pinRx = pin if pin is not None else Pin(rx, Pin.IN, Pin.PULL_UP)
+        _._rxBuffer = rxBuffer if rxBuffer is not None else RingBuffer(RX_BUFFER_SIZE)
+
+        # edges from IRQ
+        _._times = array('l', [0] * EDGE_BUFFER_SIZE)
+        _._levels = bytearray(EDGE_BUFFER_SIZE)
+        _._head = 0   # written by IRQ
+        _._tail = 0   # read by poll()
+        _.overflow = 0   # lost edges
+        _.errors = 0   # chars with missing stop bit
+        _.chars = 0   # chars with correct stop bit
+
+        # decoder
+        _._level = _._pinRx.value() ^ _._rxInvert   # line level after the last used edge
+        _._start = None   # time of start bit
+        _.dialActive = False
+        _.wakeup = None   # called by the IRQ on each edge - set by a sleeping TTY
+
+        _.init(baud)
+        _.enable()
+
+    # -----
+
+    def init(_, baud:float=50, rxBuffer:RingBuffer=None):
+        'calculate sample points in us after the falling edge of the start bit'
+        if rxBuffer is not None:
+            _._rxBuffer = rxBuffer
+        bit = 1000000. / baud
+        _._checkStartUs = int(bit * 0.5 + 0.5)
+        _._dataUs = tuple(int(bit * (i + 1.5) + 0.5) for i in range(5))
+        _._checkStopUs = int(bit * 6.5 + 0.5)
+
+    # -----
+
+    def enable(_):
+        'start recording edges - e.g. after the pin IRQ was used for baud detection'
+        _._head = _._tail
+        _._start = None
+        _._level = _._pinRx.value() ^ _._rxInvert
+        _._pinRx.irq(handler=_._irq, trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING)
+
+    # -----
+
+    def deinit(_):
+        _._pinRx.irq(handler=None)
+
+    # -----
+
+    def __repr__(_):
+        return '<EdgeRX, edges={}, overflow={}, errors={}>'.format(
+            (_._head - _._tail) % EDGE_BUFFER_SIZE, _.overflow, _.errors)
+
+    # =====
+
+    def _irq(_, pin) -> None:
+        t = ticks_us()
+        h = _._head
+        n = h + 1
+        if n >= EDGE_BUFFER_SIZE:
+            n = 0
+        if n == _._tail:   # full
+            _.overflow += 1
+            return
+        _._times[h] = t
+        _._levels[h] = pin.value() ^ _._rxInvert
+        _._head = n
+        if _.wakeup:
+            _.wakeup(pin)
+
+    # -----
+
+    def _levelAt(_, us:int) -> int:
+        'line level at us after start bit - uses up all edges before'
+        start = _._start
+        t = _._tail
+        while t != _._head and ticks_diff(_._times[t], start) <= us:
+            _._level = _._levels[t]
+            t += 1
+            if t >= EDGE_BUFFER_SIZE:
+                t = 0
+        _._tail = t
+        return _._level
+
+    # -----
+
+    def poll(_) -> None:
+        'decode all complete chars from the edges'
+        while True:
+            if _._start is None:   # idle - search falling edge
+                t = _._tail
+                if t == _._head:
+                    return
+                _._level = _._levels[t]
+                if not _._level:
+                    _._start = _._times[t]
+                t += 1
+                if t >= EDGE_BUFFER_SIZE:
+                    t = 0
+                _._tail = t
+                continue
+
+            if ticks_diff(ticks_us(), _._start) < _._checkStopUs:   # char not complete
+                return
+
+            if _._levelAt(_._checkStartUs):   # only spike -> ignore
+                _._start = None
+                continue
+
+            code = 0
+            i = 0
+            while i < 5:   # no range() - may run in timer ISR
+                if _._levelAt(_._dataUs[i]):
+                    code |= 1 << i
+                i += 1
+
+            if _._levelAt(_._checkStopUs):   # correct stop bit
+                _.chars += 1
+                if _.dialActive:
+                    if code in BMC_DIAL_DIGITS:
+                        _._put(0xD0 + BMC_DIAL_DIGITS.index(code))
+                else:
+                    _._put(code)
+            else:
+                _.errors += 1
+            _._start = None
+            if not _._level:   # still low - next falling edge starts the next char
+                _._levelWait()
+
+    # -----
+
+    def _levelWait(_) -> None:
+        'skip edges till the line is high again'
+        t = _._tail
+        while t != _._head and not _._levels[t]:
+            t += 1
+            if t >= EDGE_BUFFER_SIZE:
+                t = 0
+        _._tail = t
+
+    # -----
+
+    def _put(_, code:int) -> None:
+        state = disable_irq()   # timer ISR may write to the same buffer
+        _._rxBuffer.put(code)
+        enable_irq(state)
+
+    # =====
+
+    def any(_) -> int:
+        _.poll()
+        return _._rxBuffer.any()
+
+    # -----
+
+    def read(_, count:int=1) -> bytes:
+        _.poll()
+        return _._rxBuffer.read(count)
+
+    # -----
+
+    def readinto(_, buf, count:int=-1) -> int:
+        _.poll()
+        return _._rxBuffer.readinto(buf, count)
+
+###############################################################################
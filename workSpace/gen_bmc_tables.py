@@ -0,0 +1,212 @@
+#!python3
+"""
+Generator for the modules bmc_tables_0 .. bmc_tables_5 and bmc_tables - the precomputed tables of module bmc.
+Holds the source tables of the Baudot-Murray-Code and builds all lookup tables from them.
+One module per coding and bit order - module bmc imports only the one in use.
+The generated modules contain only bytes, str and tuple constants and can be frozen into the firmware.
+Usage on a PC after changing a source table:
+    python3 gen_bmc_tables.py
+Without the generated modules the module bmc builds the tables from here on first use.
+"""
+
+try:  # try MicroPython
+    import uos as os
+    MICROPYTHON = True
+except:  # CPython
+    MICROPYTHON = False
+    __author__ = "Jochen Krapf"
+    __email__ = "jk@nerd2nerd.org"
+    __copyright__ = "Copyright 2020, JK"
+    __license__ = "GPL3"
+    __version__ = "0.0.1"
+
+from bmc import BMC, LAYER_ANY
+
+###############################################################################
+
+# Baudot-Murray-Code to ASCII tables
+LUT_BM2A_ITA2 = (
+    "~E\nA SIU\rDRJNFCKTZLWHYPQOBG]MXV[", 
+    "~3\n- '87\r@4%,~:(5+)2~6019?~]./=["
+)
+LUT_BM2A_US = (
+    "~E\nA SIU\rDRJNFCKTZLWHYPQOBG]MXV[", 
+    "~3\n- %87\r$4',!:(5\")2@6019?&]./;["
+)
+LUT_BM2A_MKT2 = (
+    "~E\nA SIU\rDRJNFCKTZLWHYPQOBG]MXV[", 
+    "~3\n- '87\r@4Ю,Э:(5+)2Щ6019?Ш]./=[",
+    "~Е\nА СИУ\rДРЙНФЦКТЗЛВХЫПЯОБГ]МЬЖ["
+)
+# Baudot-Murray-Code mode switch codes
+LUT_BMsw_ITA2 = (0x1F, 0x1B)
+LUT_BMsw_US = (0x1F, 0x1B)
+LUT_BMsw_MKT2 = (0x1F, 0x1B, 0x00)
+
+# Baudot-Murray-Code valid ASCII table
+VALID_CONVERT_CHARS = " ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-+=:/()?.,'\n\r"
+LUT_CONVERT_CHARS = {
+    'Ä': 'AE',
+    'Ö': 'OE',
+    'Ü': 'UE',
+    'ß': 'SS',
+    '\a': '%',  # Bell
+    '\f': '(FF)',  # Form Feed
+    '\t': '(TAB)',  # Tab
+    '\v': '(VT)',  # Vertical Tab
+    '\x1B': '(ESC)',  # Escape
+    '\b': '(BS)',  # Backspace
+    '&': '(AND)',
+    '€': '(EUR)',
+    '$': '(USD)',
+    '<': '(LT)',
+    '>': '(GT)',
+    '|': '(PIPE)',
+    '*': '(STAR)',
+    '#': '(HASH)',
+    '@': '(AT)',
+    '"': "'",
+    ';': ',.',
+    '!': '(./)',
+    '%': '(./.)',
+    '[': '(',
+    ']': ')',
+    '{': '-(',
+    '}': ')-',
+    '\\': '/',
+    '_': '--',
+    'Æ': 'AE',
+    'æ': 'AE',
+    'Œ': 'OE',
+    'œ': 'OE',
+    'Ø': 'OE',
+    'ø': 'OE',
+    'Þ': 'TH',
+    'þ': 'TH',
+    'ä': 'AE',
+    'ö': 'OE',
+    'ü': 'UE',
+    '–': '-',
+    '—': '-',
+    '‘': "'",
+    '’': "'",
+    '‚': "'",
+    '“': "'",
+    '”': "'",
+    '„': "'",
+    '«': "'",
+    '»': "'",
+}
+# accented latin letters to base letter - upper and lower case as str.upper() is ASCII only on MicroPython
+ACCENTED_CHARS = 'ÀÁÂÃÅĀĂĄÇĆĈĊČĎĐÈÉÊËĒĔĖĘĚĜĞĠĢĤĦÌÍÎÏĨĪĬĮİĴĶĹĻĽĿŁÑŃŅŇÒÓÔÕŌŎŐŔŖŘŚŜŞŠŢŤŦÙÚÛŨŪŬŮŰŲŴÝŶŸŹŻŽÐ' \
+    'àáâãåāăąçćĉċčďđèéêëēĕėęěĝğġģĥħìíîïĩīĭįıĵķĺļľŀłñńņňòóôõōŏőŕŗřśŝşšţťŧùúûũūŭůűųŵýŷÿźżžð'
+ACCENTED_BASE = 'AAAAAAAACCCCCDDEEEEEEEEEGGGGHHIIIIIIIIIJKLLLLLNNNNOOOOOOORRRSSSSTTTUUUUUUUUUWYYYZZZD' \
+    'AAAAAAAACCCCCDDEEEEEEEEEGGGGHHIIIIIIIIIJKLLLLLNNNNOOOOOOORRRSSSSTTTUUUUUUUUUWYYYZZZD'
+
+LUT_BM2A = (LUT_BM2A_ITA2, LUT_BM2A_US, LUT_BM2A_MKT2)   # index is BMC.CODING_...
+LUT_BMsw = (LUT_BMsw_ITA2, LUT_BMsw_US, LUT_BMsw_MKT2)
+
+###############################################################################
+
+def build_A2BM(lut_BM2A, lut_BMsw, flip_bits:bool) -> tuple:
+    'build reverse table char -> (layer << 5 | code) and the (flipped) mode switch codes'
+    lut = {}
+    for layer, chars in enumerate(lut_BM2A):
+        for code, a in enumerate(chars):
+            if a in lut:
+                continue   # take first code like str.index()
+            if flip_bits:
+                code = BMC.do_flip_bits((code,))[0]
+            if all(a in chars_other for chars_other in lut_BM2A):
+                layer_a = LAYER_ANY
+            else:
+                layer_a = layer
+            lut[a] = layer_a << 5 | code
+    for a in list(lut):   # streams are not converted to upper case
+        if a.lower() not in lut:
+            lut[a.lower()] = lut[a]
+    if flip_bits:
+        lut_BMsw = tuple(BMC.do_flip_bits(lut_BMsw))
+    return lut, lut_BMsw
+
+# -----
+
+def build_BM2A(lut_BM2A, flip_bits:bool) -> tuple:
+    'build per layer tables received code -> char with flip_bits folded in'
+    if not flip_bits:
+        return lut_BM2A
+    flip = BMC.do_flip_bits(range(32))
+    return tuple(''.join([chars[flip[b]] for b in range(32)]) for chars in lut_BM2A)
+
+# -----
+
+def build_bytes(lut_A2BM:dict, lut_BM2A_in) -> tuple:
+    'build tables for bytes-like streams - ASCII byte -> (layer << 5 | code) and code -> UTF-8 (2 bytes per code)'
+    lut_a = bytearray(b'\xFF' * 0x80)
+    for a, e in lut_A2BM.items():
+        if ord(a) < 0x80:
+            lut_a[ord(a)] = e
+    lut_u = []
+    for chars in lut_BM2A_in:
+        u = bytearray()
+        for a in chars:
+            a = a.encode()
+            u += a + b'\x00' * (2 - len(a))   # all symbols are U+0000..U+07FF
+        lut_u.append(bytes(u))
+    return bytes(lut_a), tuple(lut_u)
+
+# -----
+
+def tables(key:int) -> tuple:
+    'build the tables for key = coding << 1 | flip_bits in the order of bmc.T_...'
+    flip_bits = bool(key & 1)
+    lut_BM2A = LUT_BM2A[key >> 1]
+    lut_A2BM, lut_BMsw_out = build_A2BM(lut_BM2A, LUT_BMsw[key >> 1], flip_bits)
+    lut_BM2A_in = build_BM2A(lut_BM2A, flip_bits)
+    return (lut_A2BM, lut_BMsw_out, lut_BM2A_in) + build_bytes(lut_A2BM, lut_BM2A_in)
+
+# -----
+
+def tty_text() -> dict:
+    'build the text conversion table for BMC.ascii_to_tty_text()'
+    lut = {}
+    for a in VALID_CONVERT_CHARS:
+        lut[a] = a
+        lut[a.lower()] = a
+    for a, b in zip(ACCENTED_CHARS, ACCENTED_BASE):
+        lut[a] = b
+    for a, b in LUT_CONVERT_CHARS.items():
+        lut[a] = b
+    return lut
+
+# =====
+
+def _header(f, what:str) -> None:
+    f.write('#!python3\n')
+    f.write('"""\nPrecomputed {} for module bmc - generated by gen_bmc_tables.py - do not edit\n"""\n\n'.format(what))
+
+# -----
+
+def write(fileName:str='bmc_tables') -> None:
+    'write the tables as constants to python modules - one per coding and bit order and one for the text conversion'
+    for key in range(len(LUT_BM2A) * 2):
+        with open('{}_{}.py'.format(fileName, key), 'w', encoding='utf-8', newline='\r\n') as f:
+            _header(f, 'tables of coding {} flip_bits {}'.format(key >> 1, key & 1))
+            lut_A2BM, lut_BMsw_out, lut_BM2A_in, lut_A2BM_bytes, lut_BM2A_utf8 = tables(key)
+            f.write('A2BM_KEYS = {!r}\n'.format(''.join(lut_A2BM.keys())))
+            f.write('A2BM_VALUES = {!r}\n'.format(bytes(lut_A2BM.values())))
+            f.write('BMSW = {!r}\n'.format(bytes(lut_BMsw_out)))
+            f.write('BM2A = {!r}\n'.format(tuple(lut_BM2A_in)))
+            f.write('A2BM_BYTES = {!r}\n'.format(lut_A2BM_bytes))
+            f.write('BM2A_UTF8 = {!r}\n'.format(lut_BM2A_utf8))
+    with open(fileName + '.py', 'w', encoding='utf-8', newline='\r\n') as f:
+        _header(f, 'text conversion table')
+        lut = tty_text()
+        f.write('# text conversion - values separated by NUL\n')
+        f.write('TTY_TEXT_KEYS = {!r}\n'.format(''.join(lut.keys())))
+        f.write('TTY_TEXT_VALUES = {!r}\n'.format('\x00'.join(lut.values())))
+
+###############################################################################
+
+if __name__ == "__main__":
+    write()
@@ -0,0 +1,187 @@
+#!python3
+"""
+Distortion margin analyzer for the RX of module tty - PC only.
+Drives the RX state machine of TTY in virtual time with a distorted peer signal
+and counts the chars decoded wrong. The sample points are taken from TTY as configured
+(_checkStartT, _rxDataTs, _checkStopT) - or moved by the sample position for a sweep.
+Distortion in percent of a bit:
+    bias    marks longer (+) or shorter (-)
+    speed   start-stop distortion - peer bit length longer (+) or shorter (-) to move the stop bit edge by d
+    jitter  random shift of each edge
+Usage:
+    python3 margin.py [chars] [baud ...]
+A setting of 20000 chars takes about a second, the full sweep some minutes.
+"""
+
+__author__ = "Jochen Krapf"
+__email__ = "jk@nerd2nerd.org"
+__copyright__ = "Copyright 2020, JK"
+__license__ = "GPL3"
+__version__ = "0.0.1"
+
+import random
+import sys
+import time
+
+from tty import *
+
+###############################################################################
+
+CHARS = 20000   # chars per setting
+BAUD_RATES = (45.45, 50, 75, 100)
+KINDS = ('bias+', 'bias-', 'speed+', 'speed-', 'jitter')
+STEP = 1.   # percent - resolution of the margin
+WORN = 25.   # percent - distortion of a worn machine for the error rate column
+
+###############################################################################
+
+class PeerPin:
+    'RX pin with the distorted signal of the peer - level at the time of the current tick'
+    def __init__(self):
+        self.edges = []   # (us, level) of the current char
+        self.pos = 0
+        self.us = 0.   # time of the current tick
+        self.level = 1
+
+    def value(self, v:int=None) -> int:
+        edges = self.edges
+        while self.pos < len(edges) and edges[self.pos][0] <= self.us:
+            self.level = edges[self.pos][1]
+            self.pos += 1
+        return self.level
+
+###############################################################################
+
+def distortion_edges(code:int, start:float, bit:float, kind:str, d:float, rnd) -> list:
+    'edges (us, level) of a char with 1 start, 5 data and 1.5 stop bits - distorted by d percent of a bit'
+    if kind == 'speed+':
+        bit *= 1 + d / 600   # stop bit starts after 6 bits
+    elif kind == 'speed-':
+        bit *= 1 - d / 600
+    edges = []
+    level = 1
+    bits = [0] + [(code >> i) & 1 for i in range(5)] + [1]
+    for i, b in enumerate(bits):
+        if b != level:
+            t = start + bit * i
+            if i:   # the start edge defines the time base
+                if kind == 'bias+':
+                    t += bit * d / 100 * (1 if b == 0 else 0)   # space starts late
+                elif kind == 'bias-':
+                    t += bit * d / 100 * (1 if b == 1 else 0)   # mark starts late
+                elif kind == 'jitter':
+                    t += bit * rnd.uniform(-d, d) / 100
+            edges.append((t, b))
+            level = b
+    return edges
+
+# -----
+
+def error_rate(tty, kind:str, d:float, chars:int=CHARS, stopAtError:bool=False, seed:int=1) -> float:
+    'rate of chars decoded wrong or lost'
+    rnd = random.Random(seed)
+    pin = PeerPin()
+    tty._pinRx = pin
+    tickUs = tty._period * 1000.
+    bit = 1000000. / tty._baud
+    charUs = bit * 7.5 * (1 + (d / 600 if kind == 'speed+' else 0))
+    handler = tty._timerHandler
+    buf = tty._rxDataBuffer
+    us = 0.
+    for i in range(tty._len1charT * 3):   # line up -> listen
+        us += tickUs
+        pin.us = us
+        handler()
+    buf.clear()
+    errors = 0
+    for n in range(chars):
+        code = rnd.randrange(32)
+        start = us + rnd.uniform(0, tickUs)   # any phase to the tick
+        pin.edges = distortion_edges(code, start, bit, kind, d, rnd)
+        pin.pos = 0
+        end = start + charUs
+        while us < end:
+            us += tickUs
+            pin.us = us
+            handler()
+        got = buf.get()
+        if got != code or buf.any():
+            buf.clear()
+            errors += 1
+            if stopAtError:
+                return 1.
+        while tty._state & STATE_MASK_LISTEN == 0:   # stop check of a lost char
+            us += tickUs
+            pin.us = us
+            handler()
+    return errors / chars
+
+# -----
+
+def margin(tty, kind:str, chars:int=CHARS) -> float:
+    'largest distortion in percent without char errors - bisection in steps of STEP'
+    lo = 0   # in steps - no errors
+    hi = int(100 / STEP)   # in steps - errors
+    while hi - lo > 1:
+        m = (lo + hi) // 2
+        if error_rate(tty, kind, m * STEP, chars, True):
+            hi = m
+        else:
+            lo = m
+    return lo * STEP
+
+# -----
+
+def make_tty(baud:float, period:int, sample:float=0.5) -> TTY:
+    'TTY with the sample points moved to sample (0...1) of the bit - 0.5 is the middle as configured'
+    tty = TTY(baud, period)
+    tty.deinit()   # handler is called here, not by the timer
+    if sample != 0.5:
+        slice = (1000. / period) / baud
+        tty._checkStartT = int(slice * sample + 0.001)
+        tty._rxDataTs = [int(slice * (i + 1 + sample) + 0.001) for i in range(5)]
+        tty._checkStopT = int(slice * (6 + sample) + 0.001)
+        tty._buildActionTables()   # own tables - not the shared ones
+    return tty
+
+###############################################################################
+
+def report_margin(bauds, chars:int=CHARS):
+    'margin per kind of distortion and error rate of a worn machine per baud rate and timer period'
+    print('Margin in % of a bit without errors in {} chars, error rate at {}% distortion'.format(chars, WORN))
+    print('{:8} {:>6} {}  {}'.format('baud', 'period', ' '.join(['{:>7}'.format(k) for k in KINDS]), '  CER worn'))
+    for baud in bauds:
+        for period in sorted(set((1, bestPeriod(baud), PERIOD_MAX // 2))):
+            tty = make_tty(baud, period)
+            m = [margin(tty, kind, chars) for kind in KINDS]
+            cer = max([error_rate(tty, kind, WORN, chars) for kind in ('bias+', 'bias-', 'jitter')])
+            print('{:8g} {:>4} ms {}  {:9.2%}'.format(baud, period, ' '.join(['{:7.0f}'.format(x) for x in m]), cer))
+
+# -----
+
+def report_sample(bauds, chars:int=CHARS):
+    'margin of the weakest kind of distortion for moved sample points at the best timer period'
+    samples = (0.4, 0.45, 0.5, 0.55, 0.6)
+    print('Margin of the weakest kind in % of a bit per sample point (fraction of the bit)')
+    print('{:8} {:>6} {}'.format('baud', 'period', ' '.join(['{:>6}'.format(s) for s in samples])))
+    for baud in bauds:
+        period = bestPeriod(baud)
+        m = []
+        for sample in samples:
+            tty = make_tty(baud, period, sample)
+            m.append(min([margin(tty, kind, chars) for kind in KINDS]))
+        print('{:8g} {:>4} ms {}'.format(baud, period, ' '.join(['{:6.0f}'.format(x) for x in m])))
+
+# -----
+
+def run(chars:int=CHARS, bauds=BAUD_RATES):
+    t = time.perf_counter()
+    report_margin(bauds, chars)
+    report_sample(bauds, chars)
+    print('{:.0f} s'.format(time.perf_counter() - t))
+
+###############################################################################
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(int(args[0]) if args else CHARS, [float(a) for a in args[1:]] or BAUD_RATES)
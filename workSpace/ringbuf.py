@@ -0,0 +1,156 @@
+#!python3
+"""
+Fixed size ring buffer of bytes for data between the timer ISR and the main loop
+
+One side only puts, the other side only gets - head is changed by the writer, tail by the reader.
+put() and get() never allocate and can be used in a hard IRQ.
+Bytes not fitting into the buffer are dropped and counted in overflow.
+
+Usage:
+import ringbuf
+r = ringbuf.RingBuffer(256)
+r.write(b'\x1f\x03')
+r.put(0x19)
+c = r.get()
+b = r.read(10)
+"""
+
+try:  # try MicroPython
+    import uos as os
+    MICROPYTHON = True
+except:  # CPython
+    MICROPYTHON = False
+    __author__ = "Jochen Krapf"
+    __email__ = "jk@nerd2nerd.org"
+    __copyright__ = "Copyright 2020, JK"
+    __license__ = "GPL3"
+    __version__ = "0.0.1"
+
+###############################################################################
+
+
+class RingBuffer:
+    'Ring buffer of bytes with head and tail index - holds size-1 bytes'
+
+    def __init__(_, size:int=256):
+        _._buf = bytearray(size)
+        _._size = size
+        _._head = 0   # next write index
+        _._tail = 0   # next read index
+        _.overflow = 0   # number of dropped bytes
+
+    # -----
+
+    def __len__(_) -> int:
+        return _.any()
+
+    # -----
+
+    def __repr__(_):
+        return '<RingBuffer, used={}/{}, overflow={}>'.format(_.any(), _._size - 1, _.overflow)
+
+    # =====
+
+    def any(_) -> int:
+        'number of bytes in buffer'
+        n = _._head - _._tail
+        if n < 0:
+            n += _._size
+        return n
+
+    # -----
+
+    def free(_) -> int:
+        'number of bytes fitting into buffer'
+        return _._size - 1 - _.any()
+
+    # -----
+
+    def clear(_) -> None:
+        'drop all bytes - reader side'
+        _._tail = _._head
+
+    # -----
+
+    def put(_, b:int) -> bool:
+        'put a single byte - for ISR'
+        h = _._head + 1
+        if h >= _._size:
+            h = 0
+        if h == _._tail:   # full
+            _.overflow += 1
+            return False
+        _._buf[_._head] = b
+        _._head = h
+        return True
+
+    # -----
+
+    def get(_) -> int:
+        'get a single byte or -1 if empty - for ISR'
+        t = _._tail
+        if t == _._head:
+            return -1
+        b = _._buf[t]
+        t += 1
+        if t >= _._size:
+            t = 0
+        _._tail = t
+        return b
+
+    # -----
+
+    def write(_, data) -> int:
+        'put bytes in bulk - returns number of bytes written, the rest is counted as overflow'
+        n = len(data)
+        free = _.free()
+        if n > free:
+            _.overflow += n - free
+            n = free
+        h = _._head
+        k = _._size - h
+        if k > n:
+            k = n
+        _._buf[h:h + k] = data[:k]
+        if n > k:   # wrap around
+            _._buf[:n - k] = data[k:n]
+        h += n
+        if h >= _._size:
+            h -= _._size
+        _._head = h   # publish after copy
+        return n
+
+    # -----
+
+    def readinto(_, dst, count:int=-1) -> int:
+        'get bytes in bulk into bytearray/memoryview dst - returns number of bytes'
+        n = _.any()
+        if count < 0 or count > len(dst):
+            count = len(dst)
+        if n > count:
+            n = count
+        t = _._tail
+        k = _._size - t
+        if k > n:
+            k = n
+        dst[:k] = _._buf[t:t + k]
+        if n > k:   # wrap around
+            dst[k:n] = _._buf[:n - k]
+        t += n
+        if t >= _._size:
+            t -= _._size
+        _._tail = t   # release after copy
+        return n
+
+    # -----
+
+    def read(_, count:int=-1) -> bytes:
+        'get up to count bytes in bulk, all for count < 0'
+        n = _.any()
+        if 0 <= count < n:
+            n = count
+        dst = bytearray(n)
+        _.readinto(dst, n)
+        return bytes(dst)
+
+###############################################################################
@@ -24,6 +24,9 @@ t = telex.Telex('myconfig.json')
 if t.any():
   c = t.read()
 t.write('RYRYRYRYRY')
+
+Several teletypes on one timer - "LINES" in config:
+t1 = telex.Telex(line=1)
 """
 
 try:  # try MicroPython
@@ -54,9 +57,10 @@ else:  # CPython
     def const(x):
         return x
 
-from tty import TTY
-from bmc import BMC
+from tty import TTY, bestPeriod
+from bmc import BMC, BMCache
 import json
+import time
 from statusLED import StatusLED
 gc.collect()
 
@@ -72,6 +76,7 @@ Escape shortcuts:
 <ESC> R   'ryry...'
 <ESC> F   'quick brown fox...'
 <ESC> K   'kaufen sie...'
+<ESC> J   Timer jitter since last <ESC> J
 <ESC> H   This help
 Control characters:
 ~   Null
@@ -83,6 +88,15 @@ Control characters:
 
 DEFAULT_CONFIG_FILE = 'telex.json'
 
+TAPE_CHUNK = const(64)   # codes read from or written to a tape image at once
+TAPE_TX_LEVEL = const(16)   # refill TTY TX buffer below this number of codes
+RX_COMPACT = const(256)   # read chars dropped from the RX char buffer at this read index
+TX_WAIT_MS = const(2000)   # wait for space in TTY TX buffer - line off, RX or dialing stops TX, then codes are dropped
+
+CODE_LTRS = b'\x1f'
+CODE_FIGS = b'\x1b'
+CODE_WRU = b'\x09'   # in FIGS mode
+
 MP_STREAM_POLL_RD = const(1)
 MP_STREAM_POLL_WR = const(4)
 MP_STREAM_POLL = const(3)
@@ -91,11 +105,18 @@ MP_STREAM_ERROR = const(-1)
 ###############################################################################
 
 class Telex(io.IOBase):
-    def __init__(_, cnfName:str=None):
+    def __init__(_, cnfName:str=None, line:int=None):
 
         _._cnfName = cnfName
-        _._rxCharBuffer = []
+        _._engine = None
+        _._tty = None
+        _._ledSt = None   # optional - lines may have no LED
+        _._rxCharBuffer = ''   # decoded text, escape sequences and command output
+        _._rxCharPos = 0   # read index in _rxCharBuffer
+        _._rxItems = []   # (start, end) in _rxCharBuffer of unread items longer than a char
         _._escape = False
+        _._tapeTxFile = None
+        _._tapeRxFile = None
 
         # coder from BaudotMurrayCode to ASCII
         
@@ -109,6 +130,8 @@ class Telex(io.IOBase):
         with open(cnfName, 'r') as f:
             _.cnf = json.load(f)
         assert _.cnf
+        if line is not None:
+            _.cnf = _._lineConfig(_.cnf, line)
 
         if 'PIN' not in _.cnf:
             raise Exception('Missing PIN section in json file')
@@ -130,16 +153,33 @@ class Telex(io.IOBase):
         ttyRxInvert = cp.get('INVERT', False)
         
         ttyBaud = _.cnf.get('TTY_BAUD', 50)
+        ttyAutoBaud = ttyBaud == 'AUTO'   # detect from first received chars
+        if ttyAutoBaud:
+            ttyBaud = 50
         
-        ttyPeriod = 2   #TODO default timer dependent on baudrate
-        if ttyBaud >= 70:
-            ttyPeriod = 1
+        ttyPeriod = _.cnf.get('TTY_PERIOD') or bestPeriod(ttyBaud)
         
-        _._tty = TTY(ttyBaud, ttyPeriod, ttyTxGPIO, ttyRxGPIO, ttyTxInvert, ttyRxInvert)
+        if line is not None:   # one timer for all lines
+            import ttymulti
+            _._engine = ttymulti.engine(ttyPeriod)
+            _._tty = _._engine.addLine(ttyBaud, ttyTxGPIO, ttyRxGPIO, ttyTxInvert, ttyRxInvert, waveTx=_.cnf.get('TTY_WAVE', False))
+        elif _.cnf.get('TTY_BACKEND', 'TIMER') == 'UART':   # hardware UART with 5 bits, software UART as fallback
+            import ttyuart
+            _._tty = ttyuart.create(ttyBaud, ttyPeriod, ttyTxGPIO, ttyRxGPIO, ttyTxInvert, ttyRxInvert)
+        else:
+            _._tty = TTY(ttyBaud, ttyPeriod, ttyTxGPIO, ttyRxGPIO, ttyTxInvert, ttyRxInvert, waveTx=_.cnf.get('TTY_WAVE', False))   # TX by RMT
+        _._tty.setIdle(_.cnf.get('TTY_IDLE', 0))   # chars of idle line till the timer stops
+        if _.cnf.get('TTY_JITTER', False):   # histogram of timer lateness - see <ESC> J
+            _.setJitter(True)
+        if ttyAutoBaud:
+            _._tty.detectBaud()
+
+        _._cache = BMCache(_._bm, _.cnf.get('BMC_CACHE', 512))   # encoded recurring fragments
 
+        _._TN = None   # codes answering WRU
         if 'FAKE_TN' in _.cnf and _.cnf['FAKE_TN']:
             TN = '[\r\n' + _.cnf['FAKE_TN'] + ']'
-            _._TN = _._bm.encodeA2BM(TN)
+            _._TN = _._cache.encode(TN)
             _._bm.reset()
 
         _._dialMode = _.cnf.get('DIAL_MODE', _._tty.DIAL_MODE_PULSE)
@@ -180,13 +220,19 @@ class Telex(io.IOBase):
 
     def deinit(_):
         #print('__Telex_deinit__')   #debug
+        _.stopTape()
+        if _._engine:
+            _._engine.removeLine(_._tty)
+            if not len(_._engine):   # last line - next Telex lines may need another period
+                _._engine.deinit()
+            _._engine = None
         if _._tty:
             _._tty.deinit()
-            del _._tty
+            _._tty = None
         if _._ledSt:
             _._ledSt.attractor(0)
             _._ledSt.deinit()
-            del _._ledSt
+            _._ledSt = None
 
     # -----
 
@@ -214,8 +260,8 @@ class Telex(io.IOBase):
 
     def __next__(_):
         _._syncCharBuffer()
-        if _._rxCharBuffer:
-            return _._rxCharBuffer.pop(0)
+        if len(_._rxCharBuffer) > _._rxCharPos:
+            return _._takeChars(1)
         else:
             raise StopIteration()
 
@@ -234,12 +280,32 @@ class Telex(io.IOBase):
                 'i' if _.cnf['PIN']['TTY_TX'].get('INVERT', False) else '',
                 _.cnf['PIN']['TTY_RX']['GPIO'],
                 'i' if _.cnf['PIN']['TTY_RX'].get('INVERT', False) else '',
-                _.cnf['TTY_BAUD'],
+                _._tty.getBaud(),
                 _._tty.getStateStr()
                 )
         except:
             return '<Telex>'
 
+    # -----
+
+    def _lineConfig(_, cnf:dict, line:int) -> dict:
+        'config of a line in "LINES" - the entries of the line override the common ones'
+        import ttymulti
+        lines = cnf['LINES']
+        bauds = []
+        for l in lines:
+            baud = l.get('TTY_BAUD', cnf.get('TTY_BAUD', 50))
+            if baud == 'AUTO':
+                from autobaud import BAUD_RATES
+                bauds.extend(BAUD_RATES)
+            else:
+                bauds.append(baud)
+        cnfLine = dict(cnf)
+        del cnfLine['LINES']
+        cnfLine.update(lines[line])
+        cnfLine['TTY_PERIOD'] = cnf.get('TTY_PERIOD') or ttymulti.commonPeriod(bauds)   # same for all lines
+        return cnfLine
+
     # =====
 
     def ioctl(_, req, arg):
@@ -247,8 +313,9 @@ class Telex(io.IOBase):
         ret = MP_STREAM_ERROR
         if req == MP_STREAM_POLL:
             ret = 0
+            _._pollTape()
             if arg & MP_STREAM_POLL_RD:
-                if _._tty.any() or _._rxCharBuffer:
+                if _._tty.any() or len(_._rxCharBuffer) > _._rxCharPos:
                     ret |= MP_STREAM_POLL_RD
             if arg & MP_STREAM_POLL_WR:
                 if True:
@@ -258,14 +325,81 @@ class Telex(io.IOBase):
     # =====
 
     def _syncCharBuffer(_) -> None:
+        if _._tapeTxFile:
+            _._pollTape()
+
+        if _._tty.isDetectingBaud():
+            ret = _._tty.pollBaud()
+            if not ret:   # codes at wrong baud rate are dropped after detection
+                return
+            _._addItem('{{BAUD {} {}%}}'.format(ret[0], int(ret[1] * 100)))
+
         if not _._tty.any():
             return
 
-        while _._tty.any():
-            bs = _.readCode()
-            a = _._bm.decodeBM2A(bs)
-            if a:
-                _._rxCharBuffer.append(a)
+        bs = _.readCode(-1)   # all codes decoded in one pass
+        a = _._bm.decodeBM2A(bs)
+        n = len(_._rxCharBuffer)
+        i = a.find('{')
+        while i >= 0:   # escape sequence of a code like {#a0} - no braces in the code tables
+            e = a.find('}', i) + 1
+            _._rxItems.append((n + i, n + e))
+            i = a.find('{', e)
+        _._rxCharBuffer += a
+
+    # -----
+
+    def _addItem(_, text:str) -> None:
+        'append text read as a single item - escape sequence or command output'
+        n = len(_._rxCharBuffer)
+        _._rxCharBuffer += text
+        if len(text) > 1:
+            _._rxItems.append((n, n + len(text)))
+
+    # -----
+
+    def _anyItems(_) -> int:
+        n = len(_._rxCharBuffer) - _._rxCharPos
+        for s, e in _._rxItems:
+            n -= e - s - 1
+        return n
+
+    # -----
+
+    def _takeChars(_, count:int) -> str:
+        'get up to count chars or escape sequences from the read index on, all for count < 0 - read chars are dropped when all are read or at RX_COMPACT'
+        buf = _._rxCharBuffer
+        pos = _._rxCharPos
+        items = _._rxItems
+        end = len(buf)
+        i = len(items)
+        if count >= 0:
+            end = pos
+            i = 0
+            while count > 0 and end < len(buf):
+                if i < len(items) and items[i][0] == end:   # whole item
+                    end = items[i][1]
+                    i += 1
+                    count -= 1
+                else:   # plain chars up to the next item
+                    n = (items[i][0] if i < len(items) else len(buf)) - end
+                    if n > count:
+                        n = count
+                    end += n
+                    count -= n
+        if i:
+            del items[:i]
+        if end >= len(buf):
+            _._rxCharBuffer = ''
+            _._rxCharPos = 0
+            return buf[pos:] if pos else buf
+        ret = buf[pos:end]
+        if end >= RX_COMPACT:
+            _._rxCharBuffer = buf[end:]
+            _._rxItems = [(s - end, e - end) for s, e in items]
+            end = 0
+        _._rxCharPos = end
+        return ret
 
     # -----
 
@@ -273,53 +407,99 @@ class Telex(io.IOBase):
         'convert the given ASCII text to baudot-murray-code and send to tty'
         _._syncCharBuffer()
 
-        for a in ascii:
-            if a == '\x1B':   # escape char
-                _._rxCharBuffer.append('<ESC>')
-                _._escape = not _._escape
-                continue
-                
-            if _._escape:
+        i = 0
+        while i <= len(ascii):
+            e = ascii.find('\x1B', i)   # escape char
+            if e < 0:
+                e = len(ascii)
+            if _._escape and i < e:   # char after escape is a command
                 _._escape = False
-                _.cmd(a)
-            else:   # normal text
-                #print(a.lower(), end='')   #debug
-                bs = _._bm.encodeA2BM(a)
+                _.cmd(ascii[i])
+                i += 1
+            if i < e:   # normal text - encoded in one pass
+                bs = _._bm.encodeA2BM(ascii[i:e])
                 if bs:
                     _.writeCode(bs)
+            if e < len(ascii):
+                _._addItem('<ESC>')
+                _._escape = not _._escape
+            i = e + 1
+
+    # -----
+
+    def writeFragment(_, ascii:str) -> None:
+        'send a recurring text (header, NNNN, station ID) - encoded once and then taken from the cache'
+        _._syncCharBuffer()
+
+        bs = _._cache.encode(ascii)
+        if bs:
+            _.writeCode(bs)
 
     # -----
 
     def any(_) -> int:
-        'is any ASCII char or escape sequence available?'
+        'number of available ASCII chars and escape sequences'
         _._syncCharBuffer()
-        return len(_._rxCharBuffer)
+        return _._anyItems()
 
     # -----
 
     def read(_, count:int=1) -> str:
-        'get a single translated char or escape sequence as string'
+        'get up to count translated chars or escape sequences like {#a0} as string, all for count < 0'
         _._syncCharBuffer()
-        ret = ''
-        while _._rxCharBuffer and count > 0:
-            ret += _._rxCharBuffer.pop(0)
-            count -= 1
-        return ret
+        return _._takeChars(count)
 
     # -----
 
     def writeCode(_, codes: bytes) -> None:
-        for code in codes:
-            if code == 0x1F:   # LTRS
-                _._modeBM = 0
-            elif code == 0x1B:   # FIGS
-                _._modeBM = 1
-            elif code == 0x09 and _._modeBM == 1 and _._TN:   # WRU?, WerDa?
-                _._tty.readAdd(_._TN)
-                continue
-            _._tty.write([code])
+        'send codes in blocks - WRU in FIGS mode is answered locally with the fake TN'
+        if not isinstance(codes, bytes):
+            codes = bytes(codes)
+        start = 0
+        if _._TN:
+            i = codes.find(CODE_WRU)
+            while i >= 0:   # WRU?, WerDa?
+                _._trackMode(codes, i)
+                if _._modeBM == 1:
+                    _._writeBlock(codes, start, i)
+                    _._tty.readAdd(_._TN)
+                    start = i + 1
+                i = codes.find(CODE_WRU, i + 1)
+        _._writeBlock(codes, start, len(codes))
+        _._trackMode(codes, len(codes))
+
+    # -----
+
+    def _writeBlock(_, codes:bytes, start:int, end:int) -> None:
+        'hand codes[start:end] to the TTY in as few calls as the TX buffer allows - the rest is dropped after TX_WAIT_MS without progress'
+        mv = memoryview(codes)
+        waited = 0
+        while start < end:
+            n = _._tty.freeTx()
+            if not n:
+                if MICROPYTHON and waited < TX_WAIT_MS:   # wait for ISR to send
+                    time.sleep_ms(10)
+                    waited += 10
+                    continue
+                n = end - start   # the rest is counted in overflow
+            waited = 0
+            n = _._tty.write(mv[start:min(start + n, end)])
             if _._ledSt:
-                _._ledSt.add(8)
+                _._ledSt.add(8 * n)
+            if not n:   # full - rest dropped
+                break
+            start += n
+
+    # -----
+
+    def _trackMode(_, codes:bytes, end:int) -> None:
+        'mode after the last LTRS/FIGS in codes[:end]'
+        l = codes.rfind(CODE_LTRS, 0, end)
+        f = codes.rfind(CODE_FIGS, 0, end)
+        if l > f:
+            _._modeBM = 0
+        elif f > l:
+            _._modeBM = 1
 
     # -----
 
@@ -330,22 +510,109 @@ class Telex(io.IOBase):
 
     def readCode(_, count:int=1) -> bytes:
         codes = _._tty.read(count)
-        for code in codes:
-            if code == 0x1F:   # LTRS
-                _._modeBM = 0
-            elif code == 0x1B:   # FIGS
-                _._modeBM = 1
-            if _._ledSt:
-                _._ledSt.add(-8)
+        if _._tapeRxFile:
+            _._captureTape(codes)
+        _._trackMode(codes, len(codes))
+        if _._ledSt:
+            _._ledSt.add(-8 * len(codes))
 
         return codes
 
     # =====
 
+    def sendTape(_, fileName:str) -> None:
+        'start sending a punched tape image (one code per byte) - fed in chunks while polling any()/read()/write()/select()'
+        _.stopTape(tx=True, rx=False)
+
+        f = open(fileName, 'rb')
+        _._tapeTxMap = None
+        _._tapeTxPos = 0
+        if not MICROPYTHON:   # CPython - map the file instead of reading it
+            try:
+                import mmap
+                _._tapeTxMap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):   # empty file or no mmap support
+                pass
+        if not _._tapeTxMap:
+            _._tapeTxBuf = bytearray(TAPE_CHUNK)
+        _._tapeTxFile = f
+        _._pollTape()
+
+    # -----
+
+    def captureTape(_, fileName:str) -> None:
+        'start writing all received codes to a punched tape image (one code per byte)'
+        _.stopTape(tx=False, rx=True)
+
+        _._tapeRxBuf = bytearray(TAPE_CHUNK)
+        _._tapeRxLen = 0
+        _._tapeRxFile = open(fileName, 'wb')
+
+    # -----
+
+    def stopTape(_, tx:bool=True, rx:bool=True) -> None:
+        'stop sending and/or capturing a tape image - captured codes are flushed to the file'
+        if tx and _._tapeTxFile:
+            if _._tapeTxMap:
+                _._tapeTxMap.close()
+                _._tapeTxMap = None
+            _._tapeTxFile.close()
+            _._tapeTxFile = None
+            _._tapeTxBuf = None
+        if rx and _._tapeRxFile:
+            if _._tapeRxLen:
+                _._tapeRxFile.write(memoryview(_._tapeRxBuf)[:_._tapeRxLen])
+            _._tapeRxFile.close()
+            _._tapeRxFile = None
+            _._tapeRxBuf = None
+
+    # -----
+
+    def isTapeBusy(_) -> bool:
+        'is a tape image still sending?'
+        return _._tapeTxFile is not None
+
+    # -----
+
+    def _pollTape(_) -> None:
+        'refill the TTY TX buffer from the tape image when it runs low'
+        if not _._tapeTxFile or _._tty.anyTx() >= TAPE_TX_LEVEL:
+            return
+
+        if _._tapeTxMap:
+            codes = _._tapeTxMap[_._tapeTxPos:_._tapeTxPos + TAPE_CHUNK]
+            n = len(codes)
+            _._tapeTxPos += n
+        else:
+            codes = _._tapeTxBuf
+            n = _._tapeTxFile.readinto(codes) or 0
+        if n:   # tape is sent as is - no local answer to WRU
+            _._writeBlock(codes, 0, n)
+            _._trackMode(codes, n)
+        else:   # end of tape
+            _.stopTape(tx=True, rx=False)
+
+    # -----
+
+    def _captureTape(_, codes:bytes) -> None:
+        buf = _._tapeRxBuf
+        n = _._tapeRxLen
+        for code in codes:
+            if code >= 0x20:   # status codes of TTY are not on tape
+                continue
+            buf[n] = code
+            n += 1
+            if n >= TAPE_CHUNK:
+                _._tapeRxFile.write(buf)
+                n = 0
+        _._tapeRxLen = n
+
+    # =====
+
     def getCharMode(_) -> int:
         'return the current TTY mode - 0="A..." 1="1..."'
         _._syncCharBuffer()
-        return _._bm._ModeBM
+        return _._bm.getMode()
 
     # -----
 
@@ -364,16 +631,23 @@ class Telex(io.IOBase):
         elif c == 'T':
             _.dial(False)
         elif c == 'R':
-            _.write('ry'*20)
+            _.writeFragment('ry'*20)
         elif c == 'F':
-            _.write('the quick brown fox jumps over the lazy dog')
+            _.writeFragment('the quick brown fox jumps over the lazy dog')
         elif c == 'K':
-            _.write('kaufen sie jede woche vier gute bequeme pelze xy 1234567890')
+            _.writeFragment('kaufen sie jede woche vier gute bequeme pelze xy 1234567890')
+        elif c == 'J':
+            j = _.jitter(True)
+            if j is None:
+                _.setJitter(True)
+                _._addItem('\r\nJitter recording on\r\n')
+            else:
+                _._addItem('\r\nJitter {count} ticks: p50 {p50} us, p99 {p99} us, max {max} us, late {late} (>= {limit} us)\r\n'.format(**j))
         elif c == 'H':
-            _._rxCharBuffer.append(HELP_TEXT)
+            _._addItem(HELP_TEXT)
         else:
             c = '?'
-        _._rxCharBuffer.append('{' + c + '}')
+        _._addItem('{' + c + '}')
 
     # -----
 
@@ -392,16 +666,28 @@ class Telex(io.IOBase):
         if enable and _._dialMode == _._tty.DIAL_MODE_KEY:
             _.power(True)
 
+    # -----
+
+    def setJitter(_, enable:bool=True) -> None:
+        'record the lateness of the timer calls - for all lines of the timer'
+        if _._engine:
+            _._engine.setJitter(enable)
+        else:
+            _._tty.setJitter(enable)
+
+    # -----
+
+    def jitter(_, reset:bool=False) -> dict:
+        'summary of the timer lateness in us (p50, p99, max, late) or None if not recording'
+        return _._tty.jitter(reset)
+
 
     # -----
 
     @property
     def char(_) -> str:
-        ret = ''
         _._syncCharBuffer()
-        while _._rxCharBuffer:
-            ret += _._rxCharBuffer.pop(0)
-        return ret
+        return _._takeChars(-1)
 
     @char.setter
     def char(_, ascii:str):
@@ -1,5 +1,7 @@
 #!python3
 
+import gc
+import sys
 import bmc
 '''
 •••‧••   
@@ -61,4 +63,239 @@ aa = bm.decodeBM2A(c)
 #print(aa)
 assert(a == aa)
 
-print(__name__, 'OK')
\ No newline at end of file
+a = 'A1 B'
+bm.reset()
+c = bm.encodeA2BM(a)
+#print(c)
+assert(c == b'\x1f\x18\x1b\x1d\x04\x1f\x13')
+aa = bm.decodeBM2A(c)
+#print(aa)
+assert(a == aa)
+
+# MKT2
+
+bm = bmc.BMC(2, False, 0)
+
+a = 'ДА 1'
+c = bm.encodeA2BM(a)
+#print(c)
+assert(c == b'\x1f\x00\t\x03\x04\x1b\x17')
+aa = bm.decodeBM2A(c)
+#print(aa)
+assert(a == aa)
+
+# shift minimizing
+
+bm = bmc.BMC(0, False, 0)
+
+a = '12 AB'
+c = bm.encodeA2BMopt(a)
+#print(c)
+assert(c == b'\x1b\x17\x13\x04\x1f\x03\x19')
+assert(bm.saved_ms(50) == 150)
+bm.reset()
+aa = bm.decodeBM2A(c)
+#print(aa)
+assert(a == aa)
+
+bm.reset()
+c = bm.encodeA2BMopt(a, True)   # unshift on space
+#print(c)
+assert(c == b'\x1b\x17\x13\x04\x03\x19')
+assert(bm.saved_ms(50) == 300)
+
+bm.reset()
+c = bm.encodeA2BMopt('1 2')
+assert(c == b'\x1b\x17\x04\x13')
+bm.reset()
+c = bm.encodeA2BMopt('1 2', True)
+assert(c == b'\x1b\x17\x04\x1b\x13')
+
+# decoding in runs and code by code against a reference decoded code by code
+
+import random
+
+def decode_ref(t, codes:bytes, mode:int, show_BuZi:int) -> tuple:
+    lut = t[bmc.T_BM2A]
+    sw = tuple(t[bmc.T_BMSW])
+    ret = ''
+    for c in codes:
+        if c in sw:
+            mode = sw.index(c)
+            if show_BuZi >= 2:
+                ret += lut[mode][c]
+        elif c >= 0x20:
+            ret += '{#' + hex(c)[2:] + '}'
+        elif mode is None:
+            ret += '{?' + lut[0][c] + lut[1][c] + '}'
+        else:
+            ret += lut[mode][c]
+    return ret, mode
+
+try:  # generator needs the source tables - not on the device
+    import gen_bmc_tables
+    rnd = random.Random(1)
+    for coding in (0, 1, 2):
+        for flip_bits in (False, True):
+            t = gen_bmc_tables.tables(coding << 1 | flip_bits)
+            for show_BuZi in (0, 2):
+                bm = bmc.BMC(coding, flip_bits, show_BuZi)
+                for n in range(40):
+                    shifts = (0x1F, 0x1B) * (n & 1) + (0x1F,)   # short and long runs
+                    c = bytes(rnd.choice(shifts + (0x00, 0x03, 0x17, 0x24, 0x3F) * 3) for i in range(rnd.randrange(60)))
+                    if flip_bits:   # decodeBM2A masks the upper bits first
+                        c = bytes(b & 0x1F for b in c)
+                    for mode, start in ((None, b''), (0, b'\x1f'), (1, b'\x1b')):
+                        bm.reset()
+                        bm.decodeBM2A(start)
+                        assert((bm.decodeBM2A(c), bm.getMode()) == decode_ref(t, c, mode, show_BuZi))
+except ImportError:
+    pass
+
+# compatibility facade
+
+import bmcode
+bm = bmcode.BaudotMurrayCode()
+
+a = 'A1 B'
+c = bm.encodeA2BM(a)
+#print(c)
+assert(c == [0x1f, 0x03, 0x1b, 0x17, 0x04, 0x1f, 0x19])
+assert(bm._ModeBM == 0)
+assert(bm._t is bmc.BMC(0)._t)   # tables are shared
+bm.reset()
+aa = bm.decodeBM2A(c[1:])   # undefined mode starts with letters
+#print(aa)
+assert(aa == 'A]1 [B')
+
+# cache of encoded fragments
+
+bm = bmc.BMC(0)
+cache = bmc.BMCache(bm, 40)
+c = cache.encode('NNNN')
+assert(c == bm.encodeA2BM('[NNNN') and bm.getMode() == 0)
+bm.reset()
+cc = cache.encode('NNNN')
+assert(cc is c and cache.hits == 1 and cache.misses == 1)
+assert(cache.encode('12') == b'\x1b\x17\x13' and bm.getMode() == 1)
+assert(cache.encode('NNNN') == b'\x1f\x0c\x0c\x0c\x0c')   # other start mode
+assert(cache.misses == 3 and cache.size == 4 + 5 + 2 + 3 + 4 + 5)
+cache.encode('X' * 10)   # drops least recently used
+assert(cache.size == 34 and ('NNNN', None) not in cache._lru)
+cache.encode('X' * 40)   # never fits
+assert(cache.size == 34 and len(cache._lru) == 3)
+
+# packed 5 bit codes
+
+import bmpack
+c = bytes(range(32)) + b'\x1f\x03\x1b'
+p = bmpack.pack(c)
+assert(len(p) == 22 and bmpack.unpack(p, len(c)) == c)
+assert(bytes(bmpack.iter_codes(p, 8, 27)) == c[27:])
+bp = bmpack.BMPacked()
+bp.append(0x1F)
+bp.extend(c)   # not aligned to groups of 8
+assert(len(bp) == 36 and bp[0] == 0x1F and bp[-1] == 0x1B and bytes(bp) == b'\x1f' + c)
+assert(bytes(bmpack.BMPacked(bp.packed(), len(bp))) == b'\x1f' + c)
+
+bm = bmc.BMC(0, False, 0)
+a = 'THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG 1234567890\r\n' * 10
+bp = bm.encodeA2BMpacked(a)
+bm.reset()
+c = bm.encodeA2BM(a)
+assert(bytes(bp) == c and len(bp.packed()) == (len(c) * 5 + 7) // 8)
+bm.reset()
+assert(bm.decodeBM2Apacked(bp) == a)
+
+# precomputed tables are up to date
+
+try:  # generator needs the source tables - not on the device
+    import gen_bmc_tables
+    for key in range(6):
+        t = bmc.BMC._load_tables(key)
+        tt = gen_bmc_tables.tables(key)
+        assert(t[bmc.T_A2BM] == tt[bmc.T_A2BM])   # else run gen_bmc_tables.py
+        assert(tuple(t[bmc.T_BMSW]) == tuple(tt[bmc.T_BMSW]))
+        assert(tuple(t[bmc.T_BM2A]) == tuple(tt[bmc.T_BM2A]))
+        assert(t[bmc.T_A2BM_BYTES] == tt[bmc.T_A2BM_BYTES])
+        assert(tuple(t[bmc.T_BM2A_UTF8]) == tuple(tt[bmc.T_BM2A_UTF8]))
+        assert('bmc_tables_' + str(key) not in sys.modules)   # only the tables are kept
+    assert(bmc.BMC._build_tty_text() == gen_bmc_tables.tty_text())
+except ImportError:
+    pass
+
+# text conversion
+
+a = 'Grüße aus Würzburg: Café, 100€ & ÅÇÑ!\r\n'
+aa = bmc.BMC.ascii_to_tty_text(a)
+#print(aa)
+assert(aa == 'GRUESSE AUS WUERZBURG: CAFE, 100(EUR) (AND) ACN(./)\r\n')
+c = a.encode()
+assert(''.join(bmc.BMC.ascii_to_tty_iter([c[:3], c[3:5], c[5:]])) == aa)   # split inside UTF-8 sequences
+unknown = ''.join([chr(0x4E00 + i) for i in range(bmc.BMC.TTY_TEXT_CACHE_SIZE + 1)])   # not in the table
+bmc.BMC.ascii_to_tty_text(unknown)
+cache = bmc.BMC._LUT_tty_text_unknown
+assert(len(cache) == bmc.BMC.TTY_TEXT_CACHE_SIZE and unknown[0] not in cache and unknown[-1] in cache)   # oldest dropped
+
+# streaming without heap allocation
+
+msg = (b'The quick brown fox jumps over the lazy dog 1234567890.\r\n' * 200)[:10240]
+mv = memoryview(msg)
+chunks = [mv[i:i + 64] for i in range(0, len(msg), 64)]
+enc = bmc.BMEncoder(0)
+dec = bmc.BMDecoder(0, False, 0)
+codes = bytearray(160)
+text = bytearray(2048)
+
+def stream(out=None):
+    enc.reset()
+    dec.reset()
+    for chunk in chunks:
+        n = enc.feed_into(chunk, codes)
+        assert(enc.consumed == len(chunk))
+        n = dec.feed_into(codes, text, n)
+        if out is not None:
+            out += text[:n]
+
+out = bytearray()
+stream(out)
+assert(out == msg.upper())
+
+gc.collect()
+try:  # MicroPython - any allocation raises MemoryError
+    import micropython
+    micropython.heap_lock()
+    stream()
+    micropython.heap_unlock()
+except ImportError:  # CPython - only short living int objects > 256
+    import tracemalloc
+    tracemalloc.start()
+    mem = tracemalloc.get_traced_memory()[0]
+    stream()
+    mem = tracemalloc.get_traced_memory()[1] - mem
+    tracemalloc.stop()
+    #print(mem)
+    assert(mem < 1024)
+
+# smallest dst - every call makes progress
+
+for coding in (0, 2):
+    enc = bmc.BMEncoder(coding)
+    dec = bmc.BMDecoder(coding)
+    msg = 'A1B2 C3 ' * 4
+    for dst, f, src, size in ((bytearray(bmc.ENCODE_DST_MIN), enc.feed_into, msg, bmc.ENCODE_DST_MIN),
+            (bytearray(bmc.DECODE_DST_MIN), dec.feed_into, b'\x3f\x01' + bmc.BMC(coding).encodeA2BM(msg), bmc.DECODE_DST_MIN)):
+        out = bytearray()
+        while src:
+            n = f(src, dst)
+            assert(n and f.__self__.consumed)
+            out += dst[:n]
+            src = src[f.__self__.consumed:]
+        try:
+            f(b'\x01', bytearray(size - 1))
+            assert(False)
+        except ValueError:
+            pass
+    assert(out.decode() == '{#3f}{?E3}' + bmc.BMC(coding).decodeBM2A(bmc.BMC(coding).encodeA2BM(msg)))
+
+print(__name__, 'OK')
\ No newline at end of file
@@ -1,5 +1,6 @@
 #!python3
 """
+Tests of the TTY timing engine on the simulated line in virtual time - no teletype needed
 """
 __author__      = "Jochen Krapf"
 __email__       = "jk@nerd2nerd.org"
@@ -7,50 +8,121 @@ __copyright__   = "Copyright 2020, JK"
 __license__     = "GPL3"
 __version__     = "0.0.1"
 
+import random
+import time
 from tty import TTY
-
-def main():
-    tty = TTY()
-
-    x = tty.read()
-
-    for i in range(200):
-        tty._timerHandler()
-
-    print(tty._rxDataBuffer)
-
-    while tty.anyChar():
-        a = tty.getChar()
-        print(a)
-
-    return
-
-    for i in range(4):
-        tty._timerHandler()
-
-    #self.sendData(5)
-    #self.sendData(3)
-
-    for i in range(80):
-        tty._timerHandler()
-
-
-main()
-
-exit
-from machine import Timer
-from machine import Pin
-
-pin = Pin(2, Pin.OUT)
-
-tim = 0
-
-def handler(timer):
-    global tim, pin
-    tim += 1
-    if tim & 0xFF == 0:
-        print(tim)
-    pin.value(tim & 0x80)
-
-t = Timer(-1)
-t.init(period=5, mode=Timer.PERIODIC, callback=handler)
+from debug_pc import sim
+
+random.seed(1)
+
+###############################################################################
+
+def receive(t, s, ms:float) -> bytes:
+    'run the simulation and read the RX buffer every 100 ms'
+    rx = bytearray()
+    for i in range(int(ms / 100) + 1):
+        s.run(100)
+        rx += t.read(-1)
+    return bytes(rx)
+
+# -----
+
+def codes(count:int) -> bytes:
+    return bytes(random.randrange(32) for i in range(count))
+
+###############################################################################
+
+# RX - thousands of chars per second on the PC
+
+t = TTY(50, 2)
+s = sim.Sim(t)
+c = codes(2000)
+s.peer.send(c, 500000)
+w = time.perf_counter()
+rx = receive(t, s, len(c) * 150 + 1000)
+w = time.perf_counter() - w
+assert(rx == b'\xA0\xA1' + c and t.getOverflow() == (0, 0))
+print('{} chars in {:.2f} s = {:.0f} chars/s, {} ticks'.format(len(c), w, len(c) / w, s.ticks))
+
+# TX with loopback - own echo is not received
+
+t = TTY(50, 2)
+s = sim.Sim(t, loopback=True)
+s.run(1000)
+c = codes(500)
+t.read(-1)
+t.write(c)
+rx = receive(t, s, len(c) * 150 + 1000)
+assert(s.peer.received() == c and s.peer.errors == 0)
+assert(rx == b'')
+
+# polarity, all baud rates, distortion of the peer
+
+for baud in (45.45, 50, 75, 100):
+    for invert in (False, True):
+        for bias, jitter in ((0, 0), (20, 0), (-20, 0), (0, 15), (15, 15)):
+            t = TTY(baud, 1, txInvert=invert, rxInvert=invert)
+            s = sim.Sim(t, invert=invert, bias=bias, jitter=jitter)
+            c = codes(100)
+            s.peer.send(c, 200000)
+            assert(receive(t, s, len(c) * 170 + 1000) == b'\xA0\xA1' + c)
+            t.write(c)
+            s.runUntil(lambda: not t.anyTx())
+            s.run(200)
+            assert(s.peer.received() == c)
+
+# peer slightly too fast
+
+t = TTY(50, 2)
+s = sim.Sim(t)
+c = codes(100)
+s.peer.send(c, 200000, baud=52)
+assert(receive(t, s, len(c) * 150 + 1000) == b'\xA0\xA1' + c)
+
+# noise spikes on the idle line, line down
+
+t = TTY(50, 2)
+s = sim.Sim(t)
+s.line.noise(500000, 10000000, 10, 500)
+s.line.down(11000000, 1000000)
+rx = receive(t, s, 13000)
+assert(rx == b'\xA0\xA1\xA0\xA1')
+
+# idle mode - the timer stops, no start bit missed
+
+t = TTY(50, 2)
+t.setIdle(3)
+s = sim.Sim(t)
+c = codes(200)
+at = 500000
+for i in range(len(c)):
+    s.peer.send(c[i:i + 1], at)
+    at += 150000 + random.choice((0, random.randrange(3000000)))
+rx = receive(t, s, at / 1000 + 1000)
+assert(rx == b'\xA0\xA1' + c and s.ticks < at / 2000 / 2 and s.irqs >= 1)
+
+# RX by pin edges
+
+t = TTY(50, 2, edgeRx=True)
+s = sim.Sim(t, jitter=10)
+c = codes(500)
+s.peer.send(c, 500000)
+assert(receive(t, s, len(c) * 150 + 1000) == b'\xA0\xA1' + c and t._edgeRx.errors == 0)
+
+# RX by pin edges in idle mode - the edge IRQ of EdgeRX starts the timer
+
+t = TTY(50, 2, edgeRx=True)
+t.setIdle(3)
+s = sim.Sim(t, jitter=10)
+c = codes(200)
+at = 500000
+for i in range(len(c)):
+    s.peer.send(c[i:i + 1], at)
+    at += 150000 + random.choice((0, random.randrange(3000000)))
+rx = receive(t, s, at / 1000 + 1000)
+assert(rx == b'\xA0\xA1' + c and t._edgeRx.errors == 0 and s.ticks < at / 2000 / 2)
+assert(t.isSleeping() and t._pinRx.irqHandler == t._edgeRx._irq)
+t.write(b'\x1f')   # TX wakes up
+assert(not t.isSleeping() and t._edgeRx.wakeup is None and t._pinRx.irqHandler == t._edgeRx._irq)
+
+print(__name__, 'OK')
@@ -0,0 +1,135 @@
+#!python3
+
+import os
+import telex
+
+TAPE = '_test_tape.ls'
+tape = bytes([0x1F]) + bytes(range(3, 27)) * 20 + bytes([0x1B, 0x09, 0x1B])   # ends with WRU in FIGS mode
+
+# send tape image - paced by TX buffer level
+
+with open(TAPE, 'wb') as f:
+    f.write(tape)
+
+tlx = telex.Telex()
+tx = tlx._tty._txDataBuffer
+tlx.sendTape(TAPE)
+assert(tlx._TN and tlx.isTapeBusy() and len(tx) == telex.TAPE_CHUNK)
+sent = bytearray()
+while tlx.isTapeBusy() or tx.any():
+    sent.append(tx.get())   # sent by the ISR
+    tlx.any()
+    assert(len(tx) <= telex.TAPE_TX_LEVEL + telex.TAPE_CHUNK)
+assert(sent == tape and tlx._modeBM == 1 and not tlx.read(-1))   # WRU sent, not answered locally
+
+# capture received codes to tape image
+
+tlx.captureTape(TAPE)
+tlx._tty.readAdd(bytes([0xA0, 0xA1]))   # status codes are not captured
+for i in range(0, len(tape), 100):   # received by the ISR
+    tlx._tty.readAdd(tape[i:i + 100])
+    while tlx.any():
+        tlx.read()
+assert(tlx._tty.getOverflow() == (0, 0))
+tlx.stopTape()
+with open(TAPE, 'rb') as f:
+    assert(f.read() == tape)
+
+os.remove(TAPE)
+
+# timer jitter by escape command
+
+tlx.char
+tlx.write('\x1bJ')
+assert(tlx.char == '<ESC>\r\nJitter recording on\r\n{J}')
+for i in range(10):
+    tlx._tty._timer.callback()
+tlx.write('\x1bJ')
+assert('<ESC>\r\nJitter 10 ticks: p50 0 us, p99 0 us, max 0 us, late 0' in tlx.char)
+tlx.setJitter(False)
+
+# bulk text path - same codes as encoded per char, escapes and WRU found in one scan
+
+from bmc import BMC
+
+tx.clear()
+text = 'ryry 1234 (x/y) = 42.\r\n' * 8
+bm = BMC()
+bm._mode = tlx._bm.getMode()
+codes = bytes(b for a in text for b in bm.encodeA2BM(a))
+tlx.write(text[:90] + '\x1b')
+tlx.write('H' + text[90:])
+assert(tx.read(-1) == codes and tlx.any() == 3 and list(tlx) == ['<ESC>', telex.HELP_TEXT, '{H}'])   # single items
+assert(tlx._modeBM == 1)   # FIGS for '.'
+
+tlx.writeCode(b'\x09\x1f\x09\x03\x1b\x09\x1f')   # WRU only in FIGS mode
+assert(tx.read(-1) == b'\x1f\x09\x03\x1b\x1f' and tlx._tty.read(-1) == bytes(tlx._TN) * 2)
+tlx.writeCode(bytes(1000))
+assert(tx.any() == len(tx) and tlx._tty.getOverflow()[1] == 1000 - len(tx))
+tx.clear()
+
+from debug_pc import utime   # virtual clock - sleep_ms() returns at once
+
+t0 = telex.time
+telex.MICROPYTHON, telex.time = True, utime   # TX buffer does not drain while line is off
+overflow = tlx._tty.getOverflow()[1]
+t = utime.ticks_ms()
+tlx.writeCode(bytes(1000))
+assert(utime.ticks_diff(utime.ticks_ms(), t) == telex.TX_WAIT_MS)
+assert(tlx._tty.getOverflow()[1] - overflow == 1000 - tx.any())
+telex.MICROPYTHON, telex.time = False, t0
+tx.clear()
+
+bm._mode = tlx._bm.getMode()
+rx = bm.decodeBM2A(codes) + '{#a0}'   # with LTRS/FIGS shown as [ ]
+tlx._tty.readAdd(codes + bytes([0xA0]))
+assert(tlx.read(3) == rx[:3] and tlx.any() == len(rx) - 3 - 4)   # {#a0} is a single item
+assert(tlx.read(len(rx) - 8) == rx[3:-5] and tlx.read(1) == '{#a0}' and not tlx.any())
+tlx._tty.readAdd(codes + bytes([0xA0]))
+assert(tlx.read(-1) == rx and tlx._modeBM == 1)
+
+# read per item with a read index - read chars are dropped at RX_COMPACT
+
+rx = ''
+for i in range(10):
+    tlx._tty.readAdd(codes + bytes([0xA0]))
+    rx += tlx.read(-1)
+ret = []
+for i in range(10):
+    tlx._tty.readAdd(codes + bytes([0xA0]))
+    while tlx.any() > len(codes) // 2:   # unread chars are kept
+        ret.append(next(tlx))
+        assert(tlx._rxCharPos < telex.RX_COMPACT and len(tlx._rxCharBuffer) < telex.RX_COMPACT + len(codes) * 2)
+ret.append(tlx.read(-1))
+assert(''.join(ret) == rx and ret.count('{#a0}') >= 9 and tlx._rxCharBuffer == '' and tlx._rxCharPos == 0 and not tlx._rxItems)
+
+# TTY backend selected by config
+
+import json
+import ttyuart
+
+CNF = '_test_telex.json'
+with open('telex.json') as f:
+    cnf = json.load(f)
+cnf['TTY_BACKEND'] = 'UART'
+with open(CNF, 'w') as f:
+    json.dump(cnf, f)
+tlx = telex.Telex(CNF)
+assert(isinstance(tlx._tty, ttyuart.TTYUart))
+os.remove(CNF)
+
+# lines of "LINES" on one timer
+
+import ttymulti
+
+tlx0 = telex.Telex(line=0)
+tlx1 = telex.Telex(line=1)
+engine = ttymulti.engine()
+assert(len(engine) == 2 and tlx0._tty._period == tlx1._tty._period == engine.getPeriod() == ttymulti.commonPeriod((50, 75)))
+assert(tlx1._tty.getBaud() == 75 and tlx1._tty.getDialMode() == 1 and tlx1.cnf['NAME'] == 'Line 1')
+tlx1.deinit()
+assert(engine.lines() == [tlx0._tty])
+tlx0.deinit()
+assert(len(engine) == 0 and ttymulti._engine is None)
+
+print(__name__, 'OK')
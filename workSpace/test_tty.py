@@ -0,0 +1,595 @@
+#!python3
+
+import random
+import tty
+import edgerx
+import autobaud
+import ttyuart
+import ttywave
+import ttymulti
+import ttyfast
+import margin
+from debug_pc import utime
+
+SIZE = 100 * 1024
+
+###############################################################################
+
+class LinePin:
+    'pin of the simulated line - RX reads a waveform with one level per tick, TX records one level per tick'
+    def __init__(self, wave:bytes=b''):
+        self.wave = wave
+        self.pos = 0
+        self.level = 1
+
+    def value(self, v:int=None) -> int:
+        if v is None:
+            if self.pos < len(self.wave):
+                self.level = self.wave[self.pos]
+            self.pos += 1
+            return self.level
+        self.level = v
+
+# -----
+
+def wave(codes:bytes, slice:int) -> bytes:
+    'waveform of the codes with 1 start, 5 data and 1.5 stop bits'
+    bits = []
+    for c in codes:
+        bits += [0] * slice
+        for i in range(5):
+            bits += [(c >> i) & 1] * slice
+        bits += [1] * (slice * 3 // 2)
+    return bytes(bits)
+
+# -----
+
+def unwave(levels:bytes, slice:int) -> bytes:
+    'decode the recorded TX levels - sample in the middle of each bit'
+    codes = bytearray()
+    i = levels.find(0)
+    while 0 <= i < len(levels) - slice * 6:
+        c = 0
+        for b in range(5):
+            c |= levels[i + slice * (b + 1) + slice // 2] << b
+        codes.append(c)
+        i = levels.find(0, i + slice * 6)
+    return codes
+
+# -----
+
+def edges(codes:bytes, t:int, bit:int, jitter:float=0.) -> list:
+    'edges (time us, level) of the codes with 1 start, 5 data and 1.5 stop bits starting at t'
+    ret = []
+    level = 1
+    for c in codes:
+        bits = [0] + [(c >> i) & 1 for i in range(5)] + [1]
+        for i, b in enumerate(bits):
+            if b != level:
+                ret.append((t + int(bit * (i + random.uniform(-jitter, jitter))), b))
+                level = b
+        t += bit * 15 // 2
+    return ret
+
+# -----
+
+def fire(pin, edges:list) -> None:
+    'fire the edges at their time on the virtual clock'
+    for t, level in edges:
+        utime.set_us(t)
+        pin.fire(level)
+
+###############################################################################
+
+random.seed(1)
+codes = bytes([i * 7 & 0x1F for i in range(SIZE)])
+buf = bytearray(64)
+
+# RX - 100 kB from the line through the ISR, read in bulk
+
+t = tty.TTY(50, 5)   # 4 ticks per bit
+t._pinRx = LinePin(b'\x01' * 40 + wave(codes, 4))   # idle line first
+rx = bytearray()
+for i in range(len(t._pinRx.wave) + 40):
+    t._timerHandler()
+    if i & 0x3FF == 0:
+        n = t.readinto(buf)
+        rx += buf[:n]
+while t.any():
+    n = t.readinto(buf)
+    rx += buf[:n]
+assert(rx[:2] == b'\xA0\xA1')   # line low at start, then line high
+assert(rx[2:] == codes)
+assert(t.getOverflow() == (0, 0))
+
+# RX overflow is counted
+
+t._pinRx = LinePin(b'\x01' * 40 + wave(codes[:300], 4))
+for i in range(len(t._pinRx.wave) + 40):
+    t._timerHandler()
+assert(t.any() == tty.RX_BUFFER_SIZE - 1)
+assert(t.getOverflow() == (300 - t.any(), 0))
+t.read(-1)
+
+# TX - 100 kB written in bulk through the ISR to the line
+
+t = tty.TTY(50, 5)
+t._pinRx = LinePin()   # idle line
+t._pinTx = LinePin()
+levels = bytearray()
+i = 0
+while i < len(codes) or t.anyTx() or t._state != tty.STATE_LISTEN_CAN_TX:
+    if i < len(codes) and t.freeTx() > 100:
+        i += t.write(codes[i:i + 100])
+    t._timerHandler()
+    levels.append(t._pinTx.level)
+assert(unwave(levels, 4) == codes)
+assert(t.getOverflow() == (0, 0))
+
+# TX overflow is counted
+
+assert(t.write(codes[:1000]) == tty.TX_BUFFER_SIZE - 1)
+assert(t.getOverflow() == (0, 1000 - tty.TX_BUFFER_SIZE + 1))
+
+# TX with fractional bit time - char length 82.5 ticks at 45.45 baud and period 2 ms
+
+assert(tty.distortion(45.45, 2) == (0.1, 4.6) and tty.bestPeriod(45.45) == 2)
+assert(tty.distortion(50, 4) == (0.0, 10.0) and tty.bestPeriod(50) == 4)
+assert(tty.bestPeriod(75) == 1 and tty.bestPeriod(100) == 2)
+
+t = tty.TTY(45.45, 2)
+t._pinRx = LinePin()   # idle line
+t._pinTx = LinePin()
+for i in range(200):   # line up -> listen
+    t._timerHandler()
+t.write(codes[:200])
+levels = bytearray(b"\x01")
+while t.anyTx() or t._state != tty.STATE_LISTEN_CAN_TX:
+    t._timerHandler()
+    levels.append(t._pinTx.level)
+slice = 1000 / 2 / 45.45
+starts = []
+i = levels.find(0)
+while i >= 0:   # start bits
+    starts.append(i)
+    i = levels.find(0, i + int(slice * 6.5))
+assert(len(starts) == 200)
+assert(abs(starts[-1] - starts[0] - 199 * 7.5 * slice) < 1)   # no drift
+assert(set(starts[i + 1] - starts[i] for i in range(199)) == {82, 83})
+
+# RX from pin edges - 50 baud with 5% distortion, clock wraps around
+
+rx = edgerx.EdgeRX(50, 0)
+pin = rx._pinRx
+t = (1 << 30) - 50000
+e = edges(codes[:2000], t, 20000, 0.05)
+out = bytearray()
+for i in range(0, len(e), 40):
+    fire(pin, e[i:i + 40])
+    out += rx.read(-1)
+utime.advance_us(200000)
+out += rx.read(-1)
+assert(out == codes[:2000] and rx.overflow == 0 and rx.errors == 0)
+
+# spike is ignored, missing stop bit is counted
+
+t += 5000000
+fire(pin, [(t, 0), (t + 2000, 1)])
+fire(pin, edges(b'\x1f', t + 100000, 20000)[:1])   # line stays low
+fire(pin, [(t + 300000, 1)])
+fire(pin, edges(b'\x03', t + 400000, 20000))
+utime.set_us(t + 600000)
+assert(rx.read(-1) == b'\x03' and rx.errors == 1)
+rx.deinit()
+
+# RX from pin edges and TX from timer in one TTY
+
+t = tty.TTY(50, 2, edgeRx=True)
+t._pinTx = LinePin()
+t._pinRx.level = 1   # idle line
+utime.set_us(0)
+e = edges(codes[:100], 100000, 20000, 0.05)
+levels = bytearray()
+tx = False
+us = 0
+while e or t.anyTx() or t._state != tty.STATE_LISTEN_CAN_TX or not tx:
+    us += 2000   # timer period
+    while e and e[0][0] <= us:
+        fire(t._pinRx, e[:1])
+        e.pop(0)
+    utime.set_us(us)
+    t._timerHandlerEdge()
+    levels.append(t._pinTx.level)
+    if not e and not tx and t._state == tty.STATE_LISTEN_CAN_TX:
+        t.write(codes[100:200])
+        tx = True
+r = t.read(-1)
+assert(r == b'\xA0' + codes[:100] + b'\xA1')   # timer signals line up after the traffic
+assert(unwave(levels, 10) == codes[100:200])
+
+# baud rate detection - all standard rates with 5% distortion
+
+us = 0
+for baud in autobaud.BAUD_RATES:
+    for n in range(10):
+        t = tty.TTY(50, 2)
+        t._pinRx.level = 1   # idle line
+        t.detectBaud()
+        bit = int(1000000 / baud)
+        ret = None
+        chars = 0
+        while not ret:
+            fire(t._pinRx, edges(bytes([random.randrange(32)]), us, bit, 0.05))
+            us += bit * 8
+            chars += 1
+            ret = t.pollBaud()
+        assert(ret[0] == baud and chars <= 8)
+        assert(t.getBaud() == baud and t._period == tty.bestPeriod(baud) and not t.isDetectingBaud())
+        assert(t._pinRx.irqHandler is None)
+
+# baud rate switch keeps queued codes and dial settings
+
+t = tty.TTY(50, 2)
+t._pinRx.level = 1
+t.setDialMode(tty.TTY.DIAL_MODE_KEY)
+t.write(b'\x01\x02\x03')
+t.readAdd(b'\x04')
+t.detectBaud()
+while not t.pollBaud():
+    fire(t._pinRx, edges(bytes([random.randrange(32)]), us, 13333, 0.05))
+    us += 13333 * 8
+assert(t.getBaud() == 75 and t.getDialMode() == tty.TTY.DIAL_MODE_KEY and t.anyTx() == 3 and t.read() == b'\x04')
+t.deinit()
+
+# both backends - software UART by timer and hardware UART
+
+def drive(t, codes:bytes) -> bytes:
+    'line off, line up, then the codes - returns the received codes'
+    slice = round(1000 / t.getBaud() / t._period)
+    w = bytes([0] * slice * 40 + [1] * slice * 20) + wave(codes, slice) + bytes([1] * slice * 20)
+    t._pinRx = LinePin(w)
+    feed = {}   # tick -> code received by UART at the stop bit
+    for i, c in enumerate(codes):
+        feed[slice * 60 + i * (slice * 6 + slice * 3 // 2) + slice * 13 // 2] = c
+    for i in range(len(w)):
+        if hasattr(t, '_uart') and i in feed:
+            t._uart.rxFeed(bytes([feed[i] | 0xE0]))   # upper bits of UART byte are ignored
+        t._timerHandler()
+    return t.read(-1)
+
+for backend in (tty.TTY, ttyuart.TTYUart):
+    t = backend(50, 2)
+    assert(t.getDistortion() == ((0., 0.) if backend is ttyuart.TTYUart else tty.distortion(50, 2)))
+    codes = bytes(random.randrange(1, 32) for i in range(200))
+    assert(drive(t, codes) == b'\xA0\xA1' + codes)
+
+    t.dial(True)
+    t.setDialMode(tty.TTY.DIAL_MODE_KEY)
+    assert(drive(t, bytes(tty.BMC_DIAL_DIGITS)) == b'\xA0\xA1' + bytes(range(0xD0, 0xDA)))
+    t.dial(False)
+
+    if backend is ttyuart.TTYUart:
+        t._uart.txData = bytearray()
+    else:
+        t._pinTx = LinePin()
+    levels = bytearray()
+    assert(t.write(codes) == 200)
+    while t.anyTx() or t._state != tty.STATE_LISTEN_CAN_TX:
+        t._timerHandler()
+        if backend is tty.TTY:
+            levels.append(t._pinTx.level)
+    out = t._uart.txData if backend is ttyuart.TTYUart else unwave(levels, 10)
+    assert(out == codes and t.getOverflow() == (0, 0))
+    st = t.stats()
+    assert(st['rx'] == 210 and st['tx'] == 200 and st['lineDown'] == 2 and st['lineUp'] == 2 and st['txHigh'] == 200)
+    t.deinit()
+
+t = ttyuart.create(50, 2)
+assert(isinstance(t, ttyuart.TTYUart) and t._uart.bits == 5 and t._uart.stop == 2)
+assert(t._uart.invert == 0 and t.getStateStr().startswith('u'))
+t = ttyuart.create(0.4, 10)   # baud rate refused by UART - software UART
+assert(type(t) is tty.TTY)
+
+# TX by compiled waveform - exact edge times
+
+def unpulse(durations:list, levels:list, bit:float) -> bytes:
+    'decode a pulse list by sampling in the middle of the bits'
+    edges = []   # (start time, level)
+    t = 0
+    for d, l in zip(durations, levels):
+        if not edges or edges[-1][1] != l:
+            edges.append((t, l))
+        t += d
+    def level(t):
+        return [l for s, l in edges if s <= t][-1]
+    codes = bytearray()
+    for s, l in edges:
+        if l == 0 and (not codes or s >= start + bit * 7):
+            start = s
+            c = 0
+            for i in range(5):
+                c |= level(start + bit * (i + 1.5)) << i
+            assert(level(start + bit * 6.5) == 1)
+            codes.append(c)
+    return bytes(codes)
+
+for baud in (45.45, 50, 75, 100):
+    codes = bytes(random.randrange(32) for i in range(50))
+    durations, levels = ttywave.compileWave(codes, baud)
+    assert(max(durations) <= ttywave.WAVE_MAX and min(durations) > 0)
+    assert(sum(durations) == int(50 * 15 * 500000 / baud + 0.5))   # no drift
+    h = 500000 / baud   # half bit
+    t = 0
+    for d in durations:   # every edge at its rounded nominal time
+        t += d
+        assert(int(round(t / h) * h + 0.5) == t or d == ttywave.WAVE_MAX)
+    assert(unpulse(durations, levels, 1000000 / baud) == codes)
+durations, levels = ttywave.compileWave(b'\x00', 45.45, True)
+assert(levels == [1] * 5 + [0] * 2 and durations[:4] == [ttywave.WAVE_MAX] * 4)   # 132ms low and 33ms high split
+d, l = ttywave.compileWave(codes, 45.45, True, 1., durations, levels)
+assert(d is durations and l is levels and (d, l) == ttywave.compileWave(codes, 45.45, True))   # lists refilled
+
+t = tty.TTY(50, 2, waveTx=True)
+t._pinRx = LinePin()
+rmt = t._waveTx._rmt
+while t._state != tty.STATE_LISTEN_CAN_TX:   # line up
+    t._timerHandler()
+codes = bytes(random.randrange(32) for i in range(20))
+t.write(codes)
+ticks = 0
+while t.anyTx() or t._state != tty.STATE_LISTEN_CAN_TX:
+    t._timerHandler()
+    ticks += 1
+assert(len(rmt.pulses) == 3 and rmt.idle_level)   # 8 + 8 + 4 chars
+assert(len(t._waveTx._durations) == len(rmt.pulses[-1][0]))   # lists of the last burst
+assert(unpulse(sum([p[0] for p in rmt.pulses], []), sum([p[1] for p in rmt.pulses], []), 20000) == codes)
+assert(ticks == 1 + 75 * 20)   # 150ms per char, idle gap rounded to ticks
+t.deinit()
+
+# TX with coarse periods - a bit of 1 to 1.5 ticks, stop bit before the end of the TX table
+
+for cls in (tty.TTY, ttyfast.TTYFast):
+    for baud, period in ((100, 10), (75, 13), (50, 20), (50, 13)):
+        t = cls(baud, period)
+        t._pinRx = LinePin()
+        t._pinTx = LinePin()
+        assert(t._txStopT < t._txActEndT and t._txAction[t._txActEndT] == tty.ACT_TX_END)
+        while t._state != tty.STATE_LISTEN_CAN_TX:   # line up
+            t._timerHandler()
+        codes = bytes(random.randrange(32) for i in range(50))
+        t.write(codes)
+        levels = []
+        while t.anyTx() or t._state != tty.STATE_LISTEN_CAN_TX:
+            t._timerHandler()
+            levels.append(t._pinTx.level)
+        levels.append(1)
+        assert(unpulse([1] * len(levels), levels, 1000. / period / baud) == codes)
+        t.deinit()
+
+# several lines on one timer
+
+period = ttymulti.commonPeriod((50, 100))
+assert(period == 2 and ttymulti.commonPeriod((50,)) == tty.bestPeriod(50))
+engine = ttymulti.TTYMulti(period)
+lines = [engine.addLine(baud, tx=i * 2, rx=i * 2 + 1) for i, baud in enumerate((50, 100, 50))]
+assert(len(engine) == 3 and engine._running and lines[0]._timer is None)
+assert(lines[0]._rxAction is lines[2]._rxAction and lines[0]._rxAction is not lines[1]._rxAction)   # shared tables
+rxCodes = []
+for i, l in enumerate(lines):
+    rxCodes.append(bytes(random.randrange(32) for n in range(30 + i * 10)))
+    slice = 1000 // period // int(l.getBaud())
+    l._pinRx = LinePin(bytes([1] * slice * 20) + wave(rxCodes[i], slice))
+    l._pinTx = LinePin()
+for n in range(len(lines[2]._pinRx.wave) + 100):
+    engine._timerHandler()
+for i, l in enumerate(lines):
+    assert(l.read(-1) == b'\xA0\xA1' + rxCodes[i])
+
+txCodes = [bytes(random.randrange(32) for n in range(20)) for l in lines]
+levels = [bytearray() for l in lines]
+for i, l in enumerate(lines):
+    l.write(txCodes[i])
+while any(l.anyTx() or l._state != tty.STATE_LISTEN_CAN_TX for l in lines):
+    engine._timerHandler()
+    for i, l in enumerate(lines):
+        levels[i].append(l._pinTx.level)
+for i, l in enumerate(lines):
+    assert(unwave(levels[i], 1000 // period // int(l.getBaud())) == txCodes[i])
+
+engine.removeLine(lines[1])
+assert(len(engine) == 2 and engine._handlers == (lines[0]._timerHandler, lines[2]._timerHandler))
+engine.deinit()
+assert(len(engine) == 0 and not engine._running)
+e = ttymulti.engine(period)
+assert(e is ttymulti.engine() and e is ttymulti.engine(period) and e.getPeriod() == period)
+e.addLine(50)
+try:
+    ttymulti.engine(1)   # lines run with the period of the engine
+    assert(False)
+except Exception as ex:
+    assert('period' in str(ex))
+e.deinit()
+assert(ttymulti._engine is None and ttymulti.engine(1).getPeriod() == 1)   # new engine with the new period
+ttymulti.engine().deinit()
+assert(ttymulti._engine is None)
+
+# idle mode - timer stops on idle line, restarts at the start bit
+
+def simulate(t, edges:list, end:int) -> int:
+    'run timer ticks and pin edges in time order on the virtual clock - returns number of timer calls'
+    timer = t._timer
+    inits = timer.inits
+    tickUs = timer.period * 1000
+    nextTick = tickUs
+    calls = 0
+    us = 0
+    i = 0
+    while True:
+        if i < len(edges) and (not timer.running or edges[i][0] < nextTick):
+            us = edges[i][0]
+            utime.set_us(us)
+            t._pinRx.fire(edges[i][1])
+            i += 1
+        elif timer.running and nextTick < end:
+            us = nextTick
+            timer.callback()
+            calls += 1
+            nextTick += tickUs
+        else:
+            break
+        if timer.inits != inits:   # timer restarted - new phase
+            inits = timer.inits
+            nextTick = us + tickUs
+    return calls
+
+for idle in (0, 3):
+    t = tty.TTY(50, 2)
+    t.setIdle(idle)
+    t._pinRx.level = 0   # line off
+    e = [(1000000, 1)]
+    us = 1500000
+    codes = bytes(random.randrange(32) for i in range(200))
+    for c in codes:
+        us += random.choice((0, random.randrange(1000), random.randrange(5000000)))   # back to back, short or long gap
+        e += edges(bytes([c]), us, 20000)
+        us += 150000
+    e += [(us + 1000000, 0)]   # line off at end
+    end = us + 3000000
+    calls = simulate(t, e, end)
+    assert(t.read(-1) == b'\xA0\xA1' + codes + b'\xA0')   # line off at end
+    if idle:
+        assert(calls < end // 2000 // 2 and t.isSleeping() and t._pinRx.irqHandler)
+        t.setTiming()   # handler changed while sleeping
+        t.write(b'\x1f')   # TX wakes up
+        assert(not t.isSleeping() and t._timer.running and t._pinRx.irqHandler is None)
+        assert(t._timer.callback == t._timerHandlerTimed and t._timer.callback is t._handler)   # bound before the IRQ
+    else:
+        assert(calls == (end - 1) // 2000 and not t.isSleeping())
+    t.deinit()
+
+# native handler - same states, TX levels and RX codes as TTY for the same pin sequence
+
+w = bytearray([0] * 500 + [1] * 200)   # off, line up
+w += wave(bytes(random.randrange(32) for i in range(50)), 10)
+for i in range(20):   # spikes
+    w += bytes([1] * random.randrange(5, 50) + [0] * random.randrange(1, 4))
+dialStart = len(w)
+w += bytes([1] * 200)
+for d in (3, 10, 1):   # pulse dialing
+    w += bytes(([0] * 30 + [1] * 20) * d + [1] * 300)
+w += bytes([0] * 600 + [1] * 200)   # dial error
+dialEnd = len(w)
+w += wave(bytes(tty.BMC_DIAL_DIGITS), 10)   # key dialing
+keyEnd = len(w)
+w += bytes(random.getrandbits(1) for i in range(3000))   # noise
+w += bytes([0] * 400 + [1] * 300) + wave(bytes(random.randrange(32) for i in range(20)), 10)
+
+# copies of the tty constants folded in module ttyfast
+for name in dir(ttyfast):
+    if name.split('_')[0] in ('STATE', 'ACT', 'ST'):
+        assert getattr(ttyfast, name) == getattr(tty, name), name
+
+out = []
+for cls in (tty.TTY, ttyfast.TTYFast):
+    t = cls(50, 2, txInvert=True, rxInvert=True)
+    t._pinRx = LinePin(bytes([b ^ 1 for b in w]))
+    t._pinTx = LinePin()
+    trace = []
+    events = [1000, dialStart, dialEnd, keyEnd, keyEnd + 100]   # positions in pin sequence
+    for n in range(len(w) + 3000):
+        if events and t._pinRx.pos >= events[0]:   # RX pin is not read while TX
+            e = events.pop(0)
+            if e == dialStart:
+                t.dial(True)
+            elif e == dialEnd:
+                t.setDialMode(tty.TTY.DIAL_MODE_KEY)
+                t.dial(True)
+            elif e == keyEnd:
+                t.dial(False)
+                t.setDialMode(tty.TTY.DIAL_MODE_PULSE)
+            else:
+                t.write(bytes(random.Random(e).randrange(32) for i in range(30)))
+        t._timerHandler()
+        trace.append((t._state, t._tick, t._tickCounter, t._pinTx.level))
+    out.append((trace, t.read(-1), t.getOverflow(), t.stats()))
+assert(out[0] == out[1])
+rx, st = out[0][1], out[0][3]
+assert(st['spikes'] >= 20 and st['dialErrors'] == 1 and st['lineDown'] == rx.count(0xA0) and st['lineUp'] == rx.count(0xA1))
+assert(rx.count(0xA0) >= 2 and b'\xD3\xD0\xD1\xED' in rx and bytes(range(0xD0, 0xDA)) in rx)
+
+# distortion margin analyzer
+
+t = margin.make_tty(50, 2)
+assert(margin.error_rate(t, 'jitter', 0, 500) == 0 and margin.error_rate(t, 'bias-', 30, 500) == 0)
+assert(margin.error_rate(t, 'bias+', 70, 500) > 0.5)
+assert(margin.margin(t, 'speed+', 200) == 50 and margin.margin(t, 'speed-', 200) == 40)   # samples 0...1 tick late - 1 tick of 10 less for early edges
+t = margin.make_tty(50, 2, 0.6)
+assert(t._rxDataTs == [16, 26, 36, 46, 56] and t._rxAction is not tty._actionTables[(50, 2)][0])
+
+# instrumentation - ISR counters and handler duration
+
+class SlowPin(LinePin):
+    'reading the pin takes 7 us on the virtual clock'
+    def value(self, v:int=None) -> int:
+        utime.advance_us(7)
+        return LinePin.value(self, v)
+
+t = tty.TTY(50, 5)   # 4 ticks per bit - stop check at tick 26
+w = b'\x00' * 100 + b'\x01' * 40 + b'\x00\x01\x01'   # line down and up, spike
+w += b'\x00' * 4 + b'\x01' * 20 + b'\x00' * 4 + b'\x01' * 10   # 0x1F with late stop bit
+w += wave(codes[:20], 4)
+t._pinRx = LinePin(w)
+for i in range(len(w) + 40):
+    t._timerHandler()
+assert(t.stats() == dict(ticks=len(w) + 40, rx=21, tx=0, framing=1, spikes=1, dialErrors=0, lineDown=1, lineUp=1,
+    rxHigh=23, txHigh=0, timeMax=0, timeAvg=0, rxOverflow=0, txOverflow=0))
+assert(t.read(-1) == b'\xA0\xA1\x3F' + codes[:20] and t.stats()['rxHigh'] == 23)
+t._pinTx = LinePin()
+t.write(codes[:50])
+while t.anyTx() or t._state != tty.STATE_LISTEN_CAN_TX:
+    t._timerHandler()
+st = t.stats(True)
+assert(st['tx'] == 50 and st['txHigh'] == 50 and st['framing'] == 1 and t.stats()['ticks'] == 0)
+
+t.setTiming()
+assert(t._timer.callback == t._timerHandlerTimed)
+t._pinRx = SlowPin(w)
+for i in range(len(w)):
+    t._timer.callback()
+st = t.stats()
+assert(st['timeMax'] == 7 and st['timeAvg'] == 7 and st['rx'] == 21 and st['ticks'] == len(w))
+t.setTiming(False)
+assert(t._timer.callback == t._timerHandler)
+t.deinit()
+
+# timer jitter recorder - lateness of the calls against the period grid
+
+t = tty.TTY(50, 2)
+assert(t.jitter() is None and t._jitterLimit == 8000)   # 40% of a bit - 10% taken by the tick quantization
+t.setJitter()
+h = t._timer.callback
+t._pinRx = LinePin()
+late = [0] * 900 + [300] * 90 + [9000] * 10
+random.shuffle(late)
+for i, d in enumerate([0] + late):   # first call is the reference
+    utime.set_us(1000000 + i * 2000 + d)
+    h()
+j = t.jitter(True)
+assert(j['count'] == 1001 and j['p50'] == 250 and j['p99'] == 500 and j['max'] == 9000 and j['late'] == 10)
+assert(j['hist'][:2] == [901, 90] and j['hist'][-1] == 10 and t.jitter()['count'] == 0)
+utime.set_us(999000)   # earlier than the grid - new reference
+h()
+utime.set_us(1001000)
+h()
+assert(t.jitter()['max'] == 0 and t.stats()['ticks'] == 1003)
+t.setJitter(False)
+assert(t._timer.callback == t._timerHandler and t.jitter() is None)
+t.deinit()
+
+engine = ttymulti.TTYMulti(2)
+lines = [engine.addLine(50), engine.addLine(75)]
+engine.setJitter()
+assert(engine._handlers == tuple(t._timerHandlerJitter for t in lines))
+engine.deinit()
+
+print(__name__, 'OK')
@@ -24,15 +24,28 @@ if MICROPYTHON:
     from machine import Pin
     from machine import PWM
     from machine import Timer
+    from machine import disable_irq, enable_irq
+    from utime import ticks_us, ticks_diff, ticks_add
+    from array import array
 
 else:  # CPython
     from debug_pc.machine import Pin
     from debug_pc.machine import PWM
     from debug_pc.machine import Timer
+    from debug_pc.utime import ticks_us, ticks_diff, ticks_add
+    from array import array
 
     def const(x):
         return x
 
+    def disable_irq():
+        return 0
+
+    def enable_irq(state):
+        pass
+
+from ringbuf import RingBuffer
+
 ###############################################################################
 
 STATE_MASK_LISTEN = const(0x10)
@@ -53,8 +66,73 @@ STATE_DIAL_WAIT = const(STATE_MASK_DIAL | 0x0)
 STATE_DIAL_PULSE = const(STATE_MASK_DIAL | 0x1)
 STATE_DIAL_PAUSE = const(STATE_MASK_DIAL | 0x2)
 
+RX_BUFFER_SIZE = const(256)   # codes and status codes from ISR
+TX_BUFFER_SIZE = const(512)   # codes to ISR
+
+PERIOD_MAX = const(10)   # ms
+IDLE_CHARS = const(10)   # idle line for this number of chars -> timer stops till next edge
+DISTORTION_BUDGET = 10.   # percent of a bit
+
+# per tick actions - values 1...16 are the mask of the data bit
+ACT_RX_START = const(0x40)   # check start bit
+ACT_RX_STOP = const(0x80)   # check stop bit - repeated till line is up again
+ACT_TX_STOP = const(0x40)   # set stop bit
+ACT_TX_END = const(0x80)   # char sent - listen for stop bit
+
 BMC_DIAL_DIGITS = (22, 23, 19, 1, 10, 16, 21, 7, 6, 24)
 
+# index in stats array - counters of the ISR, see stats()
+ST_TICKS = const(0)   # handler calls of the finished states - counted on state change, not per tick
+ST_RX = const(1)   # received chars
+ST_TX = const(2)   # sent chars
+ST_FRAMING = const(3)   # chars without stop bit in time
+ST_SPIKES = const(4)   # start bits rejected as spike
+ST_DIAL_ERRORS = const(5)   # dial pulse too long (0xED)
+ST_LINE_DOWN = const(6)   # off-mode (0xA0)
+ST_LINE_UP = const(7)   # line up again (0xA1)
+ST_RX_HIGH = const(8)   # high-water mark of RX buffer
+ST_TX_HIGH = const(9)   # high-water mark of TX buffer
+ST_TIME_MAX = const(10)   # us of the longest handler call - see setTiming()
+ST_TIME_AVG = const(11)   # moving average of the handler calls in 1/16 us
+ST_SIZE = const(12)
+
+STATS_NAMES = ('ticks', 'rx', 'tx', 'framing', 'spikes', 'dialErrors', 'lineDown', 'lineUp', 'rxHigh', 'txHigh', 'timeMax', 'timeAvg')
+
+# histogram of the timer lateness - see setJitter()
+JITTER_BINS = const(32)   # last bin counts all later calls
+JITTER_BIN_US = const(250)
+J_MAX = const(JITTER_BINS)   # index in jitter array after the bins - us of the latest call
+J_LATE = const(JITTER_BINS + 1)   # calls late enough to corrupt a bit
+J_SIZE = const(JITTER_BINS + 2)
+
+_actionTables = {}   # (baud, period) -> (rx, tx) action tables
+
+###############################################################################
+
+def distortion(baud:float, period:int) -> tuple:
+    'worst case bit distortion in percent (tx, rx) caused by the timer period'
+    slice = (1000. / period) / baud
+    # tx - bit edges rounded to ticks
+    tx = 0.
+    for i in range(1, 7):
+        t = slice * i
+        tx = max(tx, abs(int(t + 0.5) - t))
+    # rx - sample points floored to ticks plus start edge detected up to 1 tick late
+    rx = 0.
+    for i in range(7):
+        t = slice * (i + 0.5)
+        rx = max(rx, t - int(t + 0.001), int(t + 0.001) + 1 - t)
+    return round(tx * 100 / slice, 1), round(rx * 100 / slice, 1)
+
+# -----
+
+def bestPeriod(baud:float, budget:float=DISTORTION_BUDGET) -> int:
+    'longest timer period in ms with a bit distortion within the budget in percent - fewest ISR calls'
+    for period in range(PERIOD_MAX, 1, -1):
+        if max(distortion(baud, period)) <= budget:
+            return period
+    return 1
+
 ###############################################################################
 
 
@@ -63,30 +141,88 @@ class TTY:
     DIAL_MODE_PULSE = 0
     DIAL_MODE_KEY = 1
 
-    def __init__(_, baud:float = 50, period:int = 5, tx:int = 2, rx:int = 0, txInvert:bool=False, rxInvert:bool=False):
+    def __init__(_, baud:float = 50, period:int = 5, tx:int = 2, rx:int = 0, txInvert:bool=False, rxInvert:bool=False, edgeRx:bool=False, waveTx:bool=False, timer:bool=True):
 
-        # state machine
-
-        _._tick = 0
-        _._tickCounter = 0
-        _._state = STATE_OFF
+        _._initFields(txInvert, rxInvert)
 
         # Pins
 
-        _._rxInvert = 1 if rxInvert else 0   # be sure that value is 0/1 not False/True for XOR
-        _._txInvert = 1 if txInvert else 0
         _._pinRx = Pin(rx, Pin.IN, Pin.PULL_UP)
         _._pinTx = Pin(tx, Pin.OUT, value=1 ^ _._txInvert)
         _._setPinValueTX(1)
 
-        # timer for cyclic handler call
-        _._timer = Timer(1)
+        # RX decoded from pin edges instead of timer samples
+        if edgeRx:
+            from edgerx import EdgeRX
+            _._edgeRx = EdgeRX(baud, rx, rxInvert, pin=_._pinRx)
+
+        # TX by bursts of compiled waveforms instead of pin changes per tick
+        if waveTx:
+            from ttywave import WaveTX
+            _._waveTx = WaveTX(baud, tx, txInvert, pin=_._pinTx)
+
+        # timer for cyclic handler call - none if called by a TTYMulti engine
+        _._timer = Timer(1) if timer else None
 
         _.init(baud, period)
 
     # -----
 
+    def _initFields(_, txInvert:bool, rxInvert:bool) -> None:
+        'state machine, options and instrumentation - also for subclasses with own pins and timer'
+
+        # state machine
+
+        _._tick = 0
+        _._tickCounter = 0
+        _._state = STATE_OFF
+
+        _._rxInvert = 1 if rxInvert else 0   # be sure that value is 0/1 not False/True for XOR
+        _._txInvert = 1 if txInvert else 0
+
+        _._baudDetect = None
+        _._edgeRx = None
+        _._waveTx = None
+        _._timer = None
+
+        # idle - timer stopped, pin IRQ wakes up on next edge
+        _._idleChars = 0
+        _._idleT = 0
+        _._sleeping = False
+        _._sleepLevel = 1
+        _._wakeupHandler = _._wakeup   # bound before - no allocation in ISR
+        _._handler = None   # timer handler bound before - see handler(), restarted by the pin IRQ
+
+        # instrumentation - integer counters preallocated for the ISR
+        _._stats = array('i', [0] * ST_SIZE)
+        _._timing = False
+        _._timedHandler = None
+        _._jitter = None   # array of histogram if recording
+        _._jitterHandler = None
+        _._jitterBinUs = JITTER_BIN_US
+        _._jitterLimit = 0
+        _._jitterT = 0
+        _._jitterSync = True
+
+    # -----
+
     def init(_, baud:float = 50, period:int = 5):
+        'new buffers and dial settings, then the timing for baud and period'
+        _._rxDataBuffer = RingBuffer(RX_BUFFER_SIZE)
+        _._txDataBuffer = RingBuffer(TX_BUFFER_SIZE)
+
+        _._dialMode = _.DIAL_MODE_PULSE
+        _._dialActive = False
+        _._dialCounter = 0
+
+        _._initTiming(baud, period)
+
+    # -----
+
+    def _initTiming(_, baud:float, period:int) -> None:
+        'bit timing, tables and timer for baud and period - buffers and dial settings are kept'
+        _._baud = baud
+        _._period = period
         slice = (1000. / period) / baud
 
         _._len1charT = int(slice*7.5 + 0.5)
@@ -94,19 +230,16 @@ class TTY:
 
         # rx
 
+        # sample points are floored - start edge is detected 0...1 tick late
         _._rxDataTs = []
-        t = slice * 0.5
-        _._checkStartT = int(t + 0.5)
+        _._checkStartT = int(slice * 0.5 + 0.001)
         for i in range(5):
-            t += slice
-            _._rxDataTs.append(int(t + 0.5))
-        t += slice
-        _._checkStopT = int(t + 0.5)
-        t *= 3
-        _._rxLineT = int(t + 0.5)
+            _._rxDataTs.append(int(slice * (i + 1.5) + 0.001))
+        _._checkStopT = int(slice * 6.5 + 0.001)
+        _._rxLineT = int(slice * 19.5 + 0.5)
         _._rxData = 0
-        _._rxMask = 1
-        _._rxDataBuffer = []
+        if _._edgeRx:
+            _._edgeRx.init(baud, _._rxDataBuffer)
 
         # tx
 
@@ -117,26 +250,49 @@ class TTY:
             _._txDataTs.append(int(t + 0.5))
         t += slice
         _._txStopT = int(t + 0.5)
+        _._txActEndT = max(_._checkStopT, _._txStopT + 1)   # end of TX table - after the stop bit also for short bits
         t += slice * 1.5
         _._txEndT = int(t + 0.5)
+        _._txEndF = int(t * 0x10000 + 0.5)   # char length in 1/65536 ticks
+        _._txPhase = 0   # fraction of a tick carried to the next char
         _._txData = 21
-        _._txDataBuffer = []
+        if _._waveTx:
+            _._waveTx.init(baud)
 
         #  dial
 
-        _._dialMode = _.DIAL_MODE_PULSE
         _._dialEndT = 200 // period   # ticks for dial a digit end - 200ms
-        _._dialActive = False
-        _._dialCounter = 0
+
+        # idle
+        _._idleT = _._idleChars * _._len1charT if _._timer else 0
+        if _._sleeping:
+            _._disarmWakeup()
+            _._sleeping = False
+
+        _._buildTables()
+        _._jitterLimit = _._jitterLimitUs()
+        _._jitterSync = True
 
         # TIMER
 
-        _._timer.init(period=period, mode=Timer.PERIODIC, callback=_._timerHandler)
+        _._handler = _.handler()
+        if _._timer:
+            _._timer.init(period=period, mode=Timer.PERIODIC, callback=_._handler)
 
     # -----
 
     def deinit(_):
-        _._timer.deinit()
+        if _._timer:
+            _._timer.deinit()
+        if _._sleeping:
+            _._disarmWakeup()
+            _._sleeping = False
+        if _._baudDetect:
+            _._baudDetect.deinit()
+        if _._edgeRx:
+            _._edgeRx.deinit()
+        if _._waveTx:
+            _._waveTx.deinit()
 
     # -----
 
@@ -155,9 +311,23 @@ class TTY:
             _.getStateStr()
             )
 
+    # -----
+
+    def handler(_):
+        'the function to call every period'
+        h = _._timerHandlerEdge if _._edgeRx else _._timerHandler
+        if _._timing:
+            _._timedHandler = h
+            h = _._timerHandlerTimed
+        if _._jitter is not None:
+            _._jitterHandler = h
+            h = _._timerHandlerJitter
+        return h
+
     # =====
 
     def _setState(_, stateNew: int, tickNew=0) -> None:
+        _._stats[ST_TICKS] += _._tick - tickNew   # ticks in the old state
         _._state = stateNew
         _._tick = tickNew
         _._tickCounter = 0
@@ -186,194 +356,381 @@ class TTY:
 
     # =====
 
+    def _buildTables(_) -> None:
+        'compile the bit timing into per tick action tables and the state handler table'
+        key = (_._baud, _._period)
+        if key in _actionTables:   # shared by all lines with same timing
+            _._rxAction, _._txAction = _actionTables[key]
+        else:
+            _._buildActionTables()
+            _actionTables[key] = _._rxAction, _._txAction
+
+        _._isr = {
+            STATE_LISTEN: _._isrListen,
+            STATE_LISTEN_CAN_TX: _._isrListenCanTx,
+            STATE_TX_LISTEN: _._isrTxListen,
+            STATE_TX: _._isrTxWave if _._waveTx else _._isrTx,
+            STATE_RX: _._isrRxEdge if _._edgeRx else _._isrRx,
+            STATE_OFF: _._isrOff,
+            STATE_DIAL_WAIT: _._isrDialWait,
+            STATE_DIAL_PULSE: _._isrDialPulse,
+            STATE_DIAL_PAUSE: _._isrDialPause,
+            }
+
+    # -----
+
+    def _buildActionTables(_) -> None:
+        # rx - priority: start check, data bits, stop check
+        rx = bytearray(max(_._checkStopT, _._len1charT*2) + 1)   # RX ends at _len1charT*2 latest
+        for t in range(_._checkStopT, len(rx)):
+            rx[t] = ACT_RX_STOP
+        for i, t in enumerate(_._rxDataTs):
+            rx[t] = 1 << i   # sample data bit i
+        rx[_._checkStartT] = ACT_RX_START
+        _._rxAction = rx
+
+        # tx - priority: data bits, stop bit, end of char
+        tx = bytearray(_._txActEndT + 1)   # TX ends at _txActEndT
+        tx[_._txActEndT] = ACT_TX_END
+        tx[_._txStopT] = ACT_TX_STOP
+        for i, t in enumerate(_._txDataTs):
+            tx[t] = 1 << i   # set data bit i
+        _._txAction = tx
+
+    # -----
+
     def _timerHandler(_, x=None) -> None:
         _._tick += 1
 
-        if _._state & STATE_MASK_WAIT:
-            pass
+        _._isr[_._state]()
 
-        # DIAL
+        if _._state & STATE_MASK_CAN_TX:
+            if _._waveTx:
+                n = _._txDataBuffer.any()
+                if n:
+                    # whole burst by the peripheral - ticks rounded up to the end of the waveform
+                    us = _._waveTx.send(_._txDataBuffer)
+                    _._stats[ST_TX] += n - _._txDataBuffer.any()
+                    _._txEndT = (us + _._period * 1000 - 1) // (_._period * 1000)
+                    _._setState(STATE_TX)
+            elif _._txDataBuffer.any():
+                _._txData = _._txDataBuffer.get()
+                _._stats[ST_TX] += 1
+                # char length in whole ticks - carry the fraction to keep the nominal rate
+                t = _._txPhase + _._txEndF
+                _._txEndT = t >> 16
+                _._txPhase = t & 0xFFFF
+                _._setPinValueTX(0)
+                _._setState(STATE_TX)
 
-        elif _._state & STATE_MASK_DIAL:
-            valRX = _._getPinValueRX()
-            if _._state == STATE_DIAL_WAIT:
-                if valRX:
-                    _._tickCounter = 0
-                    if not _._dialActive:
-                        _._setState(STATE_LISTEN)
-                else:
-                    _._tickCounter += 1
-                    if _._tickCounter >= 3:
-                        _._dialCounter = 0
-                        _._setState(STATE_DIAL_PULSE)
-            elif _._state == STATE_DIAL_PULSE:
-                if valRX:
-                    _._tickCounter += 1
-                    if _._tickCounter >= 3:
-                        _._dialCounter += 1
-                        _._setState(STATE_DIAL_PAUSE)
-                else:
-                    _._tickCounter = 0
-                    if _._tick == _._len1secT:
-                        _._rxDataBuffer.append(0xED)  # signal dial error
-                        _._dialActive = False
-                        _._setState(STATE_LISTEN)
-            elif _._state == STATE_DIAL_PAUSE:
-                if valRX:
-                    _._tickCounter = 0
-                    if _._tick >= _._dialEndT:
-                        if _._dialCounter >= 10:  # dialing a '0' gets 10 pulses
-                            _._dialCounter = 0
-                        # signal dialed digit
-                        _._rxDataBuffer.append(0xD0 + _._dialCounter)
-                        _._setState(STATE_DIAL_WAIT)
-                else:
-                    _._tickCounter += 1
-                    if _._tickCounter >= 3:
-                        _._setState(STATE_DIAL_PULSE)
-
-        # LISTEN
-
-        elif _._state & STATE_MASK_LISTEN:
-            valRX = _._getPinValueRX()
-            if _._state == STATE_LISTEN:
-                if valRX:
-                    if _._tick == _._len1charT:
-                        _._setState(STATE_LISTEN_CAN_TX)
-                        if _._dialActive and _._dialMode == _.DIAL_MODE_PULSE:
-                            _._setState(STATE_DIAL_WAIT)
-                else:
-                    _._setState(STATE_RX)
-            elif _._state == STATE_LISTEN_CAN_TX:
-                if valRX:
-                    if _._dialActive and _._dialMode == _.DIAL_MODE_PULSE:
-                        _._setState(STATE_DIAL_WAIT)
-                else:
-                    _._setState(STATE_RX)
-            elif _._state == STATE_TX_LISTEN:
-                # check for valid stop bit at TX end or incoming RX
-                if valRX:
-                    if _._tick == _._txEndT:
-                        _._setState(STATE_LISTEN_CAN_TX)
-                else:
-                    if _._tick == _._checkStopT + 1:
-                        #TODO send error code
-                        _._setState(STATE_LISTEN)
-                    else:
-                        _._setState(STATE_RX)
-            pass
-
-        # TX
-
-        elif _._state == STATE_TX:
-            #TODO handle break
-            if _._txData >= 32:
-                pass
-            if _._tick in _._txDataTs:
-                _._setPinValueTX(_._txData & 1)
-                _._txData >>= 1
-            elif _._tick == _._txStopT:
-                _._setPinValueTX(1)
-            elif _._tick == _._checkStopT:
-                _._setState(STATE_TX_LISTEN, _._tick)
-
-        # RX
-
-        elif _._state == STATE_RX:
-            valRX = _._getPinValueRX()
-            if _._tick == 1:
-                pass
-                #  print('R', end='')   #debug
-            elif _._tick == _._checkStartT:
-                # check for valid start bit
-                if valRX:
-                    # only spike -> ignore
-                    _._setState(STATE_LISTEN)
-                else:
-                    # correct start bit -> prepare rx data
-                    _._rxData = 0
-                    _._rxMask = 1
-            elif _._tick in _._rxDataTs:
-                # data bit received
-                if valRX:
-                    _._rxData |= _._rxMask
-                _._rxMask <<= 1
-            elif _._tick >= _._checkStopT:
-                # check for valid stop bit
-                if valRX:
-                    # correct stop bit -> send rx data
-                    if _._dialActive:
-                        if _._rxData in BMC_DIAL_DIGITS:
-                            n = BMC_DIAL_DIGITS.index(_._rxData)
-                            _._rxDataBuffer.append(0xD0 + n)
-                    else:
-                        _._rxDataBuffer.append(_._rxData)
-                    _._setState(STATE_LISTEN)
-                else:
-                    # line is down, may be off-mode
-                    _._rxData |= _._rxMask
-                    if _._tick == _._len1charT*2:
-                        _._setState(STATE_OFF)
+    # -----
+
+    def _timerHandlerEdge(_, x=None) -> None:
+        _._edgeRx.poll()   # decode the chars received since last tick
+        _._timerHandler()
 
-        # OFF
+    # -----
+
+    def _timerHandlerTimed(_, x=None) -> None:
+        t = ticks_us()
+        _._timedHandler()
+        t = ticks_diff(ticks_us(), t)
+        s = _._stats
+        if t > s[ST_TIME_MAX]:
+            s[ST_TIME_MAX] = t
+        s[ST_TIME_AVG] += ((t << 4) - s[ST_TIME_AVG] + 8) >> 4   # over the last 16 calls
 
-        elif _._state == STATE_OFF:
-            valRX = _._getPinValueRX()
-            if _._tick == 1:
-                _._rxDataBuffer.append(0xA0)  # signal line low
+    # -----
+
+    def _timerHandlerJitter(_, x=None) -> None:
+        t = ticks_us()
+        d = ticks_diff(t, _._jitterT)
+        if d < 0 or _._jitterSync:   # earlier than the reference or timer restarted - new reference
+            _._jitterSync = False
+            d = 0
+        else:
+            t = _._jitterT   # expected time - late calls do not shift the grid
+        _._jitterT = ticks_add(t, _._period * 1000)
+        j = _._jitter
+        b = d // _._jitterBinUs
+        j[b if b < JITTER_BINS else JITTER_BINS - 1] += 1
+        if d > j[J_MAX]:
+            j[J_MAX] = d
+        if d >= _._jitterLimit:
+            j[J_LATE] += 1
+        _._jitterHandler()
+
+    # -----
+
+    def _isrDialWait(_) -> None:
+        if _._pinRx.value() ^ _._rxInvert:
+            _._tickCounter = 0
+            if not _._dialActive:
+                _._setState(STATE_LISTEN)
+        else:
+            _._tickCounter += 1
+            if _._tickCounter >= 3:
+                _._dialCounter = 0
+                _._setState(STATE_DIAL_PULSE)
+
+    # -----
+
+    def _isrDialPulse(_) -> None:
+        if _._pinRx.value() ^ _._rxInvert:
+            _._tickCounter += 1
+            if _._tickCounter >= 3:
+                _._dialCounter += 1
+                _._setState(STATE_DIAL_PAUSE)
+        else:
+            _._tickCounter = 0
+            if _._tick == _._len1secT:
+                _._rxDataBuffer.put(0xED)  # signal dial error
+                _._stats[ST_DIAL_ERRORS] += 1
+                _._dialActive = False
+                _._setState(STATE_LISTEN)
+
+    # -----
+
+    def _isrDialPause(_) -> None:
+        if _._pinRx.value() ^ _._rxInvert:
+            _._tickCounter = 0
+            if _._tick >= _._dialEndT:
+                if _._dialCounter >= 10:  # dialing a '0' gets 10 pulses
+                    _._dialCounter = 0
+                # signal dialed digit
+                _._rxDataBuffer.put(0xD0 + _._dialCounter)
+                _._setState(STATE_DIAL_WAIT)
+        else:
+            _._tickCounter += 1
+            if _._tickCounter >= 3:
+                _._setState(STATE_DIAL_PULSE)
+
+    # -----
+
+    def _isrListen(_) -> None:
+        if _._pinRx.value() ^ _._rxInvert:
+            if _._tick == _._len1charT:
+                _._setState(STATE_LISTEN_CAN_TX)
+                if _._dialActive and _._dialMode == _.DIAL_MODE_PULSE:
+                    _._setState(STATE_DIAL_WAIT)
+        else:
+            _._setState(STATE_RX)
+
+
+    # -----
+
+    def _isrListenCanTx(_) -> None:
+        if _._pinRx.value() ^ _._rxInvert:
+            if _._dialActive and _._dialMode == _.DIAL_MODE_PULSE:
+                _._setState(STATE_DIAL_WAIT)
+            elif _._idleT and _._tick >= _._idleT and not _._txDataBuffer.any():
+                _._sleep(1)
+        else:
+            _._setState(STATE_RX)
+
+    # -----
+
+    def _isrTxListen(_) -> None:
+        # check for valid stop bit at TX end or incoming RX
+        if _._pinRx.value() ^ _._rxInvert:
+            if _._tick >= _._txEndT:   # char may end with the TX table for short bits
+                _._setState(STATE_LISTEN_CAN_TX)
+        else:
+            if _._tick == _._txActEndT + 1:
+                #TODO send error code
+                _._stats[ST_FRAMING] += 1
+                _._setState(STATE_LISTEN)
+            else:
+                _._setState(STATE_RX)
+
+    # -----
+
+    def _isrTx(_) -> None:
+        #TODO handle break
+        a = _._txAction[_._tick]
+        if a & 0x1F:   # data bit
+            _._pinTx.value((1 if _._txData & a else 0) ^ _._txInvert)
+        elif a == ACT_TX_STOP:
+            _._pinTx.value(1 ^ _._txInvert)
+        elif a == ACT_TX_END:
+            _._setState(STATE_TX_LISTEN, _._tick)
+
+    # -----
+
+    def _isrTxWave(_) -> None:
+        if _._tick >= _._txEndT and _._waveTx.done():
+            _._setState(STATE_LISTEN_CAN_TX)
+
+    # -----
+
+    def _isrRx(_) -> None:
+        valRX = _._pinRx.value() ^ _._rxInvert
+        a = _._rxAction[_._tick]
+        if a & 0x1F:
+            # data bit received
             if valRX:
-                _._tickCounter += 1
-                if _._tickCounter >= _._len1charT:
-                    _._rxDataBuffer.append(0xA1)  # signal line high
-                    _._setState(STATE_LISTEN)
-                    # send
+                _._rxData |= a
+        elif a == ACT_RX_START:
+            # check for valid start bit
+            if valRX:
+                # only spike -> ignore
+                _._stats[ST_SPIKES] += 1
+                _._setState(STATE_LISTEN)
+            else:
+                # correct start bit -> prepare rx data
+                _._rxData = 0
+        elif a == ACT_RX_STOP:
+            # check for valid stop bit
+            if valRX:
+                # correct stop bit -> send rx data
+                if _._rxData & 0x20:   # stop bit late
+                    _._stats[ST_FRAMING] += 1
+                _._stats[ST_RX] += 1
+                if _._dialActive:
+                    if _._rxData in BMC_DIAL_DIGITS:
+                        n = BMC_DIAL_DIGITS.index(_._rxData)
+                        _._rxDataBuffer.put(0xD0 + n)
+                else:
+                    _._rxDataBuffer.put(_._rxData)
+                _._setState(STATE_LISTEN)
             else:
-                _._tickCounter = 0
+                # line is down, may be off-mode
+                _._rxData |= 0x20
+                if _._tick == _._len1charT*2:
+                    _._setState(STATE_OFF)
 
-        if _._state & STATE_MASK_CAN_TX:
-            if _._txDataBuffer:
-                _._txData = _._txDataBuffer.pop(0) # use pop() for atomic read
-                if _._txData is bytes:
-                    _._txData = int(_._txData)
-                _._setPinValueTX(0)
-                _._setState(STATE_TX)
+    # -----
 
-        pass
+    def _isrRxEdge(_) -> None:
+        # chars are decoded by EdgeRX - only follow the line for half duplex and off-mode
+        if _._tick >= _._checkStopT:
+            if _._pinRx.value() ^ _._rxInvert:
+                _._setState(STATE_LISTEN)
+            elif _._tick == _._len1charT*2:
+                _._setState(STATE_OFF)
+
+    # -----
+
+    def _isrOff(_) -> None:
+        if _._tick == 1:
+            _._rxDataBuffer.put(0xA0)  # signal line low
+            _._stats[ST_LINE_DOWN] += 1
+        if _._pinRx.value() ^ _._rxInvert:
+            _._tickCounter += 1
+            if _._tickCounter >= _._len1charT:
+                _._rxDataBuffer.put(0xA1)  # signal line high
+                _._stats[ST_LINE_UP] += 1
+                _._setState(STATE_LISTEN)
+        else:
+            _._tickCounter = 0
+            if _._idleT and _._tick >= _._idleT:
+                _._sleep(0)
+
+    # -----
+
+    def _sleep(_, level:int) -> None:
+        'stop the timer till the line leaves level'
+        if _._baudDetect:   # pin IRQ in use
+            return
+        _._timer.deinit()
+        _._sleeping = True
+        _._sleepLevel = level
+        if _._edgeRx:   # pin IRQ of EdgeRX records the edge and wakes up
+            _._edgeRx.wakeup = _._wakeupHandler
+        else:   # edge to the other level - XOR with invert
+            _._pinRx.irq(handler=_._wakeupHandler, trigger=Pin.IRQ_RISING if level ^ _._rxInvert == 0 else Pin.IRQ_FALLING)
+        if _._pinRx.value() ^ _._rxInvert != level:   # edge before IRQ was armed
+            _._wakeup()
+
+    # -----
+
+    def _wakeup(_, pin=None) -> None:
+        'restart the timer - a falling edge is the start bit of a char'
+        if not _._sleeping:
+            return
+        _._disarmWakeup()
+        _._sleeping = False
+        if _._state == STATE_LISTEN_CAN_TX and not _._pinRx.value() ^ _._rxInvert:
+            _._setState(STATE_RX)   # timer restarts at the edge - no late start bit
+        _._jitterSync = True
+        _._timer.init(period=_._period, mode=Timer.PERIODIC, callback=_._handler)
+
+    # -----
+
+    def _disarmWakeup(_) -> None:
+        if _._edgeRx:
+            _._edgeRx.wakeup = None   # pin IRQ stays with EdgeRX
+        else:
+            _._pinRx.irq(handler=None)
 
     # =====
 
-    def write(_, codes: bytes) -> None:
+    def write(_, codes: bytes) -> int:
+        'queue codes for sending - returns number of queued codes, the rest is counted in overflow'
         if isinstance(codes, list):
-            _._txDataBuffer += codes
-        else:
-            _._txDataBuffer += list(codes)
+            codes = bytes(codes)
+        n = _._txDataBuffer.write(codes)
+        t = _._txDataBuffer.any()
+        if t > _._stats[ST_TX_HIGH]:
+            _._stats[ST_TX_HIGH] = t
+        if _._sleeping:
+            state = disable_irq()   # pin IRQ may wake up too
+            _._wakeup()
+            enable_irq(state)
+        return n
 
     # -----
 
     def any(_) -> int:
-        return len(_._rxDataBuffer)
+        n = _._rxDataBuffer.any()
+        if n > _._stats[ST_RX_HIGH]:   # only the ISR fills - highest just before reading
+            _._stats[ST_RX_HIGH] = n
+        return n
+
+    # -----
+
+    def anyTx(_) -> int:
+        'number of codes waiting in TX buffer'
+        return _._txDataBuffer.any()
+
+    # -----
+
+    def freeTx(_) -> int:
+        'number of codes fitting into TX buffer'
+        return _._txDataBuffer.free()
 
     # -----
 
     def read(_, count:int=1) -> bytes:
-        ret = []
-        while _._rxDataBuffer and count > 0:
-            ret.append(_._rxDataBuffer.pop(0)) # use pop() for atomic read
-            count -= 1
-        return bytes(ret)
+        _.any()   # high-water mark
+        return _._rxDataBuffer.read(count)
+
+    # -----
+
+    def readinto(_, buf, count:int=-1) -> int:
+        'read codes in bulk into bytearray/memoryview without allocation'
+        _.any()   # high-water mark
+        return _._rxDataBuffer.readinto(buf, count)
 
     # -----
 
     def readAdd(_, codes:bytes) -> None:
         if isinstance(codes, list):
-            _._rxDataBuffer += codes
-        else:
-            _._rxDataBuffer += list(codes)
+            codes = bytes(codes)
+        state = disable_irq()   # ISR is the other writer
+        _._rxDataBuffer.write(codes)
+        enable_irq(state)
 
     # -----
 
     def dial(_, enable:bool) -> None:
         _._dialActive = enable
+        if _._sleeping:
+            state = disable_irq()   # pin IRQ may wake up too
+            _._wakeup()
+            enable_irq(state)
+        if _._edgeRx:
+            _._edgeRx.dialActive = enable
 
     # -----
 
@@ -389,6 +746,150 @@ class TTY:
             _._getPinValueRX()
             )
 
+    # -----
+
+    def getOverflow(_) -> tuple:
+        'number of dropped codes (rx, tx)'
+        return _._rxDataBuffer.overflow, _._txDataBuffer.overflow
+
+    # -----
+
+    def stats(_, reset:bool=False) -> dict:
+        'snapshot of the ISR counters and buffer overflows - reset clears the counters'
+        _.any()   # high-water mark
+        state = disable_irq()
+        s = list(_._stats)
+        s[ST_TICKS] += _._tick   # ticks in the current state
+        if reset:
+            for i in range(ST_SIZE):
+                _._stats[i] = 0
+            _._stats[ST_TICKS] = -_._tick
+        enable_irq(state)
+        d = dict(zip(STATS_NAMES, s))
+        d['timeAvg'] = (s[ST_TIME_AVG] + 8) >> 4
+        if _._edgeRx:   # chars decoded outside of the state machine
+            d['rx'] += _._edgeRx.chars
+            d['framing'] += _._edgeRx.errors
+            if reset:
+                _._edgeRx.chars = 0
+                _._edgeRx.errors = 0
+        d['rxOverflow'], d['txOverflow'] = _.getOverflow()
+        return d
+
+    # -----
+
+    def setTiming(_, enable:bool=True) -> None:
+        'measure the duration of each handler call by ticks_us - costs 2 calls per tick, see stats()'
+        _._timing = enable
+        _._handler = _.handler()
+        if _._timer and not _._sleeping:   # restart with the other handler
+            _._timer.init(period=_._period, mode=Timer.PERIODIC, callback=_._handler)
+
+    # -----
+
+    def setJitter(_, enable:bool=True, binUs:int=JITTER_BIN_US) -> None:
+        'record the lateness of the timer calls in a histogram of JITTER_BINS bins - see jitter()'
+        _._jitter = array('i', [0] * J_SIZE) if enable else None
+        _._jitterBinUs = binUs
+        _._jitterSync = True
+        _._handler = _.handler()
+        if _._timer and not _._sleeping:   # restart with the other handler
+            _._timer.init(period=_._period, mode=Timer.PERIODIC, callback=_._handler)
+
+    # -----
+
+    def jitter(_, reset:bool=False) -> dict:
+        'summary of the timer lateness in us - late: calls late enough to corrupt a bit, None if not recording'
+        j = _._jitter
+        if j is None:
+            return None
+        state = disable_irq()
+        h = list(j)
+        if reset:
+            for i in range(J_SIZE):
+                j[i] = 0
+        enable_irq(state)
+        n = sum(h[:JITTER_BINS])
+        return {
+            'count': n,
+            'p50': _._percentile(h, n * 50 // 100),
+            'p99': _._percentile(h, n * 99 // 100),
+            'max': h[J_MAX],
+            'late': h[J_LATE],
+            'limit': _._jitterLimit,
+            'binUs': _._jitterBinUs,
+            'hist': h[:JITTER_BINS],
+            }
+
+    # -----
+
+    def _percentile(_, h:list, k:int) -> int:
+        'upper edge of the bin with the k-th call - not above max'
+        n = 0
+        for i in range(JITTER_BINS):
+            n += h[i]
+            if n > k:
+                return min((i + 1) * _._jitterBinUs, h[J_MAX]) if i < JITTER_BINS - 1 else h[J_MAX]
+        return h[J_MAX]
+
+    # -----
+
+    def _jitterLimitUs(_) -> int:
+        'lateness moving a sample point out of its bit - the tick quantization takes its part already'
+        return int(1000000. / _._baud * (50. - _.getDistortion()[1]) / 100.)
+
+    # =====
+
+    def getBaud(_) -> float:
+        return _._baud
+
+    # -----
+
+    def getDistortion(_) -> tuple:
+        'worst case bit distortion in percent (tx, rx) of the current baud rate and timer period'
+        return distortion(_._baud, _._period)
+
+    # -----
+
+    def detectBaud(_, enable:bool=True) -> None:
+        'start/stop measuring the received signal to find the baud rate - see pollBaud()'
+        if _._baudDetect:
+            _._baudDetect.deinit()
+            _._baudDetect = None
+            if _._edgeRx:
+                _._edgeRx.enable()
+        if enable:
+            from autobaud import BaudDetect
+            if _._sleeping:
+                state = disable_irq()   # pin IRQ may wake up too
+                _._wakeup()
+                enable_irq(state)
+            _._baudDetect = BaudDetect(_._pinRx, _._rxInvert)
+
+    # -----
+
+    def isDetectingBaud(_) -> bool:
+        return _._baudDetect is not None
+
+    # -----
+
+    def pollBaud(_) -> tuple:
+        'None while detecting, else (baud, confidence) once - the TTY is switched to the detected baud rate'
+        if not _._baudDetect or not _._baudDetect.done():
+            return None
+        baud, confidence = _._baudDetect.result()
+        _.detectBaud(False)
+        if baud:
+            # queued codes and dial settings are kept
+            if _._timer:
+                _._timer.deinit()
+                _._initTiming(baud, bestPeriod(baud))
+            else:   # period given by TTYMulti engine
+                state = disable_irq()
+                _._initTiming(baud, _._period)
+                enable_irq(state)
+        return baud, confidence
+
     # =====
 
     def setDialMode(_, mode:int) -> None:
@@ -399,4 +900,17 @@ class TTY:
     def getDialMode(_) -> int:
         return _._dialMode
 
+    # =====
+
+    def setIdle(_, chars:int=IDLE_CHARS) -> None:
+        'stop the timer after chars of idle line, 0=never - the next edge on RX starts it again'
+        _._idleChars = chars
+        if _._timer:
+            _._idleT = chars * _._len1charT
+
+    # -----
+
+    def isSleeping(_) -> bool:
+        return _._sleeping
+
 ###############################################################################
@@ -0,0 +1,302 @@
+#!python3
+"""
+TTY with the timer handler as one function for the MicroPython native code emitter
+
+The hot path keeps the state in an integer array instead of object attributes
+and handles the states listen, RX, TX and off inline - no method calls per tick.
+The rare dial states use the handlers of class TTY.
+On CPython the same code runs as plain Python - see test_tty.py for the equivalence test.
+
+Usage:
+import ttyfast
+tty = ttyfast.TTYFast(50, 2, tx=4, rx=0)
+"""
+
+try:  # try MicroPython
+    import uos as os
+    MICROPYTHON = True
+except:  # CPython
+    MICROPYTHON = False
+    __author__ = "Jochen Krapf"
+    __email__ = "jk@nerd2nerd.org"
+    __copyright__ = "Copyright 2020, JK"
+    __license__ = "GPL3"
+    __version__ = "0.0.1"
+
+if MICROPYTHON:
+    import micropython
+    from array import array
+
+    native = micropython.native
+
+else:  # CPython
+    from array import array
+
+    def const(x):
+        return x
+
+    def native(f):
+        return f
+
+from tty import TTY, IDLE_CHARS, BMC_DIAL_DIGITS
+
+###############################################################################
+
+# constants of module tty used by the handler - const() is only folded in the defining module
+STATE_MASK_CAN_TX = const(0x20)
+STATE_LISTEN = const(0x10)
+STATE_LISTEN_CAN_TX = const(0x30)
+STATE_RX = const(0x1)
+STATE_TX = const(0x2)
+STATE_TX_LISTEN = const(0x12)
+STATE_OFF = const(0xF)
+STATE_DIAL_WAIT = const(0x40)
+
+ACT_RX_START = const(0x40)
+ACT_RX_STOP = const(0x80)
+ACT_TX_STOP = const(0x40)
+ACT_TX_END = const(0x80)
+
+ST_TICKS = const(0)
+ST_RX = const(1)
+ST_TX = const(2)
+ST_FRAMING = const(3)
+ST_SPIKES = const(4)
+ST_LINE_DOWN = const(6)
+ST_LINE_UP = const(7)
+
+###############################################################################
+
+# index in state array
+S_STATE = const(0)
+S_TICK = const(1)
+S_COUNTER = const(2)
+S_RX_DATA = const(3)
+S_TX_DATA = const(4)
+S_TX_END_T = const(5)
+S_TX_PHASE = const(6)
+S_DIAL_COUNTER = const(7)
+S_RX_INVERT = const(8)
+S_TX_INVERT = const(9)
+S_LEN_1CHAR_T = const(10)
+S_LEN_2CHAR_T = const(11)
+S_TX_ACT_END_T = const(12)
+S_TX_END_F = const(13)
+S_SIZE = const(14)
+
+###############################################################################
+
+
+class TTYFast(TTY):
+    'TTY with the state in an integer array and a native compiled timer handler'
+
+    def __init__(_, baud:float = 50, period:int = 5, tx:int = 2, rx:int = 0, txInvert:bool=False, rxInvert:bool=False, timer:bool=True):
+        _._s = array('i', [0] * S_SIZE)
+        TTY.__init__(_, baud, period, tx, rx, txInvert, rxInvert, timer=timer)
+
+    # -----
+
+    def _initTiming(_, baud:float, period:int) -> None:
+        TTY._initTiming(_, baud, period)
+        s = _._s
+        s[S_RX_INVERT] = _._rxInvert
+        s[S_TX_INVERT] = _._txInvert
+        s[S_LEN_1CHAR_T] = _._len1charT
+        s[S_LEN_2CHAR_T] = _._len1charT * 2
+        s[S_TX_ACT_END_T] = _._txActEndT
+        s[S_TX_END_F] = _._txEndF
+        _._idleT = 0   # no idle mode
+
+    # -----
+
+    def __repr__(_):
+        return '<TTYFast, st={}>'.format(
+            _.getStateStr()
+            )
+
+    # =====
+    # state fields of class TTY mapped to the state array - used by the dial handlers and the main loop
+
+    @property
+    def _state(_) -> int:
+        return _._s[S_STATE]
+
+    @_state.setter
+    def _state(_, v:int) -> None:
+        _._s[S_STATE] = v
+
+    @property
+    def _tick(_) -> int:
+        return _._s[S_TICK]
+
+    @_tick.setter
+    def _tick(_, v:int) -> None:
+        _._s[S_TICK] = v
+
+    @property
+    def _tickCounter(_) -> int:
+        return _._s[S_COUNTER]
+
+    @_tickCounter.setter
+    def _tickCounter(_, v:int) -> None:
+        _._s[S_COUNTER] = v
+
+    @property
+    def _rxData(_) -> int:
+        return _._s[S_RX_DATA]
+
+    @_rxData.setter
+    def _rxData(_, v:int) -> None:
+        _._s[S_RX_DATA] = v
+
+    @property
+    def _txData(_) -> int:
+        return _._s[S_TX_DATA]
+
+    @_txData.setter
+    def _txData(_, v:int) -> None:
+        _._s[S_TX_DATA] = v
+
+    @property
+    def _txEndT(_) -> int:
+        return _._s[S_TX_END_T]
+
+    @_txEndT.setter
+    def _txEndT(_, v:int) -> None:
+        _._s[S_TX_END_T] = v
+
+    @property
+    def _txPhase(_) -> int:
+        return _._s[S_TX_PHASE]
+
+    @_txPhase.setter
+    def _txPhase(_, v:int) -> None:
+        _._s[S_TX_PHASE] = v
+
+    @property
+    def _dialCounter(_) -> int:
+        return _._s[S_DIAL_COUNTER]
+
+    @_dialCounter.setter
+    def _dialCounter(_, v:int) -> None:
+        _._s[S_DIAL_COUNTER] = v
+
+    # =====
+
+    @native
+    def _timerHandler(_, x=None) -> None:
+        s = _._s
+        tick = s[S_TICK] + 1
+        s[S_TICK] = tick
+        state = s[S_STATE]
+
+        if state == STATE_RX:
+            valRX = _._pinRx.value() ^ s[S_RX_INVERT]
+            a = _._rxAction[tick]
+            if a & 0x1F:   # data bit
+                if valRX:
+                    s[S_RX_DATA] |= a
+            elif a == ACT_RX_START:
+                if valRX:   # only spike -> ignore
+                    _._stats[ST_SPIKES] += 1
+                    state = STATE_LISTEN
+                else:
+                    s[S_RX_DATA] = 0
+            elif a == ACT_RX_STOP:
+                if valRX:   # correct stop bit -> send rx data
+                    if s[S_RX_DATA] & 0x20:   # stop bit late
+                        _._stats[ST_FRAMING] += 1
+                    _._stats[ST_RX] += 1
+                    if _._dialActive:
+                        n = s[S_RX_DATA]
+                        if n in BMC_DIAL_DIGITS:
+                            _._rxDataBuffer.put(0xD0 + BMC_DIAL_DIGITS.index(n))
+                    else:
+                        _._rxDataBuffer.put(s[S_RX_DATA])
+                    state = STATE_LISTEN
+                else:   # line is down, may be off-mode
+                    s[S_RX_DATA] |= 0x20
+                    if tick == s[S_LEN_2CHAR_T]:
+                        state = STATE_OFF
+
+        elif state == STATE_TX:
+            a = _._txAction[tick]
+            if a & 0x1F:   # data bit
+                _._pinTx.value((1 if s[S_TX_DATA] & a else 0) ^ s[S_TX_INVERT])
+            elif a == ACT_TX_STOP:
+                _._pinTx.value(1 ^ s[S_TX_INVERT])
+            elif a == ACT_TX_END:
+                state = STATE_TX_LISTEN   # tick runs on
+                s[S_STATE] = state
+                s[S_COUNTER] = 0
+
+        elif state == STATE_LISTEN_CAN_TX:
+            if _._pinRx.value() ^ s[S_RX_INVERT]:
+                if _._dialActive and _._dialMode == 0:   # DIAL_MODE_PULSE
+                    state = STATE_DIAL_WAIT
+            else:
+                state = STATE_RX
+
+        elif state == STATE_LISTEN:
+            if _._pinRx.value() ^ s[S_RX_INVERT]:
+                if tick == s[S_LEN_1CHAR_T]:
+                    state = STATE_LISTEN_CAN_TX
+                    if _._dialActive and _._dialMode == 0:   # DIAL_MODE_PULSE
+                        state = STATE_DIAL_WAIT
+            else:
+                state = STATE_RX
+
+        elif state == STATE_TX_LISTEN:
+            if _._pinRx.value() ^ s[S_RX_INVERT]:
+                if tick >= s[S_TX_END_T]:   # char may end with the TX table for short bits
+                    state = STATE_LISTEN_CAN_TX
+            elif tick == s[S_TX_ACT_END_T] + 1:
+                _._stats[ST_FRAMING] += 1
+                state = STATE_LISTEN
+            else:
+                state = STATE_RX
+
+        elif state == STATE_OFF:
+            if tick == 1:
+                _._rxDataBuffer.put(0xA0)   # signal line low
+                _._stats[ST_LINE_DOWN] += 1
+            if _._pinRx.value() ^ s[S_RX_INVERT]:
+                n = s[S_COUNTER] + 1
+                s[S_COUNTER] = n
+                if n >= s[S_LEN_1CHAR_T]:
+                    _._rxDataBuffer.put(0xA1)   # signal line high
+                    _._stats[ST_LINE_UP] += 1
+                    state = STATE_LISTEN
+            else:
+                s[S_COUNTER] = 0
+
+        else:   # dial
+            _._isr[state]()
+            state = s[S_STATE]
+
+        if state != s[S_STATE]:   # new state
+            _._stats[ST_TICKS] += tick
+            s[S_STATE] = state
+            s[S_TICK] = 0
+            s[S_COUNTER] = 0
+
+        if state & STATE_MASK_CAN_TX:
+            if _._txDataBuffer.any():
+                s[S_TX_DATA] = _._txDataBuffer.get()
+                _._stats[ST_TX] += 1
+                # char length in whole ticks - carry the fraction to keep the nominal rate
+                t = s[S_TX_PHASE] + s[S_TX_END_F]
+                s[S_TX_END_T] = t >> 16
+                s[S_TX_PHASE] = t & 0xFFFF
+                _._pinTx.value(s[S_TX_INVERT])   # start bit
+                _._stats[ST_TICKS] += s[S_TICK]
+                s[S_STATE] = STATE_TX
+                s[S_TICK] = 0
+                s[S_COUNTER] = 0
+
+    # =====
+
+    def setIdle(_, chars:int=IDLE_CHARS) -> None:
+        pass
+
+###############################################################################
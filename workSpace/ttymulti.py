@@ -0,0 +1,178 @@
+#!python3
+"""
+Several historic teletypes (TTY, german Fernschreiber) driven by one timer
+
+One periodic ISR advances the state machines of all lines. Each line has its own pins,
+baud rate, dial mode and ring buffers. Lines with the same baud rate share the per tick action tables.
+
+Usage:
+import ttymulti
+engine = ttymulti.TTYMulti(ttymulti.commonPeriod((50, 75)))
+tty1 = engine.addLine(50, tx=4, rx=0)
+tty2 = engine.addLine(75, tx=5, rx=2)
+tty1.write(b'\x1f\x03')
+
+With telex.json a "LINES" list declares the lines - see class Telex(line=n)
+"""
+
+try:  # try MicroPython
+    import uos as os
+    MICROPYTHON = True
+except:  # CPython
+    MICROPYTHON = False
+    __author__ = "Jochen Krapf"
+    __email__ = "jk@nerd2nerd.org"
+    __copyright__ = "Copyright 2020, JK"
+    __license__ = "GPL3"
+    __version__ = "0.0.1"
+
+if MICROPYTHON:
+    from machine import Timer
+    from machine import disable_irq, enable_irq
+
+else:  # CPython
+    from debug_pc.machine import Timer
+
+    def const(x):
+        return x
+
+    def disable_irq():
+        return 0
+
+    def enable_irq(state):
+        pass
+
+from tty import TTY, distortion, PERIOD_MAX, DISTORTION_BUDGET, JITTER_BIN_US
+
+###############################################################################
+
+LINES_MAX = const(4)
+
+_engine = None   # shared by all Telex lines
+
+###############################################################################
+
+def commonPeriod(bauds, budget:float=DISTORTION_BUDGET) -> int:
+    'longest timer period in ms with a bit distortion within the budget for all baud rates'
+    for period in range(PERIOD_MAX, 1, -1):
+        if all(max(distortion(baud, period)) <= budget for baud in bauds):
+            return period
+    return 1
+
+# -----
+
+def engine(period:int=None):
+    'the engine shared by all Telex lines - created on first call, period None takes the running one'
+    global _engine
+    if _engine is not None and period is not None and period != _engine.getPeriod():
+        if len(_engine):
+            raise Exception('TTYMulti engine runs with period {} ms, not {} ms'.format(_engine.getPeriod(), period))
+        _engine.deinit()   # no lines - start again with the new period
+    if _engine is None:
+        _engine = TTYMulti(period or 5)
+    return _engine
+
+###############################################################################
+
+
+class TTYMulti:
+    'one timer for several teletype lines - the ISR advances all line state machines'
+
+    def __init__(_, period:int=5, timerId:int=1):
+        _._period = period
+        _._lines = []
+        _._handlers = ()   # bound before - no allocation in ISR
+        _._timer = Timer(timerId)
+        _._running = False
+
+    # -----
+
+    def deinit(_):
+        global _engine
+        _._timer.deinit()
+        _._running = False
+        for tty in _._lines:
+            tty.deinit()
+        _._lines = []
+        _._handlers = ()
+        if _engine is _:
+            _engine = None
+
+    # -----
+
+    def __repr__(_):
+        return '<TTYMulti, period={}, lines={}>'.format(
+            _._period,
+            len(_._lines)
+            )
+
+    # -----
+
+    def __len__(_) -> int:
+        return len(_._lines)
+
+    # =====
+
+    def _timerHandler(_, x=None) -> None:
+        for h in _._handlers:
+            h()
+
+    # -----
+
+    def _setLines(_, lines:list) -> None:
+        handlers = tuple([tty.handler() for tty in lines])
+        state = disable_irq()
+        _._lines = lines
+        _._handlers = handlers
+        enable_irq(state)
+        if lines and not _._running:
+            _._timer.init(period=_._period, mode=Timer.PERIODIC, callback=_._timerHandler)
+            _._running = True
+        elif not lines and _._running:
+            _._timer.deinit()
+            _._running = False
+
+    # =====
+
+    def addLine(_, baud:float = 50, tx:int = 2, rx:int = 0, txInvert:bool=False, rxInvert:bool=False, edgeRx:bool=False, waveTx:bool=False) -> TTY:
+        'new TTY driven by this engine'
+        if len(_._lines) >= LINES_MAX:
+            raise Exception('Too many TTY lines')
+        tty = TTY(baud, _._period, tx, rx, txInvert, rxInvert, edgeRx, waveTx, timer=False)
+        _._setLines(_._lines + [tty])
+        return tty
+
+    # -----
+
+    def removeLine(_, tty:TTY) -> None:
+        if tty in _._lines:
+            _._setLines([t for t in _._lines if t is not tty])
+            tty.deinit()
+
+    # -----
+
+    def lines(_) -> list:
+        return list(_._lines)
+
+    # -----
+
+    def getPeriod(_) -> int:
+        return _._period
+
+    # -----
+
+    def setTiming(_, enable:bool=True) -> None:
+        'measure the duration of the handler of each line - see TTY.stats()'
+        for tty in _._lines:
+            tty.setTiming(enable)
+        _._setLines(_._lines)
+
+    # -----
+
+    def setJitter(_, enable:bool=True, binUs:int=JITTER_BIN_US) -> None:
+        'record the lateness of the timer calls for each line - see TTY.jitter()'
+        for tty in _._lines:
+            tty.setJitter(enable, binUs)
+        _._setLines(_._lines)
+
+###############################################################################
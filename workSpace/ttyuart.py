@@ -0,0 +1,221 @@
+#!python3
+"""
+Communication with historic teletype (TTY, german Fernschreiber) by a hardware UART with 5 data bits
+
+The UART sends and receives the chars - no bit banging in the timer ISR.
+A slow timer only follows the line state (off-mode 0xA0/0xA1) and counts the pulses of a number switch.
+Same interface as class TTY - use create() to fall back to the software UART if the port has no 5 bit UART.
+
+Usage:
+import ttyuart
+tty = ttyuart.create(50, 2, tx=4, rx=0)
+tty.write(b'\x1f\x03')
+"""
+
+try:  # try MicroPython
+    import uos as os
+    MICROPYTHON = True
+except:  # CPython
+    MICROPYTHON = False
+    __author__ = "Jochen Krapf"
+    __email__ = "jk@nerd2nerd.org"
+    __copyright__ = "Copyright 2020, JK"
+    __license__ = "GPL3"
+    __version__ = "0.0.1"
+
+if MICROPYTHON:
+    from machine import Pin
+    from machine import Timer
+    from machine import UART
+
+else:  # CPython
+    from debug_pc.machine import Pin
+    from debug_pc.machine import Timer
+    from debug_pc.machine import UART
+
+    def const(x):
+        return x
+
+from tty import TTY, IDLE_CHARS, BMC_DIAL_DIGITS, ST_TICKS, ST_RX, ST_TX
+from tty import STATE_MASK_LISTEN, STATE_MASK_CAN_TX, STATE_LISTEN, STATE_LISTEN_CAN_TX, STATE_TX, STATE_OFF
+from tty import STATE_DIAL_WAIT, STATE_DIAL_PULSE, STATE_DIAL_PAUSE
+
+###############################################################################
+
+UART_ID = const(1)
+LINE_PERIOD = const(10)   # ms - timer for line state and pulse dialing
+UART_CHUNK = const(8)   # codes moved to UART at once
+
+###############################################################################
+
+def create(baud:float = 50, period:int = 5, tx:int = 2, rx:int = 0, txInvert:bool=False, rxInvert:bool=False) -> TTY:
+    'TTY with hardware UART if supported by the port, else with software UART'
+    try:
+        return TTYUart(baud, period, tx, rx, txInvert, rxInvert)
+    except (ValueError, TypeError, AttributeError, OSError):   # no UART with 5 bits and low baud rate
+        return TTY(baud, period, tx, rx, txInvert, rxInvert)
+
+###############################################################################
+
+
+class TTYUart(TTY):
+    'Hardware UART with 5 data bits for a historic teletype - interface of class TTY'
+
+    def __init__(_, baud:float = 50, period:int = 5, tx:int = 2, rx:int = 0, txInvert:bool=False, rxInvert:bool=False):
+
+        _._initFields(txInvert, rxInvert)   # no idle mode - line timer is slow already
+
+        # Pins - TX is driven by UART, RX is read by UART and sampled for line state
+
+        _._tx = tx
+        _._rx = rx
+        _._pinRx = Pin(rx, Pin.IN, Pin.PULL_UP)
+        _._pinTx = None
+        _._uart = None
+        _._uartBuf = bytearray(UART_CHUNK)
+
+        # timer for cyclic handler call
+        _._timer = Timer(1)
+
+        _.init(baud, period)
+
+    # -----
+
+    def _initTiming(_, baud:float, period:int) -> None:
+        'period is not used - the UART does the bit timing'
+        _._baud = baud
+        _._period = LINE_PERIOD
+
+        invert = 0
+        if _._txInvert:
+            invert |= UART.INV_TX
+        if _._rxInvert:
+            invert |= UART.INV_RX
+        if _._uart:
+            _._uart.deinit()
+        _._uart = UART(UART_ID, baudrate=int(baud + 0.5), bits=5, parity=None, stop=2, tx=_._tx, rx=_._rx, invert=invert)
+
+        _._len1charT = int(7500 / baud / LINE_PERIOD + 0.5)
+        _._len1secT = 1000 // LINE_PERIOD
+
+        _._dialEndT = 200 // LINE_PERIOD   # ticks for dial a digit end - 200ms
+
+        _._buildTables()
+        _._jitterLimit = _._jitterLimitUs()
+        _._jitterSync = True
+
+        _._handler = _.handler()
+        _._timer.init(period=LINE_PERIOD, mode=Timer.PERIODIC, callback=_._handler)
+
+    # -----
+
+    def deinit(_):
+        TTY.deinit(_)
+        if _._uart:
+            _._uart.deinit()
+
+    # -----
+
+    def __repr__(_):
+        return '<TTYUart, st={}>'.format(
+            _.getStateStr()
+            )
+
+    # =====
+
+    def _buildTables(_) -> None:
+        _._isr = {
+            STATE_LISTEN: _._isrLine,
+            STATE_LISTEN_CAN_TX: _._isrLine,
+            STATE_TX: _._isrUartTx,
+            STATE_OFF: _._isrOff,
+            STATE_DIAL_WAIT: _._isrDialWait,
+            STATE_DIAL_PULSE: _._isrDialPulse,
+            STATE_DIAL_PAUSE: _._isrDialPause,
+            }
+
+    # -----
+
+    def _timerHandler(_, x=None) -> None:
+        _._tick += 1
+
+        if _._uart.any():
+            n = _._uart.readinto(_._uartBuf)
+            # no RX while line is off, dialing by pulses or echo of own TX
+            if n and _._state & STATE_MASK_LISTEN:
+                _._putCodes(n)
+                _._setState(STATE_LISTEN)
+
+        _._isr[_._state]()
+
+        if _._state & STATE_MASK_CAN_TX:
+            if _._txDataBuffer.any():
+                n = _._txDataBuffer.readinto(_._uartBuf)
+                _._uart.write(memoryview(_._uartBuf)[:n])
+                _._stats[ST_TX] += n
+                _._setState(STATE_TX)
+
+    # -----
+
+    def _putCodes(_, n:int) -> None:
+        if not _._uartBuf[n - 1] & 0x1F and not _._pinRx.value() ^ _._rxInvert:
+            n -= 1   # line still low - last code is a break, not a char
+        _._stats[ST_RX] += n
+        i = 0
+        while i < n:
+            code = _._uartBuf[i] & 0x1F
+            if _._dialActive:
+                if code in BMC_DIAL_DIGITS:
+                    _._rxDataBuffer.put(0xD0 + BMC_DIAL_DIGITS.index(code))
+            else:
+                _._rxDataBuffer.put(code)
+            i += 1
+
+    # -----
+
+    def _isrLine(_) -> None:
+        'sample the line - low for 2 chars is off-mode, high for 1 char allows TX'
+        if _._pinRx.value() ^ _._rxInvert:
+            _._tickCounter = 0
+            if _._state == STATE_LISTEN_CAN_TX or _._tick >= _._len1charT:
+                if _._dialActive and _._dialMode == _.DIAL_MODE_PULSE:
+                    _._setState(STATE_DIAL_WAIT)
+                elif _._state == STATE_LISTEN:
+                    _._setState(STATE_LISTEN_CAN_TX)
+        else:
+            _._state = STATE_LISTEN   # receiving - wait for line up before TX
+            _._stats[ST_TICKS] += _._tick
+            _._tick = 0
+            _._tickCounter += 1
+            if _._tickCounter >= _._len1charT * 2:
+                _._setState(STATE_OFF)
+
+    # -----
+
+    def _isrUartTx(_) -> None:
+        if _._uart.txdone():
+            _._setState(STATE_LISTEN_CAN_TX)
+
+    # =====
+
+    def anyTx(_) -> int:
+        'number of codes waiting in TX buffer and UART'
+        return _._txDataBuffer.any() + (0 if _._state != STATE_TX else 1)
+
+    # -----
+
+    def getStateStr(_) -> str:
+        return 'u' + TTY.getStateStr(_)
+
+    # -----
+
+    def getDistortion(_) -> tuple:
+        'bit timing by UART - no timer distortion'
+        return 0., 0.
+
+    # -----
+
+    def setIdle(_, chars:int=IDLE_CHARS) -> None:
+        pass
+
+###############################################################################
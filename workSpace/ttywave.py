@@ -0,0 +1,129 @@
+#!python3
+"""
+TX of a historic teletype by a compiled waveform
+
+A burst of chars is compiled into a pulse list (start bit, 5 data bits, 1.5 stop bits)
+with the edges rounded to the absolute time of the peripheral clock - no drift, no ISR jitter.
+The list is handed to the ESP32 RMT in one call. The CPU works per burst, not per bit.
+
+Usage:
+import ttywave
+durations, levels = ttywave.compileWave(b'\x1f\x03', 50)
+
+With a TTY the timer handler sends bursts from the TX buffer and RX stays on the timer:
+tty = TTY(50, 2, tx, rx, waveTx=True)
+"""
+
+try:  # try MicroPython
+    import uos as os
+    MICROPYTHON = True
+except:  # CPython
+    MICROPYTHON = False
+    __author__ = "Jochen Krapf"
+    __email__ = "jk@nerd2nerd.org"
+    __copyright__ = "Copyright 2020, JK"
+    __license__ = "GPL3"
+    __version__ = "0.0.1"
+
+if MICROPYTHON:
+    from machine import Pin
+    from esp32 import RMT
+
+else:  # CPython
+    from debug_pc.machine import Pin
+    from debug_pc.esp32 import RMT
+
+    def const(x):
+        return x
+
+###############################################################################
+
+WAVE_RMT_CHANNEL = const(0)
+WAVE_CLOCK_DIV = const(80)   # 80MHz APB clock -> 1us per RMT tick
+WAVE_MAX = const(32767)   # longest RMT item - longer pulses are split
+WAVE_BURST = const(8)   # chars per burst
+WAVE_PULSES = const(64)   # pulses per burst preallocated - split pulses at low baud rates grow the lists once
+
+###############################################################################
+
+def compileWave(codes:bytes, baud:float, invert:bool=False, resolution:float=1., durations:list=None, levels:list=None) -> tuple:
+    'pulse list (durations, levels) of the codes - durations in peripheral ticks of resolution us, given lists are refilled'
+    h = 500000. / baud / resolution   # half bit in ticks
+    inv = 1 if invert else 0
+    if durations is None:
+        durations = []
+        levels = []
+    else:   # MicroPython keeps the capacity of a list on slice delete - no allocation while refilling
+        del durations[:]
+        del levels[:]
+    runLevel = -1
+    runStartT = 0
+    pos = 0   # in half bits
+    for c in codes:
+        frame = c << 1 | 0x40   # start bit, 5 data bits, stop bit
+        for i in range(7):
+            level = frame >> i & 1
+            if level != runLevel:
+                if runLevel >= 0:
+                    runStartT = _addPulse(durations, levels, runLevel ^ inv, runStartT, int(pos * h + 0.5))
+                runLevel = level
+            pos += 3 if i == 6 else 2   # 1.5 stop bits
+    if runLevel >= 0:
+        _addPulse(durations, levels, runLevel ^ inv, runStartT, int(pos * h + 0.5))
+    return durations, levels
+
+# -----
+
+def _addPulse(durations:list, levels:list, level:int, startT:int, endT:int) -> int:
+    d = endT - startT
+    while d > WAVE_MAX:
+        durations.append(WAVE_MAX)
+        levels.append(level)
+        d -= WAVE_MAX
+    durations.append(d)
+    levels.append(level)
+    return endT
+
+###############################################################################
+
+class WaveTX:
+    'TX by RMT peripheral - bursts of compiled chars'
+
+    def __init__(_, baud:float, tx:int, txInvert:bool=False, pin=None):
+        _._txInvert = txInvert
+        _._pin = pin or Pin(tx, Pin.OUT)
+        _._rmt = RMT(WAVE_RMT_CHANNEL, pin=_._pin, clock_div=WAVE_CLOCK_DIV, idle_level=not txInvert)
+        _._buf = bytearray(WAVE_BURST)
+        _._view = memoryview(_._buf)
+        _._durations = [0] * WAVE_PULSES   # RMT takes lists only - refilled per burst
+        _._levels = [0] * WAVE_PULSES
+        _.init(baud)
+
+    # -----
+
+    def init(_, baud:float) -> None:
+        _._baud = baud
+        _._resolution = WAVE_CLOCK_DIV * 1000000. / _._rmt.source_freq()   # us per RMT tick
+
+    # -----
+
+    def deinit(_) -> None:
+        _._rmt.deinit()
+
+    # -----
+
+    def send(_, txBuffer) -> int:
+        'compile the next burst from the ring buffer and start the RMT - returns burst length in us'
+        n = txBuffer.readinto(_._buf)
+        if not n:
+            return 0
+        compileWave(_._view[:n], _._baud, _._txInvert, _._resolution, _._durations, _._levels)
+        _._rmt.write_pulses(_._durations, _._levels)
+        return int(n * 7500000. / _._baud + 0.5)
+
+    # -----
+
+    def done(_) -> bool:
+        return _._rmt.wait_done()
+
+###############################################################################